@@ -9,13 +9,13 @@ import numpy as np
 import pickle
 import seaborn as sns
 from scipy import stats
-import random
 import os
 
 os.chdir(
     os.path.normpath(os.getcwd() + os.sep + os.pardir)
 )  # go one folder back
 import assignment_1.constants as c
+from assignment_1.bootstrap import Bootstrap
 
 plt.style.use("ggplot")  # plotting style
 
@@ -83,13 +83,14 @@ winner_results = results[results != 3]
 white_winning = abs(winner_results - np.ones(np.shape(winner_results)) * 2)
 black_winning = winner_results - np.ones(np.shape(winner_results))
 
-means_white = np.zeros((10000,))
-means_black = np.zeros((10000,))
-for i in range(10000):
-    mean_w = np.mean(random.choices(white_winning, k=len(white_winning)))
-    mean_b = np.mean(random.choices(black_winning, k=len(black_winning)))
-    means_white[i] = mean_w
-    means_black[i] = mean_b
+# resample all 10000 means at once, see assignment_1/bootstrap.py
+boot = Bootstrap(n_resamples=10000, seed=0)
+means_white = boot.resample(white_winning)
+means_black = boot.resample(black_winning)
+boot_ci_white = boot.confidence_interval(white_winning, method="bca")
+boot_ci_black = boot.confidence_interval(black_winning, method="bca")
+print(f"Winning probability white: {boot_ci_white}")
+print(f"Winning probability black: {boot_ci_black}")
 
 # %% Plot histograms
 fig, ax = plt.subplots()
@@ -99,6 +100,10 @@ sns.histplot(
 )
 sns.histplot(means_black, kde=True, bins=int(180 / binwidth), ax=ax)
 ax.legend(["White wins", "Black wins"])
+# BCa intervals of the winning probabilities
+for boot_ci, color in ((boot_ci_white, "red"), (boot_ci_black, "C0")):
+    for bound in boot_ci["bca_ci_95"]:
+        ax.axvline(bound, color=color, linestyle="--")
 ax.set_xlabel("Probability")
 ax.set_title("Winning probability per color")
 
@@ -117,35 +122,26 @@ file = f"assignment_1\data\game_history_nruns={nr}.pkl"
 game_history = pickle.load(open(file, "rb"))
 
 # %% Gather data about rounds
-all_runs = game_history.get_game_runs()
+# the history keeps the outcome, rounds and promotions of every game as
+# columns, the final game states themselves are not kept
+results = game_history.get_results()
+rounds = stats_10000["rounds_per_match"]
+promotions = game_history.get_promotions()
+
+white_won = results == c.GameStates.WHITE_WON.value
+black_won = results == c.GameStates.BLACK_WON.value
+draw = results == c.GameStates.DRAW.value
 
 # queen promotion
-prom_per_match = []
-prom_white_wins = []
-prom_black_wins = []
-prom_draw = []
+prom_per_match = promotions
+prom_white_wins = promotions[white_won]
+prom_black_wins = promotions[black_won]
+prom_draw = promotions[draw]
 
 # number of rounds
-r_white = []
-r_black = []
-r_draw = []
-rounds = stats_10000["rounds_per_match"]
-
-for i in range(game_history.games_played):
-    run = all_runs[i]
-    queen_prom = run.chess_board.n_queen_promotions
-    prom_per_match.append(queen_prom)
-
-    state = run.get_game_state()
-    if state == c.GameStates.WHITE_WON:
-        prom_white_wins.append(queen_prom)
-        r_white.append(rounds[i])
-    elif state == c.GameStates.BLACK_WON:
-        prom_black_wins.append(queen_prom)
-        r_black.append(rounds[i])
-    else:
-        prom_draw.append(queen_prom)
-        r_draw.append(rounds[i])
+r_white = rounds[white_won]
+r_black = rounds[black_won]
+r_draw = rounds[draw]
 
 # %% Used function from simulator to calculate confidence intervals for rounds
 conf_to_z = {
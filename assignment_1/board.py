@@ -2,7 +2,9 @@ import numpy as np
 from typing import Type, TypeVar
 
 import assignment_1.constants as c
+import assignment_1.moves as mv
 import assignment_1.pieces as p
+from assignment_1.variant import Variant, get_variant
 
 import logging
 
@@ -44,25 +46,35 @@ TPieces = TypeVar("TPieces", bound=p.Piece)
 
 class ChessBoard:
     """
-    This class is used to manage a chess board.
+    This class is used to manage a chess board. The board size and initial
+    setup are given by a Variant, the 5x5 baby chess board by default.
     """
 
+    variant: Variant = get_variant()
+    board_size: int = c.BOARD_SIZE
+
     def __init__(
         self,
         white_en_dbl_mv_pawn: bool = False,
         black_en_dbl_mv_pawn: bool = False,
         init_pieces: bool = True,
+        variant: Variant = None,
     ):
         self.logstr = {"className": self.__class__.__name__}
+        if variant is not None:
+            self.variant = variant
+        self.board_size = self.variant.board_size
 
         # double move pawn
         self.white_en_dbl_mv_pawn = white_en_dbl_mv_pawn
         self.black_en_dbl_mv_pawn = black_en_dbl_mv_pawn
 
         # Create the board with initial positions.
-        self.board = np.ndarray((c.BOARD_SIZE, c.BOARD_SIZE), dtype=p.Piece)
+        self.board = np.ndarray(
+            (self.board_size, self.board_size), dtype=p.Piece
+        )
         if init_pieces:
-            self.__create_initial_board(c.PIECES)
+            self.__create_initial_board(self.variant.pieces)
 
         # keep track of queen promotions
         self.n_queen_promotions = 0
@@ -71,9 +83,9 @@ class ChessBoard:
     def __str__(self):
         """Returns a string representation of the board."""
         s = ""
-        for i in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
             s += f"{i} "
-            for j in range(c.BOARD_SIZE):
+            for j in range(self.board_size):
                 if self.board[i][j] is None:
                     s += " ."
                 else:
@@ -86,7 +98,7 @@ class ChessBoard:
                     s += symbol + c.bcolors.ENDC
 
             s += "\n"
-        s += "   0 1 2 3 4"
+        s += "  " + "".join(f" {j}" for j in range(self.board_size))
 
         return "\n" + s
 
@@ -94,6 +106,27 @@ class ChessBoard:
         board_cpy = self.board.copy()
         return board_cpy
 
+    def __getstate__(self):
+        # the move buffers are scratch space, copies allocate their own
+        state = self.__dict__.copy()
+        state.pop("_move_buf", None)
+        state.pop("_promotion_buf", None)
+        return state
+
+    def get_move_buffers(self) -> tuple:
+        """
+        Returns the preallocated buffers used to collect all moves of a
+        player. They are reused for every move generation on this board, so
+        callers must copy what they want to keep.
+
+        :return: Tuple (moves buffer (MAX_MOVES, 4), promotion flags buffer).
+        """
+        if not hasattr(self, "_move_buf"):
+            max_moves = self.variant.max_moves
+            self._move_buf = np.empty((max_moves, 4), dtype=int)
+            self._promotion_buf = np.empty(max_moves, dtype=bool)
+        return self._move_buf, self._promotion_buf
+
     def game_had_queen_promotion(self):
         """
         Returns True if a queen promotion happened during the game.
@@ -141,8 +174,8 @@ class ChessBoard:
 
         :return: True if the board is consistent, False otherwise.
         """
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 if self.board[i][j] is not None:
                     if not np.array_equal(self.board[i][j].position, [i, j]):
                         return False
@@ -154,12 +187,12 @@ class ChessBoard:
         Creates a board with the pieces in their initial positions.
 
         :param pieces: A dictionary containing the pieces and their positions.
-        :return: A BOARD_SIZExBOARD_SIZE numpy array representing the board.
+        :return: A board_size x board_size numpy array representing the board.
         """
 
         # Initialize the board with empty squares.
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 self.board[i][j] = None
 
         # add pieces to the board
@@ -185,22 +218,31 @@ class ChessBoard:
         """
         piece_type = piece["type"]
         player = piece["player"]
+        size = self.board_size
 
         if piece_type == c.ChessPieceTypes.KING:
-            return p.King(player)
+            return p.King(player, board_size=size)
         elif piece_type == c.ChessPieceTypes.KNIGHT:
-            return p.Knight(player)
+            return p.Knight(player, board_size=size)
         elif piece_type == c.ChessPieceTypes.ROOK:
-            return p.Rook(player)
+            return p.Rook(player, board_size=size)
         elif piece_type == c.ChessPieceTypes.BISHOP:
-            return p.Bishop(player)
+            return p.Bishop(player, board_size=size)
         elif piece_type == c.ChessPieceTypes.QUEEN:
-            return p.Queen(player)
+            return p.Queen(player, board_size=size)
         elif piece_type == c.ChessPieceTypes.PAWN:
             if player is c.Players.WHITE:
-                return p.Pawn(player, extra_step=self.white_en_dbl_mv_pawn)
+                return p.Pawn(
+                    player,
+                    extra_step=self.white_en_dbl_mv_pawn,
+                    board_size=size,
+                )
             elif player is c.Players.BLACK:
-                return p.Pawn(player, extra_step=self.black_en_dbl_mv_pawn)
+                return p.Pawn(
+                    player,
+                    extra_step=self.black_en_dbl_mv_pawn,
+                    board_size=size,
+                )
             else:
                 raise ValueError("Invalid player.")
         else:
@@ -221,8 +263,8 @@ class ChessBoard:
         :return: A list of pieces.
         """
         pieces = []
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 if (
                     self.board[i][j] is not None
                     and self.board[i][j].get_player() == player
@@ -247,8 +289,8 @@ class ChessBoard:
         :param player: The player whose king is being retrieved.
         :return: A king.
         """
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 if (
                     self.board[i][j] is not None
                     and self.board[i][j].get_player() == player
@@ -265,11 +307,11 @@ class ChessBoard:
         :param player: The player whose piece is being retrieved.
         :return: A piece.
         """
-        piece_locs = np.ones((10, 2), dtype=int) * -1
+        piece_locs = np.ones((self.board_size**2, 2), dtype=int) * -1
 
         idx: int = 0
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 if (
                     self.board[i][j] is not None
                     and self.board[i][j].get_player() == player
@@ -298,20 +340,25 @@ class ChessBoard:
         Moves a piece from one position to another. Note that we only do a
         few sanity checks here to make sure the move is valid.
 
-        :param old_pos: Old position of the piece.
+        :param old_pos: Old position of the piece, or a move code in which
+            case new_pos is None.
         :param new_pos: New position of the piece.
         :param player: Player whose piece is being moved.
         :param set_old_pos_to_none: If True, the old position will be set to None.
         :param print_info: If True, info will be printed after the move.
         :return: True if we captured a piece, False otherwise.
         """
+        if new_pos is None:
+            move = mv.decode_move(old_pos, self.board_size)
+            old_pos, new_pos = move[0:2], move[2:4]
+
         piece = self.board[old_pos[0]][old_pos[1]]
         new_pos_cont = self.board[new_pos[0]][new_pos[1]]
 
         # check if the new position is on the board
-        if new_pos[0] < 0 or new_pos[0] >= c.BOARD_SIZE:
+        if new_pos[0] < 0 or new_pos[0] >= self.board_size:
             raise ValueError("Invalid position, row out of bounds.")
-        if new_pos[1] < 0 or new_pos[1] >= c.BOARD_SIZE:
+        if new_pos[1] < 0 or new_pos[1] >= self.board_size:
             raise ValueError("Invalid position, column out of bounds.")
 
         # check if the old position is None
@@ -351,8 +398,9 @@ class ChessBoard:
                 piece.increment_column_switch_count()  # type: ignore
 
         # promote pawn to queen if it reaches the end of the board
-        if piece.get_name() == "Pawn" and new_pos[0] % 4 == 0:  # type: ignore
-            piece_obj = p.Queen(piece.get_player())  # type: ignore
+        promotion_row = self.variant.get_promotion_row(player)
+        if piece.get_name() == "Pawn" and new_pos[0] == promotion_row:
+            piece_obj = p.Queen(player, board_size=self.board_size)
             self.put_new_piece_on_board(piece_obj, new_pos, overwrite=True)
             self.n_queen_promotions += 1
             logger.debug(
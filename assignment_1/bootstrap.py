@@ -0,0 +1,279 @@
+"""
+Batched bootstrap for statistics over columnar game results.
+
+Resampling n observations with replacement is the same as drawing how often
+every distinct observation occurs: a multinomial draw of n over the distinct
+rows with their empirical frequencies. Game results have few distinct rows
+(three outcomes, a few hundred round counts), so the resamples are drawn as
+(chunk, k) count matrices, with k the number of distinct rows, instead of
+(chunk, n) index matrices, and a statistic is evaluated for a whole chunk at
+once as a weighted statistic of the distinct rows.
+
+A statistic is a callable statistic(weights, *columns) that gets the counts
+(b, k) of b resamples and the k distinct rows of every column and returns b
+estimates. weighted_mean and Proportion cover the common cases.
+"""
+from statistics import NormalDist
+import numpy as np
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def weighted_mean(weights: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Mean of x for every resample.
+
+    :param weights: Counts (b, k) of the distinct rows in every resample.
+    :param x: The distinct values of the column.
+    :return: Array with b means.
+    """
+    return weights @ x / weights.sum(axis=1)
+
+
+class Proportion:
+    """
+    Fraction of observations of a column that equal a value, e.g. the win
+    probability of white with Proportion(GameStates.WHITE_WON.value).
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, weights: np.ndarray, x: np.ndarray) -> np.ndarray:
+        return weights @ (x == self.value) / weights.sum(axis=1)
+
+
+def compress(*columns) -> tuple:
+    """
+    Reduces columns of observations to their distinct rows and counts.
+
+    :param columns: Arrays of equal length.
+    :return: Tuple (list of columns of the distinct rows, counts).
+    """
+    columns = [np.asarray(col) for col in columns]
+    if len(columns) == 0:
+        raise ValueError("At least one column is needed.")
+    if any(len(col) != len(columns[0]) for col in columns):
+        raise ValueError("All columns must have the same length.")
+    if len(columns[0]) == 0:
+        raise ValueError("Cannot bootstrap without observations.")
+
+    if len(columns) == 1:
+        values, counts = np.unique(columns[0], return_counts=True)
+        return [values], counts
+
+    rows = np.rec.fromarrays(columns)
+    values, counts = np.unique(rows, return_counts=True)
+    return [values[name] for name in values.dtype.names], counts
+
+
+class Bootstrap:
+    """
+    Draws bootstrap resamples in chunks of count matrices. The chunk size is
+    chosen so that a chunk has at most max_elements counts, which bounds the
+    memory use. Chunk i always uses the random stream (seed, i), so the
+    result does not depend on whether the chunks run in a process pool.
+    """
+
+    def __init__(
+        self,
+        n_resamples: int = 10000,
+        max_elements: int = 2**22,
+        seed: int = None,
+        executor=None,
+    ):
+        """
+        :param n_resamples: The number of bootstrap resamples.
+        :param max_elements: Maximum number of counts in one chunk.
+        :param seed: Seed of the random streams, fresh entropy if None.
+        :param executor: Optional Executor to run the chunks in parallel.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if n_resamples < 1:
+            raise ValueError("n_resamples must be at least 1.")
+        self.n_resamples = n_resamples
+        self.max_elements = max_elements
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.executor = executor
+
+        # the job of the current resample() call, sent along to workers
+        self._job = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
+
+    def resample(self, *columns, statistic=weighted_mean) -> np.ndarray:
+        """
+        Computes the bootstrap distribution of a statistic.
+
+        :param columns: Arrays of equal length with the observations.
+        :param statistic: Callable statistic(weights, *columns).
+        :return: Array with n_resamples estimates.
+        """
+        values, counts = compress(*columns)
+        chunk_size = max(1, self.max_elements // len(counts))
+        n_chunks = -(-self.n_resamples // chunk_size)
+        logger.debug(
+            f"Bootstrap of {counts.sum()} observations ({len(counts)}"
+            f" distinct) in {n_chunks} chunks of {chunk_size}",
+            extra=self.logstr,
+        )
+
+        self._job = (statistic, values, counts, chunk_size)
+        try:
+            if self.executor is not None:
+                estimates = [
+                    result
+                    for _, results in self.executor.imap(
+                        self, range(n_chunks)
+                    )
+                    for result in results
+                ]
+            else:
+                estimates = self._do_chunk(range(n_chunks))
+        finally:
+            self._job = None
+
+        return np.concatenate(estimates)
+
+    def _do_chunk(self, chunk_ids) -> list:
+        """
+        Draws the resamples of the given chunks, used by the worker pool.
+
+        :param chunk_ids: The numbers of the chunks.
+        :return: List with the estimates of every chunk.
+        """
+        statistic, values, counts, chunk_size = self._job
+        n = counts.sum()
+        p = counts / n
+
+        estimates = []
+        for chunk_id in chunk_ids:
+            size = min(chunk_size, self.n_resamples - chunk_id * chunk_size)
+            rng = np.random.default_rng([chunk_id, self.seed])
+            weights = rng.multinomial(n, p, size=size)
+            estimates.append(np.asarray(statistic(weights, *values)))
+        return estimates
+
+    def confidence_interval(
+        self,
+        *columns,
+        statistic=weighted_mean,
+        alpha: float = 0.95,
+        method: str = "percentile",
+    ) -> dict:
+        """
+        Computes a bootstrap confidence interval of a statistic.
+
+        :param columns: Arrays of equal length with the observations.
+        :param statistic: Callable statistic(weights, *columns).
+        :param alpha: The confidence level of the interval.
+        :param method: "percentile" or "bca" (bias-corrected and
+            accelerated).
+        :return: Dictionary with the estimate, the bootstrap standard error
+            and bias and the interval.
+        """
+        if method not in ("percentile", "bca"):
+            raise ValueError(f"Unknown bootstrap interval method {method}.")
+
+        values, counts = compress(*columns)
+        estimate = float(statistic(counts[np.newaxis, :], *values)[0])
+        distribution = self.resample(*columns, statistic=statistic)
+
+        tail = (1 - alpha) / 2
+        quantiles = np.array([tail, 1 - tail])
+        if method == "bca":
+            quantiles = self.__bca_quantiles(
+                quantiles, estimate, distribution, statistic, values, counts
+            )
+        ci = np.quantile(distribution, quantiles)
+
+        return {
+            "estimate": np.round(estimate, 4),
+            "bootstrap_std": np.round(np.std(distribution, ddof=1), 4),
+            "bootstrap_bias": np.round(np.mean(distribution) - estimate, 4),
+            f"{method}_ci_{int(alpha * 100)}": (
+                np.round(ci[0], 4),
+                np.round(ci[1], 4),
+            ),
+            "n_resamples": self.n_resamples,
+        }
+
+    def __bca_quantiles(
+        self,
+        quantiles: np.ndarray,
+        estimate: float,
+        distribution: np.ndarray,
+        statistic,
+        values: list,
+        counts: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Adjusts the quantiles of a percentile interval for the bias and
+        skewness of the bootstrap distribution.
+
+        :return: The adjusted quantiles.
+        """
+        normal = NormalDist()
+
+        # bias correction, ties count half
+        below = np.mean(distribution < estimate)
+        below += 0.5 * np.mean(distribution == estimate)
+        eps = 1 / len(distribution)
+        below = np.clip(below, eps, 1 - eps)
+        z0 = normal.inv_cdf(below)
+
+        # acceleration from the jackknife, leaving out one observation of
+        # every distinct row, weighted by how often the row occurs
+        k = len(counts)
+        n_chunks = -(-k * k // self.max_elements)
+        eye = np.eye(k, dtype=counts.dtype)
+        jackknife = np.concatenate(
+            [
+                statistic(counts - eye[rows], *values)
+                for rows in np.array_split(np.arange(k), n_chunks)
+            ]
+        )
+        n = counts.sum()
+        deviation = counts @ jackknife / n - jackknife
+        numerator = counts @ deviation**3
+        denominator = 6 * (counts @ deviation**2) ** 1.5
+        a = numerator / denominator if denominator > 0 else 0.0
+
+        z = np.array([normal.inv_cdf(q) for q in quantiles])
+        adjusted = z0 + (z0 + z) / (1 - a * (z0 + z))
+        return np.array([normal.cdf(q) for q in adjusted])
+
+
+def bootstrap(
+    *columns,
+    statistic=weighted_mean,
+    n_resamples: int = 10000,
+    alpha: float = 0.95,
+    method: str = "percentile",
+    seed: int = None,
+    executor=None,
+) -> dict:
+    """
+    Computes a bootstrap confidence interval, see Bootstrap.
+
+    :param columns: Arrays of equal length with the observations.
+    :param statistic: Callable statistic(weights, *columns).
+    :param n_resamples: The number of bootstrap resamples.
+    :param alpha: The confidence level of the interval.
+    :param method: "percentile" or "bca".
+    :param seed: Seed of the random streams.
+    :param executor: Optional Executor to run the chunks in parallel.
+    :return: Dictionary with the estimate and the interval.
+    """
+    return Bootstrap(
+        n_resamples=n_resamples, seed=seed, executor=executor
+    ).confidence_interval(
+        *columns, statistic=statistic, alpha=alpha, method=method
+    )
@@ -0,0 +1,276 @@
+"""
+Frequencies of the positions visited in simulated games.
+
+Every position of a game is reduced to the 64 bit hash of its canonical key
+(see position.py), so symmetric positions are counted together. Per (hash,
+ply) a PositionCounter keeps how often the position was visited and how the
+games that visited it ended. The outcomes are stored from the point of view
+of the canonical position: if the canonical transform swaps the colours, a
+white win counts as a black win.
+
+Counters are filled inside the workers, one game at a time, and merged by
+the parent, like the GameStatsAccumulator. The merged table is saved as a
+.npy file sorted by (hash, ply), which PositionIndex opens memory-mapped and
+searches with binary search, so lookups do not load the whole table.
+"""
+import os
+import numpy as np
+
+import assignment_1.constants as c
+import assignment_1.position as pos
+from parallel.checkpoint import atomic_write
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+POSITION_DTYPE = np.dtype(
+    [
+        ("hash", "<u8"),
+        ("ply", "<u2"),
+        ("visits", "<u4"),
+        ("white_won", "<u4"),
+        ("black_won", "<u4"),
+        ("draw", "<u4"),
+    ]
+)
+
+COUNT_FIELDS = ("visits", "white_won", "black_won", "draw")
+
+# column of the outcome counts per final game state
+OUTCOME_FIELDS = {
+    c.GameStates.WHITE_WON: "white_won",
+    c.GameStates.BLACK_WON: "black_won",
+    c.GameStates.DRAW: "draw",
+}
+
+
+def position_record(game_state, player: c.Players = None) -> tuple:
+    """
+    Returns the hash of the canonical position of a game state and whether
+    the canonical transform swaps the colours.
+
+    :param game_state: The GameState.
+    :param player: The player to move, defaults to the current player.
+    :return: Tuple (hash, colour swapped).
+    """
+    key, transform = game_state.get_position_key(player)
+    return pos.position_hash(key), bool(transform & pos.COLOUR)
+
+
+def reduce_table(table: np.ndarray) -> np.ndarray:
+    """
+    Sorts a position table by (hash, ply) and sums the counts of rows with
+    the same hash and ply.
+
+    :param table: Array with dtype POSITION_DTYPE.
+    :return: The reduced table.
+    """
+    if len(table) == 0:
+        return table
+    order = np.lexsort((table["ply"], table["hash"]))
+    table = table[order]
+
+    new = np.ones(len(table), dtype=bool)
+    new[1:] = (table["hash"][1:] != table["hash"][:-1]) | (
+        table["ply"][1:] != table["ply"][:-1]
+    )
+    starts = np.flatnonzero(new)
+
+    reduced = table[starts]
+    for field in COUNT_FIELDS:
+        reduced[field] = np.add.reduceat(
+            table[field].astype(np.uint64), starts
+        )
+    return reduced
+
+
+class PositionCounter:
+    """
+    Streaming reducer of the positions of finished games. Positions are
+    buffered per game and reduced into the sorted table once the buffer
+    holds more than flush_size positions, which bounds the memory use of a
+    worker by the number of distinct positions.
+    """
+
+    def __init__(self, flush_size: int = 1 << 18):
+        """
+        :param flush_size: Number of buffered positions that triggers a
+            reduction.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        self.flush_size = flush_size
+        self.n_games = 0
+        self.table = np.zeros(0, dtype=POSITION_DTYPE)
+        self.__buffer: list = []
+        self.__n_buffered = 0
+
+    def __str__(self):
+        self.__flush()
+        return (
+            f"{len(self.table)} positions of {self.n_games} games"
+            f" accumulated"
+        )
+
+    def __getstate__(self):
+        # send only the reduced table to the parent
+        self.__flush()
+        return self.__dict__.copy()
+
+    def add_game(self, trace: tuple, final_state: c.GameStates) -> None:
+        """
+        Adds the positions of a finished game.
+
+        :param trace: Tuple (plies, hashes, colour swapped) of the positions
+            visited, see GameState.position_trace.
+        :param final_state: The final state of the game.
+        """
+        plies, hashes, swapped = trace
+        rows = np.zeros(len(plies), dtype=POSITION_DTYPE)
+        rows["hash"] = hashes
+        rows["ply"] = plies
+        rows["visits"] = 1
+
+        if final_state == c.GameStates.DRAW:
+            rows["draw"] = 1
+        else:
+            # canonical positions with swapped colours see the other winner
+            white_won = final_state == c.GameStates.WHITE_WON
+            swapped = np.asarray(swapped, dtype=bool)
+            rows["white_won"] = swapped != white_won
+            rows["black_won"] = swapped == white_won
+
+        self.__buffer.append(rows)
+        self.__n_buffered += len(rows)
+        self.n_games += 1
+        if self.__n_buffered >= self.flush_size:
+            self.__flush()
+
+    def merge(self, other: "PositionCounter") -> "PositionCounter":
+        """
+        Merges the positions counted by other into this counter.
+
+        :param other: The counter to merge.
+        :return: This counter.
+        """
+        other.__flush()
+        self.__buffer.append(other.table)
+        self.__n_buffered += len(other.table)
+        self.n_games += other.n_games
+        self.__flush()
+        return self
+
+    def __flush(self) -> None:
+        """
+        Reduces the buffered positions into the table.
+        """
+        if self.__buffer:
+            self.table = reduce_table(
+                np.concatenate([self.table] + self.__buffer)
+            )
+            self.__buffer = []
+            self.__n_buffered = 0
+
+    def get_table(self) -> np.ndarray:
+        """
+        Returns the counts of all positions, sorted by (hash, ply).
+
+        :return: Array with dtype POSITION_DTYPE.
+        """
+        self.__flush()
+        return self.table
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table as a .npy file that PositionIndex can open. The file
+        is replaced atomically.
+
+        :param path: The path of the file.
+        """
+        table = self.get_table()
+        atomic_write(path, lambda f: np.save(f, table))
+        logger.debug(
+            f"Saved {len(table)} positions to {path}", extra=self.logstr
+        )
+
+
+class PositionIndex:
+    """
+    Read-only index of a saved position table. The table is memory-mapped,
+    so only the pages touched by a lookup are read from disk.
+    """
+
+    def __init__(self, table):
+        """
+        :param table: Path of a table saved by PositionCounter.save() or a
+            table sorted by (hash, ply).
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if isinstance(table, (str, os.PathLike)):
+            table = np.load(table, mmap_mode="r")
+        if table.dtype != POSITION_DTYPE:
+            raise ValueError(f"Not a position table: {table.dtype}.")
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, position_hash: int) -> np.ndarray:
+        """
+        Returns the rows of a position, one per ply it was visited at.
+
+        :param position_hash: The hash of the canonical position.
+        :return: Array with dtype POSITION_DTYPE, sorted by ply.
+        """
+        hashes = self.table["hash"]
+        position_hash = np.uint64(position_hash)
+        start = np.searchsorted(hashes, position_hash, side="left")
+        stop = np.searchsorted(hashes, position_hash, side="right")
+        return np.array(self.table[start:stop])
+
+    def get_position_stats(
+        self, game_state, player: c.Players = None, ply: int = None
+    ) -> dict:
+        """
+        Returns how often a position was reached and how the games that
+        reached it ended, from the point of view of the given position.
+
+        :param game_state: The GameState of the position.
+        :param player: The player to move, defaults to the current player.
+        :param ply: Only count visits at this ply, defaults to all plies.
+        :return: Dictionary with the visits and the outcome frequencies.
+        """
+        position_hash, swapped = position_record(game_state, player)
+        rows = self.lookup(position_hash)
+        if ply is not None:
+            rows = rows[rows["ply"] == ply]
+
+        counts = {f: int(rows[f].sum()) for f in COUNT_FIELDS}
+        if swapped:
+            counts["white_won"], counts["black_won"] = (
+                counts["black_won"],
+                counts["white_won"],
+            )
+
+        visits = counts["visits"]
+        stats = {"visits": visits, "plies": rows["ply"].tolist()}
+        for field in OUTCOME_FIELDS.values():
+            stats[field] = counts[field]
+            stats[f"{field}_prop"] = (
+                np.round(counts[field] / visits, 4) if visits else np.nan
+            )
+        return stats
+
+    def get_most_visited(self, ply: int = None, k: int = 10) -> np.ndarray:
+        """
+        Returns the most visited positions.
+
+        :param ply: Only consider positions at this ply.
+        :param k: The number of positions.
+        :return: Array with dtype POSITION_DTYPE, most visited first.
+        """
+        table = self.table
+        if ply is not None:
+            table = table[table["ply"] == ply]
+        order = np.argsort(table["visits"], kind="stable")[::-1][:k]
+        return np.array(table[order])
@@ -2,12 +2,20 @@ import numpy as np
 import copy
 
 import assignment_1.constants as c
+import assignment_1.moves as mv
+import assignment_1.position as pos
 from assignment_1.board import ChessBoard
+from assignment_1.variant import Variant
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# results of has_legal_move() per canonical position, shared by all game
+# states of a process and cleared when it is full
+_legal_move_cache = {}
+LEGAL_MOVE_CACHE_SIZE = 1 << 16
+
 
 class GameState:
     """
@@ -20,7 +28,7 @@ class GameState:
      - Two players
      - Each player has 10 pieces:
        (1x king, 1x queen, 1x rooks, 1x bishops, 1x knights, 5x pawns)
-     - The board has 5x5
+     - The board has 5x5 (other sizes and setups are given by a Variant)
      - Players are represented by integers 0 and 1
      - The game is over when one player has no pieces left or when the
        king is captured.
@@ -38,6 +46,7 @@ class GameState:
         self,
         white_en_dbl_mv_pawn: bool = False,
         black_en_dbl_mv_pawn: bool = False,
+        variant: Variant = None,
     ):
         self.logstr = {"className": self.__class__.__name__}
         self.round_number: int = -1  # Call start_new_round() to increment to 0
@@ -47,7 +56,11 @@ class GameState:
             init_pieces=True,
             white_en_dbl_mv_pawn=white_en_dbl_mv_pawn,
             black_en_dbl_mv_pawn=black_en_dbl_mv_pawn,
+            variant=variant,
         )
+        # (plies, position hashes, colour swapped) of the positions visited,
+        # filled by simulators that count positions, see explorer.py
+        self.position_trace: tuple = None
 
     def __str__(self) -> str:
         return f"Round number: {self.round_number}"
@@ -76,16 +89,13 @@ class GameState:
         self.round_number += 1
         self.current_player = c.Players(self.round_number % 2)
 
-    def start_new_round(self, move: np.ndarray) -> None:
+    def start_new_round(self, move) -> None:
         """
         Starts a new round.
 
-        :param move: Move to be made.
+        :param move: Move to be made, as a move code or a 4 element array.
         """
-        if move.shape == (1, 4):
-            move = move.squeeze()
-        if move.shape != (4,):
-            raise ValueError("Move must be a 4 element array.")
+        move = mv.as_move_array(move, self.chess_board.board_size)
 
         # make move
         old_pos = move[0:2]
@@ -124,24 +134,45 @@ class GameState:
         """
         return self.chess_board.game_had_queen_promotion()
 
-    def get_valid_moves(self, player) -> np.ndarray:
+    def get_position_key(
+        self, player=None, symmetries: tuple = pos.ALL_SYMMETRIES
+    ) -> tuple:
+        """
+        Returns the symmetry-canonical key of the position, for use in
+        position caches. See position.position_key().
+
+        :param player: The player to move, defaults to the current player.
+        :param symmetries: The transforms to canonicalize over.
+        :return: Tuple (key, transform from this position to the canonical).
+        """
+        if player is None:
+            player = self.current_player
+        return pos.position_key(self.chess_board, player, symmetries)
+
+    def get_valid_moves(self, player, encoded: bool = False) -> np.ndarray:
         """Checks which moves are valid for the player.
 
         :param player: The player whose moves are to be checked.
-        :param king_in_check: If our king is in check.
+        :param encoded: If True, return the moves as move codes.
         :return: A list of valid moves for the player.
         """
         # collect all possible moves here
-        all_moves = self.__get_all_moves(player)
+        all_moves, promotion = self.__get_all_moves(player)
         logger.debug(f"All moves: \n{all_moves}", extra=self.logstr)
 
         # remove moves that put king in check
         valid_moves = self.__sim_if_moves_put_king_in_check(player, all_moves)
 
         # filter out invalid moves
-        valid_moves = valid_moves[valid_moves[:, 0] != -1]
+        keep = valid_moves[:, 0] != -1
+        if encoded:
+            return mv.encode_moves(
+                valid_moves[keep],
+                promotion[keep],
+                self.chess_board.board_size,
+            )
 
-        return valid_moves
+        return valid_moves[keep]
 
     def king_is_in_check(self, player) -> bool:
         """Checks if the king of the player is in check.
@@ -170,30 +201,145 @@ class GameState:
         # our king is not in check
         return False
 
-    def __get_all_moves(self, player) -> np.ndarray:
-        """Returns all possible moves for the player's pieces.
+    def has_legal_move(self, player, use_cache: bool = True) -> bool:
+        """Checks if the player has at least one legal move, e.g. to detect
+        checkmate and stalemate. Stops at the first legal move and tries the
+        moves most likely to be legal first: king moves, then captures of a
+        piece that gives check, then the other moves. The result is cached
+        per canonical position (see get_position_key()), which symmetric
+        positions share.
+
+        :param player: The player whose moves are to be checked.
+        :param use_cache: Whether to use the position cache.
+        :return: True if the player has a legal move, False otherwise.
+        """
+        if use_cache:
+            key, _ = self.get_position_key(player)
+            result = _legal_move_cache.get(key)
+            if result is not None:
+                return result
+
+        result = self.__find_legal_move(player) is not None
+
+        if use_cache:
+            if len(_legal_move_cache) >= LEGAL_MOVE_CACHE_SIZE:
+                _legal_move_cache.clear()
+            _legal_move_cache[key] = result
+        return result
+
+    def __find_legal_move(self, player):
+        """Returns the first legal move found for the player.
+
+        :param player: The player whose moves are to be checked.
+        :return: The move [old_row, old_col, new_row, new_col] or None.
+        """
+        board = self.get_board()
+        board_arr = board.get_board_arr()
+        king = board.get_king_obj(player)
+        king_pos = king.get_position()
+        opponents = board.get_all_pieces(c.Players(1 - player.value))
+
+        # a king move that leaves the attacked squares is legal most often
+        for move in king.get_piece_moves(board_arr):
+            if self.__is_legal(move, move[2:4], board_arr, opponents):
+                return move
+
+        piece_moves = [
+            piece.get_piece_moves(board_arr)
+            for piece in board.get_all_pieces(player)
+            if piece is not king
+        ]
+        if not piece_moves:
+            return None
+        moves = np.concatenate(piece_moves)
+
+        # capturing the piece that gives check is the next best candidate
+        checkers = [
+            piece.get_position()
+            for piece in opponents
+            if self.__attacks(piece, board_arr, king_pos)
+        ]
+        first = np.zeros(len(moves), dtype=bool)
+        for checker in checkers:
+            first |= (moves[:, 2] == checker[0]) & (moves[:, 3] == checker[1])
+
+        for move in np.concatenate((moves[first], moves[~first])):
+            if self.__is_legal(move, king_pos, board_arr, opponents):
+                return move
+        return None
+
+    def __is_legal(
+        self,
+        move: np.ndarray,
+        king_pos: np.ndarray,
+        board_arr: np.ndarray,
+        opponents: list,
+    ) -> bool:
+        """Checks if a move leaves the king of the moving player safe, on a
+        shallow copy of the board array instead of a copy of the game state.
+
+        :param move: The move [old_row, old_col, new_row, new_col].
+        :param king_pos: The position of the king after the move.
+        :param board_arr: The board array before the move.
+        :param opponents: The pieces of the opponent.
+        :return: True if no opponent piece attacks the king after the move.
+        """
+        board_after = board_arr.copy()
+        board_after[move[2], move[3]] = board_arr[move[0], move[1]]
+        board_after[move[0], move[1]] = None
+
+        for piece in opponents:
+            # captured pieces do not attack
+            if board_after[tuple(piece.get_position())] is not piece:
+                continue
+            if self.__attacks(piece, board_after, king_pos):
+                return False
+        return True
+
+    @staticmethod
+    def __attacks(piece, board_arr: np.ndarray, target: np.ndarray) -> bool:
+        """Checks if a piece can move to the target square.
+
+        :param piece: The piece.
+        :param board_arr: The board array.
+        :param target: The position [row, col].
+        :return: True if one of the moves of the piece ends on the target.
+        """
+        moves = piece.get_piece_moves(board_arr)
+        return bool(
+            np.any((moves[:, 2] == target[0]) & (moves[:, 3] == target[1]))
+        )
+
+    def __get_all_moves(self, player) -> tuple:
+        """Returns all possible moves for the player's pieces. The moves are
+        collected in the move buffers of the board, the returned arrays are
+        views on them.
 
         :param player: The player whose moves are to be checked.
-        :return: A list of all possible moves for the player.
+        :return: Tuple (all possible moves, promotion flags of the moves).
         """
         # collect all moves here
-        all_moves = np.ones((200, 4), dtype=int) * -1
+        all_moves, promotion = self.get_board().get_move_buffers()
+        promotion_row = self.get_board().variant.get_promotion_row(player)
 
         # get all pieces of player
         pieces = self.get_board().get_all_pieces(player)
+        board_arr = self.get_board().get_board_arr()
 
         # get all moves for each piece
         move_idx = 0
         for piece in pieces:
-            moves = piece.get_piece_moves(self.get_board().get_board_arr())
+            moves = piece.get_piece_moves(board_arr)
             moves_len = len(moves)
-            all_moves[move_idx : move_idx + moves_len] = moves
-            move_idx += moves_len
-
-        # filter out invalid moves
-        all_moves = all_moves[all_moves[:, 0] != -1]
-
-        return all_moves
+            end = move_idx + moves_len
+            all_moves[move_idx:end] = moves
+            if piece.get_name() == "Pawn":
+                promotion[move_idx:end] = moves[:, 2] == promotion_row
+            else:
+                promotion[move_idx:end] = False
+            move_idx = end
+
+        return all_moves[:move_idx], promotion[:move_idx]
 
     def __sim_if_moves_put_king_in_check(self, player, moves) -> np.ndarray:
         # go through all moves
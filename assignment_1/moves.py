@@ -0,0 +1,123 @@
+import numpy as np
+
+import assignment_1.constants as c
+
+# Compact move encoding:
+#   square = row * BOARD_SIZE + column
+#   code   = from_square * N_SQUARES + to_square (+ PROMOTION_FLAG)
+# so a move is a single small integer, e.g. white pawn [3, 0] -> [2, 0] is
+# 15 * 25 + 10 = 385 on the 5x5 board. The promotion flag marks pawn moves
+# that reach the last row and promote to a queen. Other board sizes pass
+# board_size, the constants below are those of the default board.
+N_SQUARES = c.BOARD_SIZE * c.BOARD_SIZE
+PROMOTION_FLAG = N_SQUARES * N_SQUARES
+
+# maximum number of moves a player can have on the default board
+MAX_MOVES = 200
+
+MOVE_DTYPE = np.int32
+
+
+def encode_moves(
+    moves: np.ndarray,
+    promotion: np.ndarray = None,
+    board_size: int = c.BOARD_SIZE,
+) -> np.ndarray:
+    """
+    Encodes (k, 4) moves [old_row, old_col, new_row, new_col] as integers.
+
+    :param moves: The moves to encode.
+    :param promotion: Optional boolean array marking promotion moves.
+    :param board_size: The number of rows and columns of the board.
+    :return: Array with k move codes.
+    """
+    n_squares = board_size * board_size
+    moves = np.asarray(moves).reshape(-1, 4)
+    codes = (moves[:, 0] * board_size + moves[:, 1]) * n_squares + (
+        moves[:, 2] * board_size + moves[:, 3]
+    )
+    if promotion is not None:
+        codes = codes + n_squares * n_squares * np.asarray(
+            promotion, dtype=int
+        )
+    return codes.astype(MOVE_DTYPE)
+
+
+def encode_move(
+    move: np.ndarray, promotion: bool = False, board_size: int = c.BOARD_SIZE
+) -> int:
+    """
+    Encodes one move [old_row, old_col, new_row, new_col] as an integer.
+
+    :param move: The move to encode.
+    :param promotion: Whether the move promotes a pawn.
+    :param board_size: The number of rows and columns of the board.
+    :return: The move code.
+    """
+    return int(encode_moves(move, np.array([promotion]), board_size)[0])
+
+
+def decode_moves(
+    codes: np.ndarray, board_size: int = c.BOARD_SIZE
+) -> np.ndarray:
+    """
+    Decodes move codes to (k, 4) moves [old_row, old_col, new_row, new_col].
+
+    :param codes: The move codes.
+    :param board_size: The number of rows and columns of the board.
+    :return: Array with the decoded moves.
+    """
+    n_squares = board_size * board_size
+    codes = np.asarray(codes).reshape(-1) % (n_squares * n_squares)
+    old_sq, new_sq = np.divmod(codes, n_squares)
+    return np.stack(
+        (
+            old_sq // board_size,
+            old_sq % board_size,
+            new_sq // board_size,
+            new_sq % board_size,
+        ),
+        axis=1,
+    ).astype(int)
+
+
+def decode_move(code: int, board_size: int = c.BOARD_SIZE) -> np.ndarray:
+    """
+    Decodes one move code.
+
+    :param code: The move code.
+    :param board_size: The number of rows and columns of the board.
+    :return: The move [old_row, old_col, new_row, new_col].
+    """
+    return decode_moves(code, board_size)[0]
+
+
+def is_promotion(code: int, board_size: int = c.BOARD_SIZE) -> bool:
+    """
+    Checks if a move code carries the promotion flag.
+
+    :param code: The move code.
+    :param board_size: The number of rows and columns of the board.
+    :return: True if the move promotes a pawn.
+    """
+    return code >= (board_size * board_size) ** 2
+
+
+def as_move_array(move, board_size: int = c.BOARD_SIZE) -> np.ndarray:
+    """
+    Returns a move as a [old_row, old_col, new_row, new_col] array, whether
+    it is given as a move code or as a (4,) or (1, 4) array.
+
+    :param move: The move.
+    :param board_size: The number of rows and columns of the board.
+    :return: The move as a (4,) array.
+    """
+    if np.ndim(move) == 0:
+        return decode_move(move, board_size)
+
+    move = np.asarray(move)
+    if move.shape == (1, 4):
+        move = move.squeeze()
+    if move.shape != (4,):
+        raise ValueError("Move must be a 4 element array or a move code.")
+    return move
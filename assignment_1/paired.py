@@ -0,0 +1,161 @@
+import numpy as np
+
+import assignment_1.constants as c
+from assignment_1.simulator import ChessSimulator, conf_to_z
+from parallel.executor import Executor
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def game_scores(results: np.ndarray, player: c.Players) -> np.ndarray:
+    """
+    Converts final game state values to scores for one player.
+
+    :param results: Array with final game state values.
+    :param player: The player for which the scores are computed.
+    :return: Array with 1 for a win, 0.5 for a draw and 0 for a loss.
+    """
+    won = (
+        c.GameStates.WHITE_WON
+        if player == c.Players.WHITE
+        else c.GameStates.BLACK_WON
+    )
+    scores = np.zeros(len(results))
+    scores[results == won.value] = 1.0
+    scores[results == c.GameStates.DRAW.value] = 0.5
+    return scores
+
+
+def paired_difference(x: np.ndarray, y: np.ndarray, alpha: float) -> dict:
+    """
+    Estimates the mean of x - y from paired observations.
+
+    :param x: Observations of the first experiment.
+    :param y: Observations of the second experiment, paired with x.
+    :param alpha: The confidence level of the interval.
+    :return: Dictionary with the estimate and its confidence interval.
+    """
+    if len(x) != len(y):
+        raise ValueError("Paired observations must have the same length.")
+
+    n = len(x)
+    d = x - y
+    z = conf_to_z[alpha]
+    mean = np.mean(d)
+    var = np.var(d, ddof=1) if n > 1 else 0.0
+
+    # variance of the difference if both runs had been independent
+    var_indep = (np.var(x, ddof=1) + np.var(y, ddof=1)) if n > 1 else 0.0
+
+    return {
+        "diff_mean": np.round(mean, 4),
+        "diff_std": np.round(np.sqrt(var), 4),
+        f"diff_normal_ci_{int(alpha * 100)}": (
+            np.round(mean - z * np.sqrt(var / n), 4),
+            np.round(mean + z * np.sqrt(var / n), 4),
+        ),
+        "variance_reduction": (
+            np.round(var_indep / var, 3) if var > 0 else np.inf
+        ),
+        "n_pairs": n,
+    }
+
+
+class PairedComparison:
+    """
+    Compares two strategies A and B against the same opponent with common
+    random numbers. Game i of A and game i of B give the opponent (and the
+    tested strategy) the same random streams, so the outcomes are positively
+    correlated and the variance of the score difference drops.
+
+    With mirror=True every game is also played with the colours swapped and
+    the streams swapped along, and the score of a pair is the mean over the
+    game and its mirror game.
+
+    The factories are callables that take a player and return a Strategy.
+    """
+
+    def __init__(
+        self,
+        strat_a_factory,
+        strat_b_factory,
+        opponent_factory,
+        player: c.Players = c.Players.WHITE,
+        seed: int = 0,
+        mirror: bool = False,
+        parallelize: bool = False,
+        n_jobs: int = 1,
+        executor: Executor = None,
+    ):
+        self.logstr = {"className": self.__class__.__name__}
+        self.player = player
+        self.seed = seed
+        self.mirror = mirror
+
+        # the simulators share one pool of workers
+        if parallelize and executor is None:
+            executor = Executor(n_jobs=n_jobs)
+        self.executor = executor
+
+        # one simulator per strategy and per colour assignment
+        colours = [player]
+        if mirror:
+            colours.append(c.Players(1 - player.value))
+        self.simulators = {}
+        for name, factory in (("a", strat_a_factory), ("b", strat_b_factory)):
+            for colour in colours:
+                opponent = c.Players(1 - colour.value)
+                strats = {
+                    colour: factory(colour),
+                    opponent: opponent_factory(opponent),
+                }
+                self.simulators[(name, colour)] = ChessSimulator(
+                    black_strat=strats[c.Players.BLACK],
+                    white_strat=strats[c.Players.WHITE],
+                    parallelize=parallelize,
+                    n_jobs=n_jobs,
+                    seed=seed,
+                    swap_streams=colour != player,
+                    executor=executor,
+                )
+
+    def run(self, n: int) -> None:
+        """
+        Plays n paired games (2n games per strategy with mirror=True).
+
+        :param n: The number of game pairs.
+        """
+        for simulator in self.simulators.values():
+            simulator.run(n)
+
+    def get_scores(self, name: str) -> np.ndarray:
+        """
+        Returns the score of strategy name in every game pair.
+
+        :param name: "a" or "b".
+        :return: Array with one score per game index.
+        """
+        scores = [
+            game_scores(sim.get_game_history().get_results(), colour)
+            for (sim_name, colour), sim in self.simulators.items()
+            if sim_name == name
+        ]
+        return np.mean(scores, axis=0)
+
+    def get_statistics(self, alpha: float = 0.95) -> dict:
+        """
+        Computes the paired-difference estimate of score(A) - score(B).
+
+        :param alpha: The confidence level of the interval.
+        :return: Dictionary with statistics.
+        """
+        scores_a = self.get_scores("a")
+        scores_b = self.get_scores("b")
+
+        statistics = paired_difference(scores_a, scores_b, alpha)
+        statistics["score_a_mean"] = np.round(np.mean(scores_a), 4)
+        statistics["score_b_mean"] = np.round(np.mean(scores_b), 4)
+
+        return statistics
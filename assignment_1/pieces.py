@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import copy
 import numpy as np
 
 import assignment_1.constants as c
@@ -11,12 +12,24 @@ logger = logging.getLogger(__name__)
 class Piece(ABC):
     """A base class to represent a piece on a chess board
 
+    The candidate moves of a piece only depend on its type, player, board
+    size and square, so they are generated once per square and cached in a
+    move table that is shared by all pieces of the same kind.
+
     :param player: The player who owns the piece.
     """
 
-    def __init__(self, player: c.Players, init_pos: np.ndarray):
+    board_size: int = c.BOARD_SIZE  # Rows and columns of the board.
+
+    def __init__(
+        self,
+        player: c.Players,
+        init_pos: np.ndarray,
+        board_size: int = c.BOARD_SIZE,
+    ):
         self.logstr = {"className": self.__class__.__name__}
         self.player = player  # The player who owns the piece.
+        self.board_size = board_size  # Rows and columns of the board.
         self.name = "Piece"  # Placeholder name for debug, should not be used.
         self.position: np.ndarray = init_pos  # Position on the board.
         self.n_moves: int = 0  # The number of moves the piece can at max make.
@@ -81,7 +94,7 @@ class Piece(ABC):
         :param ignore_pos_check: Ignore check if piece is already on this pos.
         """
         for i in position:
-            if i < 0 or i > c.BOARD_SIZE - 1:
+            if i < 0 or i > self.board_size - 1:
                 raise ValueError("Position is not on the board.")
         if (position == self.position).all() and not ignore_pos_check:
             raise ValueError("Piece is already on this position.")
@@ -100,15 +113,16 @@ class Piece(ABC):
 
         return x_old, y_old, move_cand
 
-    def _get_diagonal_moves(
-        self, n_moves_d: int = c.BOARD_SIZE - 1
-    ) -> np.ndarray:
+    def _get_diagonal_moves(self, n_moves_d: int = None) -> np.ndarray:
         """
         Returns a list of diagonal moves for the piece.
 
-        :param n_moves_dir: Nr. of moves in one direction.
+        :param n_moves_dir: Nr. of moves in one direction, defaults to the
+            longest ray on the board.
         :return: A list of diagonal moves for the piece.
         """
+        if n_moves_d is None:
+            n_moves_d = self.board_size - 1
 
         x_old, y_old, move_cand = self._init_move_cand(2 * n_moves_d)
 
@@ -139,18 +153,21 @@ class Piece(ABC):
 
     def _get_straight_moves(
         self,
-        n_moves_d: int = c.BOARD_SIZE - 1,
+        n_moves_d: int = None,
         hor: bool = True,
         ver: bool = True,
     ) -> np.ndarray:
         """
         Returns a list of vertical moves for the piece.
 
-        :param n_moves_dir: Nr. of moves in one direction.
+        :param n_moves_dir: Nr. of moves in one direction, defaults to the
+            longest ray on the board.
         :param hor: Generate moves in horizontal direction.
         :param ver: Generate moves in vertical direction.
         :return: A list of vertical moves for the piece.
         """
+        if n_moves_d is None:
+            n_moves_d = self.board_size - 1
 
         n_moves = 0
         if hor:
@@ -193,6 +210,70 @@ class Piece(ABC):
         return move_cand
 
     @abstractmethod
+    def _generate_move_candidates(self) -> np.ndarray:
+        """
+        Generates the candidate moves of the piece from its current
+        position, valid or not. Used to build the move tables.
+
+        :return: The candidate moves of the piece.
+        """
+        pass
+
+    def _get_move_table_key(self) -> tuple:
+        """
+        Returns what, besides type, player, board size and position, the
+        candidate moves of the piece depend on.
+
+        :return: Tuple that is part of the key of the move table.
+        """
+        return ()
+
+    def get_move_candidates(self) -> np.ndarray:
+        """
+        Returns the candidate moves of the piece from its current position,
+        looked up in the move table of this kind of piece.
+
+        :return: The candidate moves of the piece (read-only).
+        """
+        key = (
+            type(self),
+            self.player,
+            self.board_size,
+            self._get_move_table_key(),
+        )
+        table = _move_tables.get(key)
+        if table is None:
+            table = self.__build_move_table()
+            _move_tables[key] = table
+        return table[self.position[0], self.position[1]]
+
+    def __build_move_table(self) -> np.ndarray:
+        """
+        Generates the candidate moves of this kind of piece for every square
+        of the board.
+
+        :return: Array (board_size, board_size, n_candidates, 4).
+        """
+        logger.debug(
+            f"Building move table of {self.name} on a {self.board_size}x"
+            f"{self.board_size} board",
+            extra=self.logstr,
+        )
+        template = copy.copy(self)
+        table = np.stack(
+            [
+                np.stack(
+                    [
+                        _candidates_at(template, np.array([i, j]))
+                        for j in range(self.board_size)
+                    ]
+                )
+                for i in range(self.board_size)
+            ]
+        )
+        table.flags.writeable = False
+        return table
+
     def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
         """
         Returns a list of valid moves for the piece.
@@ -200,7 +281,7 @@ class Piece(ABC):
         :param board: The current board state.
         :return: A list of valid moves for the piece.
         """
-        pass
+        return self.filter_moves(self.get_move_candidates(), board)
 
     def draw_valid_moves(self, board: np.ndarray, moves: np.ndarray):
         """
@@ -216,8 +297,8 @@ class Piece(ABC):
             board[x][y] = 1
 
         s = ""
-        for i in range(c.BOARD_SIZE):
-            for j in range(c.BOARD_SIZE):
+        for i in range(self.board_size):
+            for j in range(self.board_size):
                 if board[i][j] is None:
                     s += " ."
                 elif board[i][j] == 1:
@@ -233,68 +314,75 @@ class Piece(ABC):
 
     def filter_moves(self, moves: np.ndarray, board: np.ndarray) -> np.ndarray:
         """
-        Validates the moves gives moves for the piece.
+        Validates the moves gives moves for the piece. All checks are done
+        with boolean masks over the whole candidate array at once.
 
         :param moves: The moves to validate.
         :param board: The current board state.
         :return: A list of valid moves for the piece.
         """
-        valid_moves = moves.copy()
+        x = moves[:, 2]  # row nr. of target position
+        y = moves[:, 3]  # col nr. of target position
+
+        # check if move goes outside field
+        size = self.board_size
+        valid = (x >= 0) & (x < size) & (y >= 0) & (y < size)
 
-        for i, move in enumerate(moves):
-            x = move[2]  # row nr. of target position
-            y = move[3]  # col nr. of target position
+        # owner of the piece at every target, -1 if empty (or off board)
+        owner = np.full(len(moves), -1, dtype=int)
+        owner[valid] = _owner_of(board[x[valid], y[valid]])
+        occupied = owner >= 0
 
-            # check if move goes outside field, remove from list
-            if x > c.BOARD_SIZE - 1 or x < 0 or y > c.BOARD_SIZE - 1 or y < 0:
-                valid_moves[i, :] = -1
-                continue
+        # check if we can switch columns
+        if not self.column_switch:
+            valid &= moves[:, 1] == moves[:, 3]
 
-            # check if we can switch columns
-            elif not self.column_switch and move[1] != move[3]:
-                valid_moves[i, :] = -1
-                continue
+        # check if our own piece is present at target position
+        valid &= owner != self.player.value
 
-            # check if our own piece is present at target position
-            elif board[x][y] is not None and board[x][y].get_player() == self.player:  # type: ignore
-                valid_moves[i, :] = -1
-                continue
+        # additional checks for pawn
+        if self.name == "Pawn":
+            diagonal = np.abs(moves[:, 1] - moves[:, 3]) == 1
+            vertical = moves[:, 1] == moves[:, 3]
 
-            # additional checks for pawn
-            if self.name == "Pawn":
-                # check whether it's a diagonal move and opponent's piece is present
-                if abs(move[1] - move[3]) == 1 and board[x][y] is None:
-                    valid_moves[i, :] = -1
+            # diagonal moves need an opponent's piece, vertical moves not
+            valid &= ~(diagonal & ~occupied)
+            valid &= ~(vertical & occupied)
 
-                # check whether it's a vertical move and opponent piece not present
-                elif move[1] == move[3] and board[x][y] is not None:
-                    valid_moves[i, :] = -1
+            # a two-step move may not leap over a piece
+            if len(moves) > 3:
+                valid[3] &= not occupied[2]
 
-                # check whether it's a vertical move
-                elif move[1] == move[3] and board[x][y] is None:
-                    # check whether it's a two-step move and an invalid leap was performed
-                    if (
-                        i == 3
-                        and board[moves[i - 1][2], moves[i - 1][3]] is not None
-                    ):
-                        valid_moves[i, :] = -1
-                continue
+        # check if an illegal jump move has been made, moves are ordered in
+        # rays of board_size - 1 steps away from the piece
+        elif not self.jump and self.name != "King":
+            rays = occupied.reshape(-1, size - 1)
+            blocked = np.cumsum(rays, axis=1) - rays > 0
+            valid &= ~blocked.reshape(-1)
 
-            # check if an illegal jump move has been made
-            elif not self.jump and self.name != "King":
-                # check whether there a step larger than 1 has been done
-                if i % (c.BOARD_SIZE - 1) > 0:
-                    start = i - i % (c.BOARD_SIZE - 1)
-                    inter_field = moves[start:i][:, 2:4]
-                    fields = board[inter_field[:, 0], inter_field[:, 1]]
+        return moves[valid]
 
-                    if not all(x is None for x in fields):
-                        valid_moves[i, :] = -1
 
-        # delete all moves with -1
-        valid_moves = valid_moves[valid_moves[:, 0] != -1]
+# returns the player value of a piece, or -1 for an empty square
+_owner_of = np.frompyfunc(
+    lambda piece: -1 if piece is None else piece.player.value, 1, 1
+)
 
-        return valid_moves
+# move tables per (piece class, player, board size, table key), built on
+# first use in every process
+_move_tables = {}
+
+
+def _candidates_at(piece: Piece, position: np.ndarray) -> np.ndarray:
+    """
+    Generates the candidate moves a piece would have on a position.
+
+    :param piece: A scratch copy of the piece, its position is overwritten.
+    :param position: The position.
+    :return: The candidate moves.
+    """
+    piece.position = position
+    return piece._generate_move_candidates()
 
 
 class Pawn(Piece):
@@ -303,8 +391,9 @@ class Pawn(Piece):
         player: c.Players,
         extra_step=False,
         init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "Pawn"
         # self.symbol = '♙' if player == c.Players.WHITE else '♟'
         self.symbol = "P"
@@ -350,47 +439,42 @@ class Pawn(Piece):
         """
         self.extra_step = False
 
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
-        valid_moves = np.ones((1, 4), dtype=int) * -1
+    def _get_move_table_key(self) -> tuple:
+        return (self.extra_step, self.n_moves)
 
+    def _generate_move_candidates(self) -> np.ndarray:
         x_old, y_old, move_cand = super()._init_move_cand(self.n_moves)
 
         # get coordinates of all new moves, valid or not
-        move_cand = self.__move_pawn(x_old, y_old, move_cand)
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return self.__move_pawn(x_old, y_old, move_cand)
 
 
 class Rook(Piece):
     def __init__(
-        self, player: c.Players, init_pos=np.array([-1, -1], dtype=int)
+        self,
+        player: c.Players,
+        init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "Rook"
         # self.symbol = '♖' if player == c.Players.WHITE else '♜'
         self.symbol = "R"
-        self.n_moves = 3 * (c.BOARD_SIZE - 1)
-
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
-        _, _, move_cand = super()._init_move_cand(self.n_moves)
+        self.n_moves = 3 * (board_size - 1)
 
+    def _generate_move_candidates(self) -> np.ndarray:
         # get coordinates of all new moves, valid or not
-        move_cand = super()._get_straight_moves()
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return super()._get_straight_moves()
 
 
 class Knight(Piece):
     def __init__(
-        self, player: c.Players, init_pos=np.array([-1, -1], dtype=int)
+        self,
+        player: c.Players,
+        init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "Knight"
         self.symbol = "N"
         # self.symbol = '♘' if player == c.Players.WHITE else '♞'
@@ -415,85 +499,68 @@ class Knight(Piece):
 
         return move_cand
 
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
+    def _generate_move_candidates(self) -> np.ndarray:
         x_old, y_old, move_cand = super()._init_move_cand(self.n_moves)
 
         # get coordinates of all new moves, valid or not
-        move_cand = self.__move_l_shape(x_old, y_old, move_cand)
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return self.__move_l_shape(x_old, y_old, move_cand)
 
 
 class Bishop(Piece):
     def __init__(
-        self, player: c.Players, init_pos=np.array([-1, -1], dtype=int)
+        self,
+        player: c.Players,
+        init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "Bishop"
         # self.symbol = '♗' if player == c.Players.WHITE else '♝'
         self.symbol = "B"
-        self.n_moves = 2 * (c.BOARD_SIZE - 1)
-
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
-        _, _, move_cand = super()._init_move_cand(self.n_moves)
+        self.n_moves = 2 * (board_size - 1)
 
+    def _generate_move_candidates(self) -> np.ndarray:
         # get coordinates of all new moves, valid or not
-        move_cand = super()._get_diagonal_moves()
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return super()._get_diagonal_moves()
 
 
 class Queen(Piece):
     def __init__(
-        self, player: c.Players, init_pos=np.array([-1, -1], dtype=int)
+        self,
+        player: c.Players,
+        init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "Queen"
         # self.symbol = '♕' if player == c.Players.WHITE else '♛'
         self.symbol = "Q"
         # queen can go in any direction (not down)
-        self.n_moves = 5 * (c.BOARD_SIZE - 1)
-
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
-        _, _, move_cand = super()._init_move_cand(self.n_moves)
+        self.n_moves = 5 * (board_size - 1)
 
+    def _generate_move_candidates(self) -> np.ndarray:
         # get coordinates of all new moves, valid or not
         diag_mov = super()._get_diagonal_moves()
         straight_mov = super()._get_straight_moves()
-        move_cand = np.concatenate((diag_mov, straight_mov), axis=0)
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return np.concatenate((diag_mov, straight_mov), axis=0)
 
 
 class King(Piece):
     def __init__(
-        self, player: c.Players, init_pos=np.array([-1, -1], dtype=int)
+        self,
+        player: c.Players,
+        init_pos=np.array([-1, -1], dtype=int),
+        board_size: int = c.BOARD_SIZE,
     ):
-        super().__init__(player, init_pos)
+        super().__init__(player, init_pos, board_size)
         self.name = "King"
         # self.symbol = '♔' if self.player == c.Players.WHITE else '♚'
         self.symbol = "K"
         # the king can go up, left, right, and diagonally 1 square = 5 moves
         self.n_moves = 5
 
-    def get_piece_moves(self, board: np.ndarray) -> np.ndarray:
-        _, _, move_cand = super()._init_move_cand(self.n_moves)
-
+    def _generate_move_candidates(self) -> np.ndarray:
         # get coordinates of all new moves, valid or not
         diag_mov = super()._get_diagonal_moves(n_moves_d=1)
         straight_mov = super()._get_straight_moves(n_moves_d=1)
-        move_cand = np.concatenate((diag_mov, straight_mov), axis=0)
-
-        # check which move candidates are valid and filter them out
-        valid_moves = super().filter_moves(move_cand, board)
-
-        return valid_moves
+        return np.concatenate((diag_mov, straight_mov), axis=0)
@@ -0,0 +1,162 @@
+import hashlib
+import numpy as np
+
+import assignment_1.constants as c
+import assignment_1.pieces as p
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The rules are symmetric under two transformations of the board:
+#   MIRROR: reflect the columns (left <-> right). Every piece moves the same
+#       to both sides and the column switch counts do not depend on the
+#       direction of a switch.
+#   COLOUR: reflect the rows and swap the colours of all pieces and the
+#       player to move. White moves up and black moves down, so the swapped
+#       position is the same game seen from the other side.
+# A transform is a bit combination of the two, all four are their own
+# inverse. Note that COLOUR also swaps WHITE_WON and BLACK_WON.
+IDENTITY = 0
+MIRROR = 1
+COLOUR = 2
+ALL_SYMMETRIES = (IDENTITY, MIRROR, COLOUR, MIRROR | COLOUR)
+
+# Every square is encoded in one byte:
+#   bits 0-4: 0 if empty, else 1 + type + 6 * player + 12 * extra_step
+#   bits 5-7: column switches made, capped at the maximum of the piece
+PIECE_BITS = 5
+PIECE_MASK = (1 << PIECE_BITS) - 1
+
+PIECE_TYPES = {
+    p.King: c.ChessPieceTypes.KING,
+    p.Knight: c.ChessPieceTypes.KNIGHT,
+    p.Rook: c.ChessPieceTypes.ROOK,
+    p.Bishop: c.ChessPieceTypes.BISHOP,
+    p.Queen: c.ChessPieceTypes.QUEEN,
+    p.Pawn: c.ChessPieceTypes.PAWN,
+}
+
+
+def _square_code(piece) -> int:
+    if piece is None:
+        return 0
+    code = 1 + PIECE_TYPES[type(piece)].value + 6 * piece.player.value
+    if getattr(piece, "extra_step", False):
+        code += 12
+    switches = min(piece.column_switch_count, piece.column_switch_max)
+    return code | (switches << PIECE_BITS)
+
+
+_square_codes = np.frompyfunc(_square_code, 1, 1)
+
+
+def _colour_flip_table() -> np.ndarray:
+    """
+    Returns the lookup table that swaps the colour in a square code.
+    """
+    table = np.arange(256, dtype=np.uint8)
+    for code in range(256):
+        piece = code & PIECE_MASK
+        if piece == 0 or piece > 24:
+            continue
+        piece_type, rest = (piece - 1) % 6, (piece - 1) // 6
+        player, extra_step = rest % 2, rest // 2
+        flipped = 1 + piece_type + 6 * (1 - player) + 12 * extra_step
+        table[code] = (code & ~PIECE_MASK) | flipped
+    return table
+
+
+_FLIP_COLOUR = _colour_flip_table()
+
+
+def encode_board(board) -> np.ndarray:
+    """
+    Encodes the pieces on a board as a (board_size, board_size) array of
+    square codes.
+
+    :param board: The ChessBoard.
+    :return: The square codes.
+    """
+    return _square_codes(board.board).astype(np.uint8)
+
+
+def transform_codes(
+    codes: np.ndarray, player: c.Players, transform: int
+) -> tuple:
+    """
+    Applies a symmetry to an encoded position.
+
+    :param codes: The square codes.
+    :param player: The player to move.
+    :param transform: Bit combination of MIRROR and COLOUR.
+    :return: Tuple (square codes, player to move) after the transform.
+    """
+    if transform & MIRROR:
+        codes = codes[:, ::-1]
+    if transform & COLOUR:
+        codes = _FLIP_COLOUR[codes[::-1, :]]
+        player = c.Players(1 - player.value)
+    return codes, player
+
+
+def _key(codes: np.ndarray, player: c.Players) -> bytes:
+    return bytes((codes.shape[0], player.value)) + codes.tobytes()
+
+
+def position_key(
+    board, player: c.Players, symmetries: tuple = ALL_SYMMETRIES
+) -> tuple:
+    """
+    Returns the canonical key of a position: the smallest key among all
+    symmetric images of the position. Symmetric positions get the same key,
+    so caches keyed by it share their entries.
+
+    :param board: The ChessBoard.
+    :param player: The player to move.
+    :param symmetries: The transforms to canonicalize over.
+    :return: Tuple (key, transform). The transform maps the position (and
+        its moves, see transform_moves) to the canonical one.
+    """
+    codes = encode_board(board)
+
+    best_key, best_transform = None, IDENTITY
+    for transform in symmetries:
+        key = _key(*transform_codes(codes, player, transform))
+        if best_key is None or key < best_key:
+            best_key, best_transform = key, transform
+
+    return best_key, best_transform
+
+
+def position_hash(key: bytes) -> int:
+    """
+    Returns a 64 bit hash of a position key that is stable across
+    processes, unlike hash().
+
+    :param key: The position key.
+    :return: The hash as an unsigned 64 bit integer.
+    """
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def transform_moves(
+    moves: np.ndarray, transform: int, board_size: int = c.BOARD_SIZE
+) -> np.ndarray:
+    """
+    Applies a symmetry to moves [old_row, old_col, new_row, new_col]. Since
+    every transform is its own inverse, this also maps moves of the
+    canonical position back to the original position.
+
+    :param moves: Array (k, 4) of moves.
+    :param transform: Bit combination of MIRROR and COLOUR.
+    :param board_size: The number of rows and columns of the board.
+    :return: The transformed moves.
+    """
+    moves = np.array(moves, dtype=int).reshape(-1, 4)
+    if transform & MIRROR:
+        moves[:, 1::2] = board_size - 1 - moves[:, 1::2]
+    if transform & COLOUR:
+        moves[:, 0::2] = board_size - 1 - moves[:, 0::2]
+    return moves
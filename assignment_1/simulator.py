@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-import multiprocessing as mp
 import numpy as np
 
 import assignment_1.constants as c
+import assignment_1.moves as mv
+from assignment_1.explorer import PositionCounter, position_record
 from assignment_1.game_state import GameState
+from assignment_1.variant import Variant, get_variant
+from parallel.checkpoint import Checkpoint
+from parallel.executor import Executor
 
 import logging
 
@@ -24,52 +28,167 @@ conf_to_z = {
 }
 
 
-class GameHistory:
+class GameStatsAccumulator:
     """
-    This class is used to store the history of games played. It contains a list
-    of game runs, the winner of each game and the number of games played. One
-    game run is one finished game. When a game is finished, the final GameState
-    is appended to the list of game runs.
+    Mergeable summary of a set of finished games. It holds the counts per
+    outcome, the sum and sum of squares of the number of rounds and the
+    promotion counts, which is all get_statistics() needs. Accumulators are
+    filled inside the workers and merged in the parent, so the final
+    GameState objects never have to leave the workers.
+
+    With keep_results=True the outcome, number of rounds and number of queen
+    promotions of every game are also kept as compact columns, in the order
+    the games were added.
+    With count_positions=True the positions of games that carry a position
+    trace are counted in a PositionCounter.
     """
 
-    def __init__(self):
+    def __init__(
+        self, keep_results: bool = True, count_positions: bool = False
+    ):
         self.logstr = {"className": self.__class__.__name__}
-        self.game_runs: list[GameState] = []
-        self.games_played = 0
+        self.keep_results = keep_results
+        self.positions = PositionCounter() if count_positions else None
+        self.counts = {
+            c.GameStates.WHITE_WON: 0,
+            c.GameStates.BLACK_WON: 0,
+            c.GameStates.DRAW: 0,
+        }
+        self.n = 0
+        self.rounds_sum = 0
+        self.rounds_sum2 = 0
+        self.n_games_queen_promoted = 0
+        self.n_queen_promotions = 0
+
+        # compact per game columns
+        self.results = np.zeros(0, dtype=np.int8)
+        self.rounds = np.zeros(0, dtype=np.int32)
+        self.promotions = np.zeros(0, dtype=np.int16)
+        self.__results_buf: list = []
+        self.__rounds_buf: list = []
+        self.__promotions_buf: list = []
 
     def __str__(self):
-        str = f"Number of games played: {self.games_played}"
+        return f"Number of games accumulated: {self.n}"
 
-        for game_run in self.game_runs:
-            str += f"\n Final game state: {game_run.get_game_state()}"
-            str += f"\n Round number: {game_run.get_round_number()}"
+    def __getstate__(self):
+        # send the columns as arrays, not as lists of Python ints
+        self.__flush()
+        return self.__dict__.copy()
 
-        return str
+    def add(self, game_state: GameState) -> None:
+        """
+        Adds a finished game.
 
-    def add_game_run(self, game_run):
+        :param game_state: The final game state.
         """
-        Adds a game run to the game runs.
+        final_state = game_state.get_game_state()
+        rounds = game_state.get_round_number()
 
-        :param game_run: The game run to be added.
+        self.counts[final_state] += 1
+        self.n += 1
+        self.rounds_sum += rounds
+        self.rounds_sum2 += rounds * rounds
+
+        n_promotions = game_state.get_board().n_queen_promotions
+        self.n_games_queen_promoted += int(n_promotions > 0)
+        self.n_queen_promotions += n_promotions
+
+        if self.keep_results:
+            self.__results_buf.append(final_state.value)
+            self.__rounds_buf.append(rounds)
+            self.__promotions_buf.append(n_promotions)
+
+        if self.positions is not None and game_state.position_trace:
+            self.positions.add_game(game_state.position_trace, final_state)
+
+    def merge(self, other: "GameStatsAccumulator") -> "GameStatsAccumulator":
         """
-        self.game_runs.append(game_run)
-        self.games_played += 1
+        Merges the games of other into this accumulator. Merging is
+        associative; the columns of other are appended after our own.
 
-    def get_game_runs(self) -> list:
+        :param other: The accumulator to merge.
+        :return: This accumulator.
         """
-        Returns the list containing all game runs.
+        for state in self.counts:
+            self.counts[state] += other.counts[state]
+        self.n += other.n
+        self.rounds_sum += other.rounds_sum
+        self.rounds_sum2 += other.rounds_sum2
+        self.n_games_queen_promoted += other.n_games_queen_promoted
+        self.n_queen_promotions += other.n_queen_promotions
+
+        if self.keep_results:
+            if not other.keep_results:
+                raise ValueError("Cannot merge columns that were not kept.")
+            self.__flush()
+            other.__flush()
+            self.results = np.concatenate((self.results, other.results))
+            self.rounds = np.concatenate((self.rounds, other.rounds))
+            self.promotions = np.concatenate(
+                (self.promotions, other.promotions)
+            )
 
-        :return: The game runs.
+        if self.positions is not None:
+            if other.positions is None:
+                raise ValueError("Cannot merge positions that were not kept.")
+            self.positions.merge(other.positions)
+
+        return self
+
+    def __flush(self) -> None:
         """
-        return self.game_runs
+        Moves the buffered per game values into the column arrays.
+        """
+        if self.__results_buf:
+            self.results = np.concatenate(
+                (self.results, np.array(self.__results_buf, dtype=np.int8))
+            )
+            self.rounds = np.concatenate(
+                (self.rounds, np.array(self.__rounds_buf, dtype=np.int32))
+            )
+            self.promotions = np.concatenate(
+                (
+                    self.promotions,
+                    np.array(self.__promotions_buf, dtype=np.int16),
+                )
+            )
+            self.__results_buf = []
+            self.__rounds_buf = []
+            self.__promotions_buf = []
 
-    def get_number_of_games_played(self) -> int:
+    def get_results(self) -> np.ndarray:
         """
-        Returns the number of games played.
+        Returns the final game state value of every game, in order.
 
-        :return: The number of games played.
+        :return: Array with final game state values.
         """
-        return self.games_played
+        if not self.keep_results:
+            raise ValueError("Results were not kept, set keep_results=True.")
+        self.__flush()
+        return self.results
+
+    def get_rounds(self) -> np.ndarray:
+        """
+        Returns the number of rounds of every game, in order.
+
+        :return: Array with the number of rounds.
+        """
+        if not self.keep_results:
+            raise ValueError("Results were not kept, set keep_results=True.")
+        self.__flush()
+        return self.rounds
+
+    def get_promotions(self) -> np.ndarray:
+        """
+        Returns the number of queen promotions of every game, in order.
+
+        :return: Array with the number of queen promotions.
+        """
+        if not self.keep_results:
+            raise ValueError("Results were not kept, set keep_results=True.")
+        self.__flush()
+        return self.promotions
 
     def get_statistics(self) -> dict:
         """
@@ -85,19 +204,10 @@ class GameHistory:
             "white_wins_prop": 0.0,
             "black_wins_prop": 0.0,
             "draws_prop": 0.0,
-            # "white_wins_mean": 0.0,
-            # "black_wins_mean": 0.0,
-            # "draws_mean": 0.0,
             "white_wins_std": 0.0,
             "black_wins_std": 0.0,
             "draws_std": 0.0,
             "games_played": 0,
-            # "white_wins_binomial_ci_99": 0.0,
-            # "black_wins_binomial_ci_99": 0.0,
-            # "draws_binomial_ci_99": 0.0,
-            # "white_wins_binomial_ci_95": 0.0,
-            # "black_wins_binomial_ci_95": 0.0,
-            # "draws_binomial_ci_95": 0.0,
             "white_wins_normal_ci_99": 0.0,
             "black_wins_normal_ci_99": 0.0,
             "draws_normal_ci_99": 0.0,
@@ -113,34 +223,28 @@ class GameHistory:
             "n_games_queen_promoted_ci_95": 0.0,
             "results": [],
             "rounds_per_match": [],
+            "promotions_per_match": [],
         }
+        statistics.update(self.counts)
 
-        # go over all final game states and compute the statistics
-        round_numbers = np.ones(self.games_played) * -1
-        n_games_queen_promoted = 0
-        statistics["results"] = np.ones(self.games_played) * -1
-
-        for i, game_run in enumerate(self.game_runs):
-            final_state = game_run.get_game_state()
-            statistics[final_state] += 1
-            round_numbers[i] = game_run.get_round_number()
-            statistics["results"][i] = final_state.value
-            n_games_queen_promoted += game_run.game_had_queen_promoted()
-        statistics["rounds_per_match"] = round_numbers
+        if self.keep_results:
+            statistics["results"] = self.get_results().astype(float)
+            statistics["rounds_per_match"] = self.get_rounds().astype(float)
+            statistics["promotions_per_match"] = self.get_promotions()
 
         # compute the proportions of the game results
-        n = self.games_played
-        p_white = statistics[c.GameStates.WHITE_WON] / n
-        p_black = statistics[c.GameStates.BLACK_WON] / n
-        p_draw = statistics[c.GameStates.DRAW] / n
+        n = self.n
+        p_white = self.counts[c.GameStates.WHITE_WON] / n
+        p_black = self.counts[c.GameStates.BLACK_WON] / n
+        p_draw = self.counts[c.GameStates.DRAW] / n
         statistics["white_wins_prop"] = np.round(p_white, 3)
         statistics["black_wins_prop"] = np.round(p_black, 3)
         statistics["draws_prop"] = np.round(p_draw, 3)
         statistics["games_played"] = n
 
         # statistics for queen promotion
-        p_queen_promoted = n_games_queen_promoted / n
-        statistics["n_games_queen_promoted"] = n_games_queen_promoted
+        p_queen_promoted = self.n_games_queen_promoted / n
+        statistics["n_games_queen_promoted"] = self.n_games_queen_promoted
         statistics["n_games_queen_promoted_prop"] = np.round(
             p_queen_promoted, 3
         )
@@ -151,58 +255,43 @@ class GameHistory:
             n, p_queen_promoted, 0.95
         )
 
-        # compute statistics for game result proportions - binomial distributions CI
-        # below gave same numbers as for confidence intervals with normal distributions
-        # statistics["white_wins_binomial_ci_99"] = self.__ci_binomial(n, p_white, 0.99)
-        # statistics["black_wins_binomial_ci_99"] = self.__ci_binomial(n, p_black, 0.99)
-        # statistics["draws_binomial_ci_99"] = self.__ci_binomial(n, p_draw, 0.99)
-        # statistics["white_wins_binomial_ci_95"] = self.__ci_binomial(n, p_white, 0.95)
-        # statistics["black_wins_binomial_ci_95"] = self.__ci_binomial(n, p_black, 0.95)
-        # statistics["draws_binomial_ci_95"] = self.__ci_binomial(n, p_draw, 0.95)
-
-        # game result proportions - mean and standard deviations
-        # statistics["white_wins_mean"] = np.mean(results == 1)
-        # statistics["black_wins_mean"] = np.mean(results == 2)
-        # statistics["draws_mean"] = np.mean(results == 0)
-        statistics["white_wins_std"] = np.round(
-            np.std(statistics["results"] == 1), 4
-        )
-        statistics["black_wins_std"] = np.round(
-            np.std(statistics["results"] == 2), 4
-        )
-        statistics["draws_std"] = np.round(
-            np.std(statistics["results"] == 3), 4
-        )
+        # game result proportions - the variance of an indicator is p(1-p)
+        var_white = p_white * (1 - p_white)
+        var_black = p_black * (1 - p_black)
+        var_draw = p_draw * (1 - p_draw)
+        statistics["white_wins_std"] = np.round(np.sqrt(var_white), 4)
+        statistics["black_wins_std"] = np.round(np.sqrt(var_black), 4)
+        statistics["draws_std"] = np.round(np.sqrt(var_draw), 4)
 
         # game result proportions - normal distribution CI
         statistics["white_wins_normal_ci_99"] = self.__ci_normal(
-            n, p_white, np.var(statistics["results"] == 1), 0.99
+            n, p_white, var_white, 0.99
         )
         statistics["black_wins_normal_ci_99"] = self.__ci_normal(
-            n, p_black, np.var(statistics["results"] == 2), 0.99
+            n, p_black, var_black, 0.99
         )
         statistics["draws_normal_ci_99"] = self.__ci_normal(
-            n, p_draw, np.var(statistics["results"] == 3), 0.99
+            n, p_draw, var_draw, 0.99
         )
         statistics["white_wins_normal_ci_95"] = self.__ci_normal(
-            n, p_white, np.var(statistics["results"] == 1), 0.95
+            n, p_white, var_white, 0.95
         )
         statistics["black_wins_normal_ci_95"] = self.__ci_normal(
-            n, p_black, np.var(statistics["results"] == 2), 0.95
+            n, p_black, var_black, 0.95
         )
         statistics["draws_normal_ci_95"] = self.__ci_normal(
-            n, p_draw, np.var(statistics["results"] == 3), 0.95
+            n, p_draw, var_draw, 0.95
         )
 
         # compute statistics for mean number of rounds per game
-        statistics["mean_rounds_per_game"] = np.round(
-            np.mean(round_numbers), 3
-        )
+        mean_rounds = self.rounds_sum / n
+        var_rounds = max(self.rounds_sum2 / n - mean_rounds**2, 0.0)
+        statistics["mean_rounds_per_game"] = np.round(mean_rounds, 3)
         statistics["mean_rounds_per_game_ci_99"] = self.__ci_normal(
-            n, np.mean(round_numbers), np.var(round_numbers), 0.99
+            n, mean_rounds, var_rounds, 0.99
         )
         statistics["mean_rounds_per_game_ci_95"] = self.__ci_normal(
-            n, np.mean(round_numbers), np.var(round_numbers), 0.95
+            n, mean_rounds, var_rounds, 0.95
         )
 
         return statistics
@@ -247,17 +336,154 @@ class GameHistory:
         return (u_low, u_up)
 
 
+class GameHistory:
+    """
+    This class is used to store the history of games played. The results of
+    all games are summarized in a GameStatsAccumulator. The final GameState
+    of every game is only kept when keep_game_runs is True.
+    """
+
+    def __init__(
+        self,
+        keep_game_runs: bool = False,
+        keep_results: bool = True,
+        count_positions: bool = False,
+    ):
+        self.logstr = {"className": self.__class__.__name__}
+        self.game_runs: list[GameState] = []
+        self.games_played = 0
+        self.keep_game_runs = keep_game_runs
+        self.accumulator = GameStatsAccumulator(
+            keep_results=keep_results, count_positions=count_positions
+        )
+
+    def __str__(self):
+        str = f"Number of games played: {self.games_played}"
+
+        for game_run in self.game_runs:
+            str += f"\n Final game state: {game_run.get_game_state()}"
+            str += f"\n Round number: {game_run.get_round_number()}"
+
+        return str
+
+    def add_game_run(self, game_run):
+        """
+        Adds a game run to the game runs.
+
+        :param game_run: The game run to be added.
+        """
+        self.accumulator.add(game_run)
+        if self.keep_game_runs:
+            self.game_runs.append(game_run)
+        self.games_played += 1
+
+    def add_accumulator(self, accumulator: GameStatsAccumulator):
+        """
+        Adds the games summarized by an accumulator, e.g. from a worker.
+
+        :param accumulator: The accumulator to be merged.
+        """
+        self.accumulator.merge(accumulator)
+        self.games_played += accumulator.n
+
+    def get_game_runs(self) -> list:
+        """
+        Returns the list containing all game runs. Empty unless the history
+        was created with keep_game_runs=True.
+
+        :return: The game runs.
+        """
+        return self.game_runs
+
+    def get_number_of_games_played(self) -> int:
+        """
+        Returns the number of games played.
+
+        :return: The number of games played.
+        """
+        return self.games_played
+
+    def get_outcome_counts(self) -> dict:
+        """
+        Counts the final game states of all games played.
+
+        :return: Dictionary GameStates -> number of games.
+        """
+        return dict(self.accumulator.counts)
+
+    def get_results(self) -> np.ndarray:
+        """
+        Returns the final game state values of all games in the order in
+        which they were played.
+
+        :return: Array with the final game state value of every game.
+        """
+        return self.accumulator.get_results()
+
+    def get_promotions(self) -> np.ndarray:
+        """
+        Returns the number of queen promotions of all games in the order in
+        which they were played.
+
+        :return: Array with the number of queen promotions of every game.
+        """
+        return self.accumulator.get_promotions()
+
+    def get_position_counter(self) -> PositionCounter:
+        """
+        Returns the counts of the positions visited in all games played.
+
+        :return: The PositionCounter.
+        """
+        if self.accumulator.positions is None:
+            raise ValueError(
+                "Positions were not counted, set count_positions=True."
+            )
+        return self.accumulator.positions
+
+    def get_statistics(self) -> dict:
+        """
+        Computes the statistics of the game results.
+
+        :return: Dictionary with statistics.
+        """
+        return self.accumulator.get_statistics()
+
+
 class Simulator(ABC):
     """
     A base class to represent a simulator.
     """
 
-    def __init__(self, parallelize: bool, n_jobs: int):
+    def __init__(
+        self,
+        parallelize: bool,
+        n_jobs: int,
+        executor: Executor = None,
+        keep_game_runs: bool = False,
+        keep_results: bool = True,
+        count_positions: bool = False,
+    ):
         super().__init__()
         self.logstr = {"className": self.__class__.__name__}
-        self.game_history: GameHistory = GameHistory()
+        self.keep_game_runs = keep_game_runs
+        self.keep_results = keep_results
+        self.count_positions = count_positions
+        self.game_history: GameHistory = GameHistory(
+            keep_game_runs=keep_game_runs,
+            keep_results=keep_results,
+            count_positions=count_positions,
+        )
         self.parallelize = parallelize
         self.n_jobs: int = n_jobs
+        self.executor = executor
+
+    def __getstate__(self):
+        # workers only need the configuration, not the results or the pool
+        state = self.__dict__.copy()
+        state["game_history"] = None
+        state["executor"] = None
+        return state
 
     def get_game_history(self) -> GameHistory:
         """
@@ -271,39 +497,133 @@ class Simulator(ABC):
             )
         return self.game_history
 
-    def run(self, n: int) -> None:
+    def get_executor(self) -> Executor:
+        """
+        Returns the executor used to parallelize the runs. If none was given,
+        the simulator creates one and keeps it for all following runs.
+
+        :return: The executor.
+        """
+        if self.executor is None:
+            self.executor = Executor(n_jobs=self.n_jobs)
+        return self.executor
+
+    def run(
+        self,
+        n: int,
+        checkpoint: str = None,
+        resume: bool = False,
+        checkpoint_interval: float = 60.0,
+    ) -> None:
         """
-        Starts the simulation.
+        Starts the simulation. Successive calls continue the game numbering,
+        so seeded runs do not repeat games.
 
         :param n: The number of simulation runs to perform.
+        :param checkpoint: Path of a file the game history is saved to
+            periodically while the games run.
+        :param resume: Whether to continue from the checkpoint of an
+            interrupted run with the same n, if it exists.
+        :param checkpoint_interval: Minimum seconds between two checkpoints.
         """
+        n_target = self.game_history.get_number_of_games_played() + n
+
+        checkpointer = None
+        if checkpoint is not None:
+            checkpointer = Checkpoint(
+                checkpoint,
+                meta=self._get_checkpoint_meta(),
+                n_target=n_target,
+                interval=checkpoint_interval,
+            )
+            if resume:
+                history = checkpointer.load()
+                if history is not None:
+                    self.game_history = history
+
         # the results of the simulation runs will be written to the game history
-        self.__do_n_runs(n, self.game_history, self.parallelize)
+        n_left = n_target - self.game_history.get_number_of_games_played()
+        self.__do_n_runs(
+            n_left, self.game_history, self.parallelize, checkpointer
+        )
+
+        if checkpointer is not None:
+            checkpointer.update(self.game_history, n_target, force=True)
+
+    def _get_checkpoint_meta(self) -> dict:
+        """
+        Returns the configuration a checkpoint must match to be resumed.
+
+        :return: Dictionary with the simulator class, seed and what the game
+            history keeps.
+        """
+        return {
+            "simulator": self.__class__.__name__,
+            "seed": getattr(self, "seed", None),
+            "keep_game_runs": self.keep_game_runs,
+            "keep_results": self.keep_results,
+            "count_positions": self.count_positions,
+        }
 
     def __do_n_runs(
         self,
         n: int,
         game_history: GameHistory,
         parallelize: bool = False,
+        checkpoint: Checkpoint = None,
     ) -> None:
         """
         Runs n simulations.
 
         :param n: The number of simulation runs to perform.
         :param parallelize: Whether to parallelize the simulation.
+        :param checkpoint: Checkpoint that saves the game history, if any.
         """
-        # if parallelization is enabled, use multiprocessing
-        if parallelize:
-            with mp.Pool(processes=self.n_jobs) as pool:
-                results = pool.map(self._do_one_run, range(n))
+        first = game_history.get_number_of_games_played()
+        indices = range(first, first + n)
 
+        # if parallelization is enabled or an executor was given, use it
+        if parallelize or self.executor is not None:
+            for _, result in self.get_executor().imap(self, indices):
                 # add the results to the game history
-                for result in results:
-                    game_history.add_game_run(result)
+                if self.keep_game_runs:
+                    for game_run in result:
+                        game_history.add_game_run(game_run)
+                else:
+                    game_history.add_accumulator(result)
+                self.__update_checkpoint(checkpoint, game_history)
         else:
-            for i in range(n):
+            for i in indices:
                 result = self._do_one_run(i)
                 game_history.add_game_run(result)
+                self.__update_checkpoint(checkpoint, game_history)
+
+    def __update_checkpoint(
+        self, checkpoint: Checkpoint, game_history: GameHistory
+    ) -> None:
+        if checkpoint is not None:
+            checkpoint.update(
+                game_history, game_history.get_number_of_games_played()
+            )
+
+    def _do_chunk(self, indices: list):
+        """
+        Runs the games with the given numbers, used by the worker pool. The
+        games are summarized in the worker unless keep_game_runs is set.
+
+        :param indices: The numbers of the game runs.
+        :return: List with the final game states or a GameStatsAccumulator.
+        """
+        if self.keep_game_runs:
+            return [self._do_one_run(i) for i in indices]
+
+        accumulator = GameStatsAccumulator(
+            keep_results=self.keep_results,
+            count_positions=self.count_positions,
+        )
+        for i in indices:
+            accumulator.add(self._do_one_run(i))
+        return accumulator
 
     @abstractmethod
     def _do_one_run(self, n: int) -> GameState:
@@ -318,6 +638,20 @@ class Simulator(ABC):
 class ChessSimulator(Simulator):
     """
     Implements the chess specific simulator.
+
+    If a seed is given, every strategy gets its own random stream for every
+    game, derived from (seed, game index, stream id). Two simulators with the
+    same seed therefore use common random numbers game by game. The stream
+    ids are the player values; swap_streams exchanges them, so a
+    colour-swapped mirror simulator gives every role the stream it had in
+    the original game.
+
+    The games are played on the 5x5 baby chess board unless another Variant
+    (board size and initial setup) is given.
+
+    With count_positions=True the canonical hash of every position in which
+    a player has to move is recorded, and the game history counts how often
+    each position was reached and how those games ended, see explorer.py.
     """
 
     def __init__(
@@ -326,21 +660,78 @@ class ChessSimulator(Simulator):
         white_strat,  # type: Strategy
         parallelize: bool = False,
         n_jobs: int = 1,
+        seed: int = None,
+        swap_streams: bool = False,
+        executor: Executor = None,
+        keep_game_runs: bool = False,
+        keep_results: bool = True,
+        variant: Variant = None,
+        count_positions: bool = False,
     ):
         self.black_strat = black_strat
         self.white_strat = white_strat
-        super().__init__(parallelize=parallelize, n_jobs=n_jobs)
+        self.seed = seed
+        self.variant = variant
+        self.swap_streams = swap_streams
+        super().__init__(
+            parallelize=parallelize,
+            n_jobs=n_jobs,
+            executor=executor,
+            keep_game_runs=keep_game_runs,
+            keep_results=keep_results,
+            count_positions=count_positions,
+        )
+
+    def _seed_strategies(self, n: int) -> None:
+        """
+        Seeds the random streams of both strategies for game n.
+
+        :param n: The number of the game run.
+        """
+        for strat, player in (
+            (self.white_strat, c.Players.WHITE),
+            (self.black_strat, c.Players.BLACK),
+        ):
+            stream_id = player.value
+            if self.swap_streams:
+                stream_id = 1 - stream_id
+            seed_seq = np.random.SeedSequence([self.seed, n, stream_id])
+            strat.set_seed(int(seed_seq.generate_state(1)[0]))
+
+    def _get_checkpoint_meta(self) -> dict:
+        """
+        Returns the configuration a checkpoint must match to be resumed.
+
+        :return: Dictionary with the configuration of the base class, the
+            strategies, the variant and the stream assignment.
+        """
+        meta = super()._get_checkpoint_meta()
+        meta["white_strat"] = self.white_strat.get_config()
+        meta["black_strat"] = self.black_strat.get_config()
+        meta["variant"] = (
+            get_variant() if self.variant is None else self.variant
+        ).get_config()
+        meta["swap_streams"] = self.swap_streams
+        return meta
 
     def _do_one_run(self, n: int) -> GameState:
+        if self.seed is not None:
+            self._seed_strategies(n)
+
         game_state = GameState(
             white_en_dbl_mv_pawn=self.white_strat.get_allow_two_step_pawn(),  # type: ignore
             black_en_dbl_mv_pawn=self.black_strat.get_allow_two_step_pawn(),  # type: ignore
+            variant=self.variant,
         )
+        board = game_state.get_board()
+        trace = ([], [], []) if self.count_positions else None
 
         # run the game until it is over, then return the final game state obj
         while game_state.get_game_state() == c.GameStates.ONGOING:
             # increment the round number
             game_state.increment_round_number()
+            if trace is not None:
+                self.__record_position(game_state, trace)
             logger.debug(
                 (
                     f"Round: {game_state.get_round_number()}; "
@@ -358,21 +749,28 @@ class ChessSimulator(Simulator):
             if move is None:
                 break
 
+            # strategies may return a move code or a 4 element array
+            move_arr = mv.as_move_array(move, board.board_size)
             logger.debug(
                 (
                     f"Player {game_state.get_current_player()} moved"
-                    f" {move[0], move[1]} to {move[2], move[3]}"
+                    f" {move_arr[0], move_arr[1]} to"
+                    f" {move_arr[2], move_arr[3]}"
                 ),
                 extra=self.logstr,
             )
+            piece = board.board[move_arr[0], move_arr[1]]
             if (
-                game_state.chess_board.board[move[0], move[1]].name == "Pawn"  # type: ignore
-                and move[2] % 4 == 0
+                piece.name == "Pawn"  # type: ignore
+                and move_arr[2]
+                == board.variant.get_promotion_row(
+                    game_state.get_current_player()
+                )
             ):
                 logger.debug(
                     (
                         f"Player {game_state.get_current_player()} promoted"
-                        f" pawn to queen at {move[2], move[3]}"
+                        f" pawn to queen at {move_arr[2], move_arr[3]}"
                     ),
                     extra=self.logstr,
                 )
@@ -380,8 +778,28 @@ class ChessSimulator(Simulator):
             # start new round
             game_state.start_new_round(move)
 
+        if trace is not None:
+            game_state.position_trace = (
+                np.array(trace[0], dtype=np.uint16),
+                np.array(trace[1], dtype=np.uint64),
+                np.array(trace[2], dtype=bool),
+            )
+
         # log final board state
         logger.info(
             f"Final board state: \n{game_state.get_board()}", extra=self.logstr
         )
         return game_state
+
+    def __record_position(self, game_state: GameState, trace: tuple) -> None:
+        """
+        Appends the ply and canonical hash of the current position to the
+        trace of the game.
+
+        :param game_state: The game state.
+        :param trace: Tuple of lists (plies, hashes, colour swapped).
+        """
+        position_hash, swapped = position_record(game_state)
+        trace[0].append(game_state.get_round_number())
+        trace[1].append(position_hash)
+        trace[2].append(swapped)
@@ -0,0 +1,168 @@
+import numpy as np
+
+import assignment_1.constants as c
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SPRT:
+    """
+    Sequential probability ratio test on top of a ChessSimulator. Games are
+    played in batches and after every batch the win/draw/loss counts of the
+    tested strategy are used to compute the log-likelihood ratio of
+    H1: elo = elo1 against H0: elo = elo0 (generalized SPRT with a normal
+    approximation of the score). The test stops as soon as one of the
+    hypotheses is accepted.
+
+    The Elo difference is measured from the point of view of the strategy
+    playing as player, so it includes any advantage of that colour.
+    """
+
+    # games of every outcome added to the counts when estimating the variance
+    PSEUDO_COUNT = 0.5
+
+    def __init__(
+        self,
+        simulator,  # type: ChessSimulator
+        player: c.Players = c.Players.WHITE,
+        elo0: float = 0.0,
+        elo1: float = 10.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ):
+        self.logstr = {"className": self.__class__.__name__}
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be larger than elo0.")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError("alpha and beta must be in (0, 1).")
+
+        self.simulator = simulator
+        self.player = player
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+
+        # acceptance bounds on the log-likelihood ratio
+        self.lower_bound = np.log(beta / (1 - alpha))
+        self.upper_bound = np.log((1 - beta) / alpha)
+
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def __str__(self):
+        return (
+            f"SPRT elo0={self.elo0} elo1={self.elo1}: +{self.wins}"
+            f" ={self.draws} -{self.losses}, LLR={self.get_llr():.3f}"
+            f" [{self.lower_bound:.3f}, {self.upper_bound:.3f}]"
+        )
+
+    def add_results(self, counts: dict) -> None:
+        """
+        Adds the outcome counts of a batch of games.
+
+        :param counts: Dictionary GameStates -> number of games.
+        """
+        if self.player == c.Players.WHITE:
+            won, lost = c.GameStates.WHITE_WON, c.GameStates.BLACK_WON
+        else:
+            won, lost = c.GameStates.BLACK_WON, c.GameStates.WHITE_WON
+
+        self.wins += counts.get(won, 0)
+        self.losses += counts.get(lost, 0)
+        self.draws += counts.get(c.GameStates.DRAW, 0)
+
+    def get_llr(self) -> float:
+        """
+        Computes the log-likelihood ratio of H1 against H0.
+
+        :return: The log-likelihood ratio.
+        """
+        n = self.wins + self.draws + self.losses
+        if n == 0:
+            return 0.0
+
+        # mean score of one game (win=1, draw=0.5)
+        score = (self.wins + 0.5 * self.draws) / n
+
+        # variance of the score with half a game of every outcome added, so
+        # it stays positive if all games ended the same way
+        wins, draws, losses = (
+            k + self.PSEUDO_COUNT for k in (self.wins, self.draws, self.losses)
+        )
+        n_var = wins + draws + losses
+        score_var = (wins + 0.5 * draws) / n_var
+        var = (
+            wins * (1 - score_var) ** 2
+            + draws * (0.5 - score_var) ** 2  # noqa: W503
+            + losses * score_var**2  # noqa: W503
+        ) / n_var
+
+        s0 = self.__elo_to_score(self.elo0)
+        s1 = self.__elo_to_score(self.elo1)
+
+        return (s1 - s0) * (2 * score - s0 - s1) / (2 * var / n)
+
+    def get_decision(self):
+        """
+        Returns the decision of the test.
+
+        :return: "H0" or "H1" if a hypothesis was accepted, None otherwise.
+        """
+        llr = self.get_llr()
+        if llr >= self.upper_bound:
+            return "H1"
+        if llr <= self.lower_bound:
+            return "H0"
+        return None
+
+    def run(self, batch_size: int = 50, max_games: int = 10000) -> dict:
+        """
+        Plays batches of games until a hypothesis is accepted or max_games
+        games have been played.
+
+        :param batch_size: The number of games per batch.
+        :param max_games: The maximum number of games to play.
+        :return: Dictionary with the result of the test.
+        """
+        game_history = self.simulator.get_game_history()
+        games_played = 0
+
+        while self.get_decision() is None and games_played < max_games:
+            n = min(batch_size, max_games - games_played)
+            counts_before = game_history.get_outcome_counts()
+            self.simulator.run(n)
+            counts_after = game_history.get_outcome_counts()
+            self.add_results(
+                {k: counts_after[k] - counts_before[k] for k in counts_after}
+            )
+            games_played += n
+            logger.debug(str(self), extra=self.logstr)
+
+        logger.info(str(self), extra=self.logstr)
+
+        return {
+            "decision": self.get_decision(),
+            "llr": np.round(self.get_llr(), 3),
+            "llr_bounds": (
+                np.round(self.lower_bound, 3),
+                np.round(self.upper_bound, 3),
+            ),
+            "games_played": self.wins + self.draws + self.losses,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+        }
+
+    @staticmethod
+    def __elo_to_score(elo: float) -> float:
+        """
+        Converts an Elo difference to an expected score.
+
+        :param elo: The Elo difference.
+        :return: The expected score.
+        """
+        return 1 / (1 + 10 ** (-elo / 400))
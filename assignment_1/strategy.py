@@ -1,8 +1,10 @@
 import random
 from abc import ABC, abstractmethod
+import numpy as np
 
 import assignment_1.constants as c
 from assignment_1.game_state import GameState
+from dist.streams import Uniform
 
 import logging
 
@@ -13,6 +15,36 @@ class Strategy(ABC):
     def __init__(self, player: c.Players):
         self.player: c.Players = player
         self.move_history: list = []
+        self.rng: Uniform = None  # own random stream, see set_seed
+
+    def get_rng(self):
+        """
+        Returns the random stream of the strategy. Without a seed this is the
+        global random module, which is reseeded in every forked worker.
+
+        :return: The random stream.
+        """
+        return random if self.rng is None else self.rng
+
+    def set_seed(self, seed: int) -> None:
+        """
+        Gives the strategy its own buffered random stream, seeded with seed.
+
+        :param seed: The seed of the random stream.
+        """
+        self.rng = Uniform(np.random.default_rng(seed))
+
+    def get_config(self) -> dict:
+        """
+        Returns the configuration of the strategy, e.g. to check that a
+        checkpoint was written with the same strategies.
+
+        :return: Dictionary with the strategy class and player.
+        """
+        return {
+            "strategy": self.__class__.__name__,
+            "player": self.player.value,
+        }
 
     @abstractmethod
     def get_move(self, game_state: GameState):
@@ -35,12 +67,17 @@ class RandomStrategy(Strategy):
     def get_allow_two_step_pawn(self) -> bool:
         return self.allow_two_step_pawn
 
+    def get_config(self) -> dict:
+        config = super().get_config()
+        config["allow_two_step_pawn"] = self.allow_two_step_pawn
+        return config
+
     def get_move(self, game_state: GameState):
         if type(game_state) is not GameState:
             raise TypeError("game_state must be of type GameState.")
 
-        # get a list of valid moves
-        valid_moves = game_state.get_valid_moves(self.player)
+        # get a list of valid moves as move codes
+        valid_moves = game_state.get_valid_moves(self.player, encoded=True)
 
         # randomly select a move
         n_moves = len(valid_moves)
@@ -71,5 +108,5 @@ class RandomStrategy(Strategy):
             return None
 
         # randomly select a move, uniform distribution
-        random_move = valid_moves[random.randint(0, n_moves - 1)]
-        return random_move
+        random_move = valid_moves[self.get_rng().randint(0, n_moves - 1)]
+        return int(random_move)
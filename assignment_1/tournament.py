@@ -0,0 +1,264 @@
+import numpy as np
+
+import assignment_1.constants as c
+from assignment_1.simulator import ChessSimulator, conf_to_z
+from parallel.executor import Executor
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Tournament:
+    """
+    Round-robin tournament between a list of strategies. Every pair of
+    strategies plays n_games games with each colour, so every pairing is
+    played 2 * n_games times. The results are streamed into per-pair tallies
+    from which Bradley-Terry / Elo ratings are fitted.
+
+    A strategy factory is any callable that takes a player and returns a
+    Strategy for that player, e.g. RandomStrategy itself or
+    functools.partial(RandomStrategy, allow_two_step_pawn=True).
+    """
+
+    def __init__(
+        self,
+        strategy_factories: list,
+        names: list = None,
+        parallelize: bool = False,
+        n_jobs: int = 1,
+        executor: Executor = None,
+    ):
+        self.logstr = {"className": self.__class__.__name__}
+        self.n_strategies = len(strategy_factories)
+        if self.n_strategies < 2:
+            raise ValueError("A tournament needs at least two strategies.")
+
+        # create one strategy object per colour for every factory
+        self.strategies = [
+            {player: factory(player) for player in c.Players}
+            for factory in strategy_factories
+        ]
+
+        if names is None:
+            names = [
+                f"{s[c.Players.WHITE].__class__.__name__}{i}"
+                for i, s in enumerate(self.strategies)
+            ]
+        if len(names) != self.n_strategies:
+            raise ValueError("Number of names must match nr. of strategies.")
+        self.names = list(names)
+
+        self.parallelize = parallelize
+        self.n_jobs = n_jobs
+        self.executor = executor
+
+        # all ordered pairings (white, black), so colours are swapped
+        self.pairings = [
+            (i, j)
+            for i in range(self.n_strategies)
+            for j in range(self.n_strategies)
+            if i != j
+        ]
+
+        # per-pair tallies, wins[i, j] = nr. of games strategy i beat j
+        self.wins = np.zeros((self.n_strategies, self.n_strategies), int)
+        self.draws = np.zeros((self.n_strategies, self.n_strategies), int)
+        self.white_wins = 0
+        self.black_wins = 0
+        self.games_played = 0
+        self.rounds_sum = 0
+
+    def __str__(self):
+        s = f"Number of games played: {self.games_played}"
+        for i in range(self.n_strategies):
+            for j in range(i + 1, self.n_strategies):
+                s += (
+                    f"\n {self.names[i]} vs {self.names[j]}:"
+                    f" +{self.wins[i, j]} ={self.draws[i, j]}"
+                    f" -{self.wins[j, i]}"
+                )
+        return s
+
+    def run(self, n_games: int) -> None:
+        """
+        Plays n_games games per pairing and colour. Results are added to the
+        tallies as soon as they come in.
+
+        :param n_games: The number of games per pairing and colour.
+        """
+        n_tasks = n_games * len(self.pairings)
+        tasks = range(self.games_played, self.games_played + n_tasks)
+
+        # an executor that is given is used even without parallelize
+        if self.parallelize or self.executor is not None:
+            if self.executor is None:
+                self.executor = Executor(n_jobs=self.n_jobs)
+            for _, results in self.executor.imap(self, tasks):
+                for result in results:
+                    self.__add_result(*result)
+        else:
+            for task in tasks:
+                self.__add_result(*self._do_one_run(task))
+
+        logger.info(
+            f"Tournament finished {n_tasks} games. {self}", extra=self.logstr
+        )
+
+    def __getstate__(self):
+        # workers only need the strategies, not the tallies or the pool
+        state = self.__dict__.copy()
+        state["executor"] = None
+        for key in ("wins", "draws"):
+            state[key] = np.zeros_like(state[key])
+        for key in ("white_wins", "black_wins", "games_played", "rounds_sum"):
+            state[key] = 0
+        return state
+
+    def _do_chunk(self, tasks: list) -> list:
+        """
+        Plays the games with the given schedule indices, used by the pool.
+
+        :param tasks: Indices of the games in the schedule.
+        :return: List with the results of _do_one_run.
+        """
+        return [self._do_one_run(task) for task in tasks]
+
+    def _do_one_run(self, task: int) -> tuple:
+        """
+        Plays one game of the schedule.
+
+        :param task: Index of the game in the schedule.
+        :return: Tuple (white index, black index, final game state, rounds).
+        """
+        white, black = self.pairings[task % len(self.pairings)]
+
+        simulator = ChessSimulator(
+            black_strat=self.strategies[black][c.Players.BLACK],
+            white_strat=self.strategies[white][c.Players.WHITE],
+        )
+        game_state = simulator._do_one_run(task)
+
+        return (
+            white,
+            black,
+            game_state.get_game_state(),
+            game_state.get_round_number(),
+        )
+
+    def __add_result(
+        self, white: int, black: int, result: c.GameStates, rounds: int
+    ) -> None:
+        """
+        Adds the result of one game to the tallies.
+
+        :param white: Index of the strategy that played white.
+        :param black: Index of the strategy that played black.
+        :param result: Final state of the game.
+        :param rounds: Number of rounds played.
+        """
+        if result == c.GameStates.WHITE_WON:
+            self.wins[white, black] += 1
+            self.white_wins += 1
+        elif result == c.GameStates.BLACK_WON:
+            self.wins[black, white] += 1
+            self.black_wins += 1
+        elif result == c.GameStates.DRAW:
+            self.draws[white, black] += 1
+            self.draws[black, white] += 1
+        else:
+            raise ValueError("Game did not finish.")
+
+        self.games_played += 1
+        self.rounds_sum += rounds
+
+    def get_tallies(self) -> dict:
+        """
+        Returns the tallies per pair of strategies.
+
+        :return: Dictionary (name_i, name_j) -> (wins i, draws, wins j).
+        """
+        tallies = {}
+        for i in range(self.n_strategies):
+            for j in range(i + 1, self.n_strategies):
+                tallies[(self.names[i], self.names[j])] = (
+                    int(self.wins[i, j]),
+                    int(self.draws[i, j]),
+                    int(self.wins[j, i]),
+                )
+        return tallies
+
+    def get_ratings(
+        self,
+        alpha: float = 0.95,
+        prior_draws: float = 1.0,
+        max_iter: int = 10000,
+        tol: float = 1e-10,
+    ) -> dict:
+        """
+        Fits a Bradley-Terry model to the tallies, counting a draw as half a
+        win for both sides, and returns the corresponding Elo ratings. The
+        ratings are anchored such that the mean rating is 0.
+
+        :param alpha: The confidence level of the intervals.
+        :param prior_draws: Virtual draws added to every pairing to keep the
+            fit finite when a strategy wins or loses all of its games.
+        :param max_iter: Maximum number of MM iterations.
+        :param tol: Convergence tolerance on the log-strengths.
+        :return: Dictionary name -> statistics of the strategy.
+        """
+        n = self.n_strategies
+        games = self.wins + self.wins.T + self.draws + prior_draws
+        np.fill_diagonal(games, 0)
+        score = self.wins + 0.5 * (self.draws + prior_draws)
+        np.fill_diagonal(score, 0)
+        total_score = score.sum(axis=1)
+
+        if (games.sum(axis=1) == 0).any():
+            raise ValueError("Every strategy must have played a game.")
+
+        # minorization-maximization (Hunter, 2004) on the strengths
+        theta = np.zeros(n)
+        for _ in range(max_iter):
+            p = np.exp(theta)
+            denom = (games / (p[:, None] + p[None, :])).sum(axis=1)
+            theta_new = np.log(total_score / denom)
+            theta_new -= theta_new.mean()
+            converged = np.max(np.abs(theta_new - theta)) < tol
+            theta = theta_new
+            if converged:
+                break
+
+        # covariance from the Fisher information, constrained to mean 0
+        p = np.exp(theta)
+        pij = p[:, None] * p[None, :] / (p[:, None] + p[None, :]) ** 2
+        info = -games * pij
+        np.fill_diagonal(info, 0)
+        np.fill_diagonal(info, -info.sum(axis=1))
+        cov = np.linalg.pinv(info)
+
+        # actual results, without the virtual draws
+        games_played = (self.wins + self.wins.T + self.draws).sum(axis=1)
+        score_played = (self.wins + 0.5 * self.draws).sum(axis=1)
+
+        # convert natural log-strengths to the Elo scale
+        elo_scale = 400 / np.log(10)
+        elo = elo_scale * theta
+        elo_std = elo_scale * np.sqrt(np.clip(np.diag(cov), 0, None))
+        z = conf_to_z[alpha]
+
+        ratings = {}
+        for i, name in enumerate(self.names):
+            ratings[name] = {
+                "elo": np.round(elo[i], 1),
+                "elo_std": np.round(elo_std[i], 1),
+                f"elo_normal_ci_{int(alpha * 100)}": (
+                    np.round(elo[i] - z * elo_std[i], 1),
+                    np.round(elo[i] + z * elo_std[i], 1),
+                ),
+                "bt_strength": np.round(p[i], 4),
+                "score": score_played[i],
+                "games_played": games_played[i],
+            }
+
+        return ratings
@@ -0,0 +1,187 @@
+from functools import lru_cache
+import numpy as np
+
+import assignment_1.constants as c
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Back rank of white from column 0 to the last column, per board size. The
+# black back rank is the point reflection of the white one (rank reversed),
+# like in the 5x5 setup of constants.PIECES.
+BACK_RANKS = {
+    5: ["ROOK", "KNIGHT", "BISHOP", "QUEEN", "KING"],
+    6: ["ROOK", "KNIGHT", "QUEEN", "KING", "KNIGHT", "ROOK"],
+    8: [
+        "ROOK",
+        "KNIGHT",
+        "BISHOP",
+        "QUEEN",
+        "KING",
+        "BISHOP",
+        "KNIGHT",
+        "ROOK",
+    ],
+}
+
+PIECE_VALUES = {
+    c.ChessPieceTypes.KING: 0,
+    c.ChessPieceTypes.KNIGHT: 3,
+    c.ChessPieceTypes.ROOK: 5,
+    c.ChessPieceTypes.BISHOP: 3,
+    c.ChessPieceTypes.QUEEN: 9,
+    c.ChessPieceTypes.PAWN: 1,
+}
+
+# keys of the setup dictionary use the algebraic symbol of the piece
+SYMBOLS = {
+    c.ChessPieceTypes.KING: "K",
+    c.ChessPieceTypes.KNIGHT: "N",
+    c.ChessPieceTypes.ROOK: "R",
+    c.ChessPieceTypes.BISHOP: "B",
+    c.ChessPieceTypes.QUEEN: "Q",
+    c.ChessPieceTypes.PAWN: "P",
+}
+
+
+def make_pieces(board_size: int, back_rank: list = None) -> dict:
+    """
+    Creates the initial setup for a square board in the format of
+    constants.PIECES: the back rank on the first row of each player and a
+    full row of pawns in front of it.
+
+    :param board_size: The number of rows and columns of the board.
+    :param back_rank: Names of the piece types of the white back rank, from
+        column 0 up. Defaults to BACK_RANKS[board_size].
+    :return: Dictionary with the pieces of both players.
+    """
+    if back_rank is None:
+        if board_size not in BACK_RANKS:
+            raise ValueError(f"No default setup for board size {board_size}.")
+        back_rank = BACK_RANKS[board_size]
+    if len(back_rank) != board_size:
+        raise ValueError("The back rank must fill one row of the board.")
+
+    pieces = {}
+    for player, row, pawn_row, suffix in (
+        (c.Players.WHITE, board_size - 1, board_size - 2, "W"),
+        (c.Players.BLACK, 0, 1, "B"),
+    ):
+        # black gets the reversed back rank
+        columns = range(board_size)
+        if player == c.Players.BLACK:
+            columns = reversed(columns)
+
+        pieces[player] = {}
+        counts = {}
+        for col, name in zip(columns, back_rank):
+            piece_type = c.ChessPieceTypes[name]
+            key = f"{SYMBOLS[piece_type]}{suffix}"
+            counts[key] = counts.get(key, -1) + 1
+            if counts[key] > 0:
+                key += str(counts[key])
+            pieces[player][key] = {
+                "name": f"{player.name.title()}{name.title()}",
+                "value": PIECE_VALUES[piece_type],
+                "type": piece_type,
+                "player": player,
+                "pos": np.array([row, col]),
+            }
+
+        for col in range(board_size):
+            pieces[player][f"P{suffix}{col}"] = {
+                "name": f"{player.name.title()}Pawn{col}",
+                "value": PIECE_VALUES[c.ChessPieceTypes.PAWN],
+                "type": c.ChessPieceTypes.PAWN,
+                "player": player,
+                "pos": np.array([pawn_row, col]),
+            }
+
+    return pieces
+
+
+class Variant:
+    """
+    The board dimensions and initial setup of a chess variant. A variant is
+    immutable and shared, copies of a game state refer to the same variant.
+    """
+
+    def __init__(self, board_size: int = c.BOARD_SIZE, pieces: dict = None):
+        """
+        :param board_size: The number of rows and columns of the board.
+        :param pieces: The initial setup in the format of constants.PIECES,
+            defaults to make_pieces(board_size).
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if board_size < 3:
+            raise ValueError("The board must have at least 3 rows.")
+        if pieces is None:
+            pieces = make_pieces(board_size)
+
+        self.board_size = board_size
+        self.pieces = pieces
+        self.n_squares = board_size * board_size
+
+        # a pawn promotes when it reaches the last row of the opponent
+        self.promotion_rows = {
+            c.Players.WHITE: 0,
+            c.Players.BLACK: board_size - 1,
+        }
+
+        # upper bound of the number of moves of one player, if every piece
+        # were a queen, used to size the move buffers
+        n_pieces = max(len(p) for p in pieces.values())
+        self.max_moves = n_pieces * 5 * (board_size - 1)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self):
+        return f"{self.board_size}x{self.board_size} variant"
+
+    def get_config(self) -> dict:
+        """
+        Returns the board size and initial setup as plain values, which can
+        be compared with ==, unlike the positions in pieces.
+
+        :return: Dictionary with the board size and the sorted setup.
+        """
+        setup = sorted(
+            (
+                player.value,
+                key,
+                piece["type"].name,
+                tuple(int(x) for x in piece["pos"]),
+            )
+            for player, player_pieces in self.pieces.items()
+            for key, piece in player_pieces.items()
+        )
+        return {"board_size": self.board_size, "setup": setup}
+
+    def get_promotion_row(self, player: c.Players) -> int:
+        """
+        Returns the row on which the pawns of a player promote.
+
+        :param player: The player.
+        :return: The promotion row.
+        """
+        return self.promotion_rows[player]
+
+
+@lru_cache(maxsize=None)
+def get_variant(board_size: int = c.BOARD_SIZE) -> Variant:
+    """
+    Returns the variant with the default setup for a board size, built once
+    per process.
+
+    :param board_size: The number of rows and columns of the board.
+    :return: The variant.
+    """
+    if board_size == c.BOARD_SIZE:
+        return Variant(board_size, c.PIECES)
+    return Variant(board_size)
@@ -3,10 +3,24 @@ from collections import deque
 import numpy as np 
 import itertools
 import csv 
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _plotting():
+    """
+    Imports the plotting libraries on first use, so that importing this
+    module (e.g. to save results) does not load matplotlib and seaborn. The
+    plotting style is applied once, the modules are cached.
+
+    :returns: the matplotlib.pyplot and seaborn modules
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.style.use("ggplot")  # plotting style
+    return plt, sns
 
-import matplotlib.pyplot as plt 
-import seaborn as sns 
-plt.style.use("ggplot")  # plotting style
 
 def save_files(results, n):
     """
@@ -58,12 +72,14 @@ def plot_QL_hist_all(results, lam, maxq=50):
     :param lam: index of rate parameter 
     :param maxq: maximum queue length to be plotted in histogram 
     """
+    plt, _ = _plotting()
     stats = results.get_statistics_all(lam)
     hist_data = stats['QueueLength_hist']
     maxx = maxq + 1 
     
     plt.figure()
-    plt.bar(range(0, maxx), hist_data[0:maxx])
+    hist_data = hist_data[0:maxx]
+    plt.bar(range(len(hist_data)), hist_data)
     plt.title(f"Histogram of queue lengths with lambda = {c.MU_ARRIVAL_RATE_MIN[lam]}\min")
     plt.ylabel('P(Q = k)')
     plt.xlabel('k')
@@ -77,6 +93,7 @@ def plot_QL_hist_per_queue(results, lam, maxq=50):
     :param lam: index of rate parameter 
     :param maxq: maximum queue length to be plotted in histogram 
     """
+    plt, _ = _plotting()
     fig, ax = plt.subplots(c.N_QUEUES//3, 3)
     fig.suptitle(f"Histogram of queue lengths with lambda = {c.MU_ARRIVAL_RATE_MIN[lam]}\min")
     maxx = maxq + 1
@@ -84,7 +101,8 @@ def plot_QL_hist_per_queue(results, lam, maxq=50):
     for q in range(c.N_QUEUES):
         ql = results.get_statistics_separate(lam, q)['QueueLength_hist']
         ax[q].set_title(f"Queue {q}")
-        ax[q].bar(range(0, maxx), ql[0:maxx])
+        ql = ql[0:maxx]
+        ax[q].bar(range(len(ql)), ql)
         ax[q].set_ylabel('P(Q = k)')
         ax[q].set_xlabel('k')
     plt.show()
@@ -97,6 +115,7 @@ def plot_hist_wait_t_all(results, lam, binwidth=10):
     :param lam: index of rate parameter 
     :param binwidth: width of bins in histogram
     """
+    plt, sns = _plotting()
     plt.figure()
     
     sns.histplot(
@@ -116,6 +135,7 @@ def plot_hist_wait_t_per_queue(results, lam, binwidth):
     :param lam: index of rate parameter 
     :param binwidth: width of bins in histogram
     """
+    plt, sns = _plotting()
     fig, ax = plt.subplots(c.N_QUEUES//3, 3)
     fig.suptitle(f"Waiting times with lambda = {c.MU_ARRIVAL_RATE_MIN[lam]}\min")
     
@@ -135,6 +155,7 @@ def plot_hist_cust_in_cant(results, lam, binwidth):
     :param lam: index of rate parameter 
     :param bindwidth: width of bins in histogram
     """
+    plt, sns = _plotting()
     
     plt.figure()
     
@@ -156,9 +177,18 @@ def plot_hist_CC_vs_time(results, lam, time_interval):
     :param lam: index of rate parameter 
     :time_interval: time interval used to calculate average of all values within 
         this time interval 
+    :raises ValueError: if no replication kept its trace, see the trace_every
+        parameter of QueueSimulator
     """
-    plt.figure()
     stats = results.get_statistics_all(lam)
+    if len(stats['CustomersCanteen_times']) == 0:
+        raise ValueError(
+            "No replication kept the customers in the canteen over time,"
+            " run the simulator with trace_every > 0."
+        )
+
+    plt, _ = _plotting()
+    plt.figure()
     plot_time, plot_data = get_average(stats['CustomersCanteen_times'], 
                                        stats['CustomersCanteen_values'], 
                                        time_interval)
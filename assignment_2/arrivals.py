@@ -0,0 +1,144 @@
+import math
+import numpy as np
+import logging
+
+from assignment_2.event import Event
+
+logger = logging.getLogger(__name__)
+
+
+class Arrivals:
+    """
+    All group and customer arrivals of one simulation, sampled at once as
+    flat arrays before the event loop starts.
+
+    The first group arrives at t = 0, the next ones after exponential
+    inter-arrival times, up to and including the first group after t_end.
+    Customer i belongs to group group_of[i] and is done grabbing food at
+    t_grab[i]. If a service distribution is given, every customer also gets
+    its own service time in units of the mean service time, service_unit[i],
+    so the service time does not depend on the server that draws it.
+    """
+
+    def __init__(
+        self,
+        arrival_time_dist,
+        group_size_dist,
+        grab_food_dist,
+        use_cash_dist,
+        t_end: float,
+        service_dist=None,
+    ):
+        """
+        :param arrival_time_dist: Distribution of the time between groups.
+        :param group_size_dist: Distribution of the number of customers in a
+            group.
+        :param grab_food_dist: Distribution of the time a customer needs to
+            grab food.
+        :param use_cash_dist: Bernoulli distribution of cash payment.
+        :param t_end: The end of the simulation.
+        :param service_dist: Distribution of the service time divided by its
+            mean, the servers draw the service times if None.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+
+        # cumulative sums of inter-arrival times, in batches of the expected
+        # number of groups until a group arrives after t_end
+        batch = int(t_end / arrival_time_dist.mean() * 1.2) + 10
+        times = [np.zeros(1)]
+        while times[-1][-1] <= t_end:
+            gaps = np.atleast_1d(arrival_time_dist.rvs(batch))
+            times.append(times[-1][-1] + np.cumsum(gaps))
+        times = np.concatenate(times)
+        n_groups = int(np.searchsorted(times, t_end, side="right")) + 1
+        self.t_group = times[:n_groups]
+
+        # group sizes, and per customer the group, grab time and payment
+        self.group_size = np.atleast_1d(
+            group_size_dist.rvs(n_groups)
+        ).astype(int)
+        self.group_start = np.concatenate(
+            ([0], np.cumsum(self.group_size))
+        )
+        n_customers = int(self.group_start[-1])
+        self.group_of = np.repeat(np.arange(n_groups), self.group_size)
+        self.t_grab = self.t_group[self.group_of] + np.atleast_1d(
+            grab_food_dist.rvs(n_customers)
+        )
+        self.use_cash = np.atleast_1d(use_cash_dist.rvs(n_customers))
+        self.service_unit = None
+        if service_dist is not None:
+            self.service_unit = np.atleast_1d(service_dist.rvs(n_customers))
+
+        logger.debug(
+            f"Sampled {n_groups} groups with {n_customers} customers",
+            extra=self.logstr,
+        )
+
+    def get_nr_groups(self) -> int:
+        return len(self.t_group)
+
+    def get_nr_customers(self) -> int:
+        return len(self.t_grab)
+
+
+class ArrivalStream:
+    """
+    Serves the arrivals of an Arrivals object as events in time order: the
+    group arrivals in the order they were sampled, the customer arrivals
+    sorted by grab time. The event loop takes the next event from the stream
+    or the FES, whichever comes first, so arrivals never enter the FES.
+
+    The events refer to the group or customer by its number, the row in
+    GroupTable or CustomerTable.
+    """
+
+    def __init__(self, arrivals: Arrivals):
+        """
+        :param arrivals: The sampled arrivals.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        self.arrivals = arrivals
+        customer_order = np.argsort(arrivals.t_grab, kind="stable")
+
+        # plain lists, indexing them is faster than numpy arrays
+        self.t_group = arrivals.t_group.tolist()
+        self.customer_order = customer_order.tolist()
+        self.t_customer = arrivals.t_grab[customer_order].tolist()
+        self.next_group = 0
+        self.next_customer = 0
+
+    def peek(self) -> float:
+        """
+        Returns the time of the next arrival.
+
+        :return: The time, infinity if there are no arrivals left.
+        """
+        t_group = math.inf
+        if self.next_group < len(self.t_group):
+            t_group = self.t_group[self.next_group]
+        if self.next_customer < len(self.t_customer):
+            return min(t_group, self.t_customer[self.next_customer])
+        return t_group
+
+    def next(self) -> Event:
+        """
+        Returns the next arrival event, a group before a customer arriving at
+        the same time.
+
+        :return: The event.
+        """
+        g = self.next_group
+        if g < len(self.t_group) and (
+            self.next_customer >= len(self.t_customer)
+            or self.t_group[g] <= self.t_customer[self.next_customer]
+        ):
+            self.next_group += 1
+            return Event(Event.ARRIVAL_GROUP, self.t_group[g], g)
+
+        if self.next_customer >= len(self.t_customer):
+            raise IndexError("next from an empty arrival stream")
+        i = self.customer_order[self.next_customer]
+        t = self.t_customer[self.next_customer]
+        self.next_customer += 1
+        return Event(Event.ARRIVAL, t, i)
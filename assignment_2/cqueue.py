@@ -1,7 +1,6 @@
 from collections import deque
 import logging
 
-from assignment_2.customer import Customer
 from assignment_2.server import Server
 
 logger = logging.getLogger(__name__)
@@ -19,11 +18,11 @@ class CQueue:
     def __str__(self):
         return "Queue length: " + str(self.get_length())
 
-    def add_customer(self, customer: Customer, q_id: int):
+    def add_customer(self, customer: int, q_id: int):
         """
         Adds a customer to the queue.
 
-        :param customer: Customer to add.
+        :param customer: Number of the customer to add.
         :param q_id: Queue ID to add customer to. Only used for sanity check.
         """
         if q_id != self.queue_id:
@@ -88,9 +87,7 @@ class CQueue:
         # this customer must match the one we received from a DEPARTURE event
         if customer is not None:
             logger.debug(f"Comparing customer: {customer}", extra=self.logstr)
-            if (
-                cust_front_q.get_t_done_grab() != customer.get_t_done_grab()
-            ):  # compare arrival timestamps
+            if cust_front_q != customer:  # compare customer numbers
                 raise ValueError(
                     "Customer we want to remove is not the customer at the"
                     " front of the queue."
@@ -1,6 +1,4 @@
 import logging
-import scipy.stats as stats
-from dist.distribution import Distribution
 
 import assignment_2.constants as c
 
@@ -10,7 +8,12 @@ logger = logging.getLogger(__name__)
 
 class Customer:
     def __init__(
-        self, t_arr: float, t_grab_food: float, cash: bool, uniq_group_id: int
+        self,
+        t_arr: float,
+        t_grab_food: float,
+        cash: bool,
+        uniq_group_id: int,
+        service_unit: float = None,
     ):
         """
         Creates a new customer.
@@ -20,6 +23,8 @@ class Customer:
         :param cash: Whether the customer uses cash to pay. If False, the
                      customer uses a bank card.
         :param uniq_group_id: Unique group ID of the customer.
+        :param service_unit: The service time of the customer divided by the
+            mean service time, drawn by the server if None.
         """
         self.logstr = {"className": self.__class__.__name__}
         self.use_cash = cash
@@ -28,6 +33,7 @@ class Customer:
         self.t_left = -1 # time customer left canteen 
         self.queue_id = -1
         self.uniq_group_id = uniq_group_id
+        self.service_unit = service_unit
 
         # make sure t_grab_food > t_arrival_group
         if t_grab_food <= t_arr:
@@ -64,6 +70,16 @@ class Customer:
         """
         return self.use_cash
     
+    def get_service_unit(self):
+        """
+        Returns the service time of the customer divided by the mean service
+        time.
+
+        :return: The service time in units of its mean, None if the server
+            draws it.
+        """
+        return self.service_unit
+
     def get_t_left(self):
         """
         Returns time customer left canteen (t = -1 if customer is still in canteen)
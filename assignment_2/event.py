@@ -1,25 +1,35 @@
-from assignment_2.customer import Customer
+class Event:
+    """
+    A record of the future event set. The FES stores events as tuples
+    (time, seq, event) that heapq compares in C, where seq is the number of
+    the event in the order it was added to the FES. Simultaneous events
+    therefore leave the FES in the order they were scheduled, which makes
+    runs reproducible. Events have no per-instance dict.
 
+    An event refers to its customer, or group for a group arrival, by its
+    row in the CustomerTable or GroupTable of the simulation.
+    """
 
-class Event:
     ARRIVAL = 0
     DEPARTURE = 1
     ARRIVAL_GROUP = 2
 
-    def __init__(self, typ: int, time: float, cust: Customer):
+    __slots__ = ("type", "time", "customer", "seq")
+
+    def __init__(self, typ: int, time: float, cust: int):
         """_summary_
 
         :param: typ: Event type (arrival, departure or arrival of group)
         :param: time: Time of event
-        :param: cust: Customer number
+        :param: cust: Customer number, or group number for a group arrival
         """
-        self.logstr = {"className": self.__class__.__name__}
         self.type = typ
         self.time = time
         self.customer = cust  # especially needed if there are multiple servers
+        self.seq = -1  # set by the FES
 
     def __lt__(self, other):
-        return self.time < other.time
+        return (self.time, self.seq) < (other.time, other.seq)
 
     def __str__(self):
         s = ("Arrival", "Departure", "Arrival group")
@@ -33,6 +43,6 @@ class Event:
 
     def get_customer(self):
         """
-        Returns the customer associated with this event.
+        Returns the number of the customer (or group) of this event.
         """
         return self.customer
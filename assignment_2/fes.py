@@ -1,25 +1,225 @@
+from bisect import insort
 import heapq
+import math
 
 
 class FES:
+    """
+    Binary heap of events. The heap holds tuples (time, seq, event), which
+    heapq compares in C; seq numbers the events in the order they were
+    added, so events with the same time leave in that order.
+    """
+
     def __init__(self):
         self.events = []
+        self.seq = 0
 
     def add(self, event):
-        heapq.heappush(self.events, event)
+        event.seq = self.seq
+        heapq.heappush(self.events, (event.time, self.seq, event))
+        self.seq += 1
 
     def next(self):
-        return heapq.heappop(self.events)
+        return heapq.heappop(self.events)[2]
+
+    def peek(self) -> float:
+        """
+        Returns the time of the next event, infinity if there is none.
+        """
+        return self.events[0][0] if self.events else math.inf
 
     def isEmpty(self):
         return len(self.events) == 0
 
+    def __len__(self):
+        return len(self.events)
+
     def __str__(self):
         # Note that if you print self.events, it would not appear to be sorted
         # (although they are sorted internally).
         # For this reason we use the function 'sorted'
         s = ""
         sortedEvents = sorted(self.events)
-        for e in sortedEvents:
+        for _, _, e in sortedEvents:
             s += str(e) + "\n"
         return s
+
+
+class CalendarFES:
+    """
+    Calendar queue (R. Brown, 1988) with the interface of FES. Events are
+    hashed by time into a ring of buckets of equal width, like the days of a
+    calendar year, and every bucket is a short sorted list. Dequeuing scans
+    the buckets from the current day on, so add and next take amortized O(1)
+    time when a bucket holds a few events.
+
+    The calendar tunes itself: the number of buckets doubles or halves when
+    the number of events passes 2x or 1/2x the number of buckets, and the
+    bucket width is then set to three times the average gap between the
+    first events in time. The width is also re-estimated when the time
+    between events drifts, i.e. when the operations of a period look at
+    more than MAX_COST buckets or events each on average. Events with the
+    same time leave the calendar in the order they were added.
+    """
+
+    # number of events used to estimate the bucket width
+    N_SAMPLE = 25
+    # average number of buckets scanned or events passed per operation
+    # above which the bucket width is re-estimated
+    MAX_COST = 4
+
+    def __init__(self, n_buckets: int = 2, width: float = 1.0):
+        """
+        :param n_buckets: The initial number of buckets.
+        :param width: The initial bucket width, in units of time.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if n_buckets < 1 or width <= 0:
+            raise ValueError("The calendar needs a positive size and width.")
+        self.min_buckets = n_buckets
+        self.size = 0
+        self.seq = 0  # insertion counter, orders events with the same time
+        self.last_time = 0.0
+        self.__build(n_buckets, width, [])
+
+    def __build(self, n_buckets: int, width: float, items: list) -> None:
+        """
+        Distributes items over a new calendar.
+
+        :param n_buckets: The number of buckets.
+        :param width: The bucket width.
+        :param items: Items (time, seq, day, event) of the events.
+        """
+        self.n_buckets = n_buckets
+        self.width = width
+        self.buckets = [[] for _ in range(n_buckets)]
+        self.n_ops = 0
+        self.cost = 0
+        # absolute number of the day the scan is at
+        self.day = int(self.last_time / width)
+
+        items.sort()
+        for time, seq, _, event in items:
+            day = int(time / width)
+            self.buckets[day % n_buckets].append((time, seq, day, event))
+
+    def __resize(self, n_buckets: int) -> None:
+        """
+        Rebuilds the calendar with another number of buckets and a new
+        bucket width estimated from the first events.
+
+        :param n_buckets: The new number of buckets.
+        """
+        items = [item for bucket in self.buckets for item in bucket]
+
+        width = self.width
+        times = heapq.nsmallest(self.N_SAMPLE, (item[0] for item in items))
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        if gaps:
+            # ignore outliers, as in Brown's original sampling
+            avg = sum(gaps) / len(gaps)
+            gaps = [gap for gap in gaps if gap <= 2 * avg]
+            if gaps and sum(gaps) > 0:
+                width = 3 * sum(gaps) / len(gaps)
+
+        self.__build(n_buckets, width, items)
+
+    def __check_cost(self) -> None:
+        """
+        Re-estimates the bucket width if the operations since the last
+        check were too expensive.
+        """
+        self.n_ops += 1
+        period = 2 * self.n_buckets + self.N_SAMPLE
+        if self.cost > self.MAX_COST * period:
+            # too expensive, whatever the remaining operations cost
+            self.__resize(self.n_buckets)
+        elif self.n_ops >= period:
+            self.n_ops = 0
+            self.cost = 0
+
+    def add(self, event):
+        time = event.time
+        day = int(time / self.width)
+        bucket = self.buckets[day % self.n_buckets]
+        self.cost += len(bucket)
+        event.seq = self.seq
+        insort(bucket, (time, self.seq, day, event))
+        self.seq += 1
+        self.size += 1
+
+        # an event before the current day moves the scan back
+        if day < self.day:
+            self.day = day
+
+        if self.size > 2 * self.n_buckets:
+            self.__resize(2 * self.n_buckets)
+        else:
+            self.__check_cost()
+
+    def __find(self) -> list:
+        """
+        Moves the scan to the day of the first event.
+
+        :return: The bucket of the first event.
+        """
+        day = self.day
+        buckets = self.buckets
+        n_buckets = self.n_buckets
+        for _ in range(n_buckets):
+            bucket = buckets[day % n_buckets]
+            if bucket and bucket[0][2] <= day:
+                break
+            day += 1
+        else:
+            # no event in the coming year, jump to the first event
+            day = min(bucket[0] for bucket in buckets if bucket)[2]
+            bucket = buckets[day % n_buckets]
+            self.cost += n_buckets
+        self.cost += day - self.day
+        self.day = day
+        return bucket
+
+    def next(self):
+        if self.size == 0:
+            raise IndexError("next from an empty FES")
+
+        time, _, _, event = self.__find().pop(0)
+        self.last_time = time
+        self.size -= 1
+
+        n_buckets = self.n_buckets
+        if self.size < n_buckets // 2 and n_buckets > self.min_buckets:
+            self.__resize(n_buckets // 2)
+        else:
+            self.__check_cost()
+
+        return event
+
+    def peek(self) -> float:
+        """
+        Returns the time of the next event, infinity if there is none.
+        """
+        if self.size == 0:
+            return math.inf
+        return self.__find()[0][0]
+
+    def isEmpty(self):
+        return self.size == 0
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        s = ""
+        items = sorted(item for bucket in self.buckets for item in bucket)
+        for item in items:
+            s += str(item[3]) + "\n"
+        return s
+
+
+# future event sets that QueueSimulator can use
+FES_TYPES = {
+    "heap": FES,
+    "calendar": CalendarFES,
+}
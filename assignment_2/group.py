@@ -13,6 +13,7 @@ class Group:
         use_cash: np.ndarray,
         t_arr: float,
         t_grab_food: np.ndarray,
+        service_unit: np.ndarray = None,
     ):
         """
         Creates a new group of customers.
@@ -21,6 +22,8 @@ class Group:
         :param use_cash: A list of booleans indicating whether the customer uses cash or not.
         :param t_arr: The time the group arrived.
         :param t_grab_food: A list of times the customers need to grab their food. (counting up from t_arr)
+        :param service_unit: The service times of the customers divided by the
+            mean service time, drawn by the server if None.
         """
         self.logstr = {"className": self.__class__.__name__}
         self.t_arrival = t_arr
@@ -54,6 +57,9 @@ class Group:
                 t_grab_food=t_grab_food[idx],
                 cash=bool(use_cash_cust),
                 uniq_group_id=idx,
+                service_unit=(
+                    None if service_unit is None else service_unit[idx]
+                ),
             )
 
     def __str__(self):
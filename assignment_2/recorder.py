@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class Recorder:
+    """
+    Growable typed array of values recorded one at a time, a replacement of
+    a deque of Python objects.
+
+    Values are written into a NumPy chunk; a full chunk is kept and a new
+    chunk twice its size is started, so a recording of n values takes
+    O(log n) allocations and nothing is copied while recording. view()
+    merges the chunks into one array once and returns a view of it, so
+    reading the values again, or after a few more appends, copies nothing.
+    There is no maximum number of values.
+    """
+
+    def __init__(self, dtype=np.float64, width: int = None, size: int = 256):
+        """
+        :param dtype: The type of the values.
+        :param width: The length of every value if the values are rows, None
+            for scalar values.
+        :param size: The size of the first chunk.
+        """
+        if size < 1:
+            raise ValueError("The first chunk needs a positive size.")
+        self.dtype = np.dtype(dtype)
+        self.shape = () if width is None else (width,)
+        self.chunks = []  # full chunks
+        self.chunk = np.empty((size,) + self.shape, dtype=self.dtype)
+        self.n = 0  # number of values in the current chunk
+        self.size = 0  # number of values in all chunks
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        # pickle only the recorded values, not the free space
+        state = self.__dict__.copy()
+        state["chunks"] = []
+        state["chunk"] = self.view().copy()
+        state["n"] = self.size
+        return state
+
+    def append(self, value) -> None:
+        """
+        Records a value.
+
+        :param value: The value, a row of length width if width was given.
+        """
+        if self.n == len(self.chunk):
+            self.chunks.append(self.chunk)
+            self.chunk = np.empty(
+                (max(2 * len(self.chunk), 1),) + self.shape, dtype=self.dtype
+            )
+            self.n = 0
+        self.chunk[self.n] = value
+        self.n += 1
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        """
+        Returns the recorded values in the order they were recorded. The
+        array is a view of the buffer, so it must not be modified.
+
+        :return: Array of shape (len,) or (len, width).
+        """
+        if self.chunks:
+            # merge the chunks into one with room for as many values again
+            values = np.empty(
+                (2 * self.size,) + self.shape, dtype=self.dtype
+            )
+            start = 0
+            for chunk in self.chunks + [self.chunk[: self.n]]:
+                values[start : start + len(chunk)] = chunk
+                start += len(chunk)
+            self.chunks = []
+            self.chunk = values
+            self.n = self.size
+        return self.chunk[: self.n]
@@ -1,7 +1,6 @@
-from scipy.stats import expon
 import logging
 
-from dist.distribution import Distribution
+from dist.streams import Exponential
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +13,8 @@ class Server:
         self.server_id = id  # unique id of the server
         self.mu_cash = mu_cash  # service time if customer pays with cash
         self.mu_card = mu_card  # service time if customer pays with card
-        self.dist_cash = Distribution(expon(scale=mu_cash))
-        self.dist_card = Distribution(expon(scale=mu_card))
+        self.dist_cash = Exponential(scale=mu_cash)
+        self.dist_card = Exponential(scale=mu_card)
 
     def __str__(self):
         return "Server id: " + str(self.get_id())
@@ -26,16 +25,20 @@ class Server:
         """
         return self.server_id
 
-    def get_service_time(self, cash: bool):
+    def get_service_time(self, cash: bool, unit: float = None):
         """
         Returns the service time of the server.
 
         :param cash: Whether the customer uses cash to pay. If False, the
                      customer uses a bank card.
+        :param unit: The service time of the customer divided by the mean
+                     service time, drawn by the server if None.
 
         :return: Service time of the server.
         """
-        if cash:
+        if unit is not None:
+            t_service = unit * (self.mu_cash if cash else self.mu_card)
+        elif cash:
             t_service = self.dist_cash.rvs(1)
         else:
             t_service = self.dist_card.rvs(1)
@@ -1,25 +1,28 @@
-from collections import deque
-import matplotlib.pyplot as plt
 import numpy as np
-plt.style.use("ggplot")  # plotting style
+
+from assignment_2.recorder import Recorder
 
 class SimResults:
     """SimResults class"""
-    MAX_ENTRIES = 10000  # maximum number of time steps to be recorded
+    HIST_SIZE = 64  # initial number of queue lengths in the histogram
 
     def __init__(self, nr_queues):
         """
         :param nr_queues: number of queues present in simulation
         """
         self.nrQueues = nr_queues
+        self.queue_ids = np.arange(nr_queues)
 
         # storing values related to queue length 
         self.sumQL = np.zeros((1, self.nrQueues))  # total sum of queue lengths
         self.sumQL2 = np.zeros(
             (1, self.nrQueues)
         )  # total sum of queue lengths squared
-        self.histQL = np.zeros((self.MAX_ENTRIES+1, self.nrQueues)) # plot data
-        self.allQL = deque() # list of all queue length values 
+        # time spent per queue length, grows with the longest queue
+        self.histQL = np.zeros((self.HIST_SIZE, self.nrQueues)) # plot data
+        self.maxQL = 0 # longest queue observed
+        # all queue length values 
+        self.allQL = Recorder(np.int32, width=self.nrQueues)
         self.nQL = 0 # number of entries 
         
         # storing values related to waiting time 
@@ -27,25 +30,26 @@ class SimResults:
         self.sumW2 = np.zeros(
             (self.nrQueues, 1)
         )  # total sum of waiting times squared
-        self.allW = deque() # list of all waiting times, also plot data
+        self.allW = Recorder() # all waiting times, also plot data
         self.nW = 0 # number of entries 
 
         # storing values related to time 
         self.oldTime = 0
-        self.times = deque([self.oldTime])
+        self.times = Recorder()
+        self.times.append(self.oldTime)
 
         # variables to keep track of number of customers in canteen and 
         # at which time stamps changes occured 
-        self.canteen_times = deque() 
-        self.canteen = deque() 
+        self.canteen_times = Recorder()
+        self.canteen = Recorder(np.int32)
         
-        # variables to store customer and group objects
-        self.groups = deque() # to store group with index corresponding to group nr
-        self.visitors = {} # to store customer with corresponding group nr
+        # tables of the customers and groups, see set_tables
+        self.customers = None
+        self.groups = None
 
-        # lists to gather sojourn times of customers and groups
-        self.sojournC = deque()
-        self.sojournG = deque()
+        # sojourn times of customers and groups
+        self.sojournC = Recorder()
+        self.sojournG = Recorder()
 
     def register_queue_length(self, time, ql):
         """
@@ -55,23 +59,28 @@ class SimResults:
         :param ql: queue lengths of each queue 
         """
         # update parameters 
+        dt = time - self.oldTime
         self.allQL.append(ql)
-        self.sumQL += np.array(ql * (time - self.oldTime))
-        self.sumQL2 += np.array(ql * ql * (time - self.oldTime))
+        self.sumQL += ql * dt
+        self.sumQL2 += ql * ql * dt
         self.nQL += 1
-        
-        for q in range(len(ql)):
-            self.histQL[min(ql[q], self.MAX_ENTRIES), q] += (time - self.oldTime)
-            
+
+        longest = ql.max()
+        if longest > self.maxQL:
+            self.maxQL = int(longest)
+        if longest >= len(self.histQL):
+            # double the histogram until the longest queue fits
+            size = len(self.histQL)
+            while size <= longest:
+                size *= 2
+            hist = np.zeros((size, self.nrQueues))
+            hist[: len(self.histQL)] = self.histQL
+            self.histQL = hist
+        self.histQL[ql, self.queue_ids] += dt
+
         self.times.append(time)
         self.oldTime = time
 
-        if self.nQL >= self.MAX_ENTRIES:
-            raise ValueError(
-                "Amount of entries exceeded expected maximum of"
-                f" {self.MAX_ENTRIES}"
-            )
-
     def register_waiting_time(self, w, q):
         """
         Registers waiting time
@@ -85,12 +94,6 @@ class SimResults:
         self.sumW2[q] += w * w
         self.nW += 1
 
-        if self.nW >= self.MAX_ENTRIES:
-            raise ValueError(
-                "Amount of entries exceeded expected maximum of"
-                f" {self.MAX_ENTRIES}"
-            )
-
     def register_canteen(self, t, n):
         """
         Registers number of customers in canteen each time it changed
@@ -102,34 +105,41 @@ class SimResults:
         self.canteen_times.append(t)
         self.canteen.append(n)
 
-    def register_group(self, g):
+    def set_tables(self, customers, groups):
         """
-        Registers group and corresponding customer objects
+        Sets the tables the simulation keeps its customers and groups in
         
-        :param g: Group object
+        :param customers: CustomerTable of the simulation
+        :param groups: GroupTable of the simulation
         """
-        # update parameters 
-        self.groups.append(g)
-        
-        for c in g.get_customers():
-            self.visitors[c] = len(self.groups)-1
-        
-    def register_sojourn_t(self, c):
+        self.customers = customers
+        self.groups = groups
+
+    def register_sojourn_t(self, i):
         """
         Registers customer and group sojourn times 
         
-        :param c: Customer object 
+        :param i: Number of the customer, its departure time must be set
         """
         # update parameters
-        self.sojournC.append(c.get_t_left() - c.get_t_arrival())
-        
-        group_nr = self.visitors[c]
-        g = self.groups[group_nr]
+        customers, groups = self.customers, self.groups
+        t_left = customers.t_left[i]
+        self.sojournC.append(t_left - customers.t_arrival[i])
 
         # check if all customers of a group have left the canteen 
-        if not g.group_in_canteen():
-            g.set_t_departure(c.get_t_left())
-            self.sojournG.append(c.get_t_left()-g.get_t_arrival())
+        g = customers.group[i]
+        groups.n_waiting[g] -= 1
+        if groups.n_waiting[g] == 0:
+            groups.t_departure[g] = t_left
+            self.sojournG.append(t_left - groups.t_arrival[g])
+
+    def summarize(self):
+        """
+        Reduces the results to the statistics SimHistory needs.
+
+        :return: SimSummary of the results.
+        """
+        return SimSummary(self)
 
     def get_mean_ql(self):
         return self.sumQL / self.oldTime
@@ -144,19 +154,66 @@ class SimResults:
         return self.sumW2 / self.nW - self.getMeanWaitingTime() ** 2
 
     def get_mean_cust_canteen(self):
-        return np.mean(self.canteen)
+        return np.mean(self.canteen.view())
 
     def get_mean_sojourn_cust(self):
-        return np.mean(self.sojournC)
+        return np.mean(self.sojournC.view())
 
     def get_mean_sojourn_group(self):
-        return np.mean(self.sojournG)
+        return np.mean(self.sojournG.view())
 
     def get_ql_hist(self, q):
-        return [x[q]/self.oldTime for x in self.histQL]
+        """
+        Returns the fraction of time queue q had length k, for k up to the
+        longest queue observed.
+
+        :param q: queue id
+        :return: Array of length maxQL + 1.
+        """
+        return self.histQL[: self.maxQL + 1, q] / self.oldTime
+
+    def get_ql_hists(self):
+        """
+        Returns the fraction of time every queue had length k, for k up to
+        the longest queue observed.
+
+        :return: Array of shape (maxQL + 1, nrQueues).
+        """
+        return self.histQL[: self.maxQL + 1] / self.oldTime
 
     def get_times(self):
-        return self.times
+        """
+        Returns the time stamps of the queue length changes, starting at 0.
+
+        :return: View of the time stamps, must not be modified.
+        """
+        return self.times.view()
+
+    def get_all_ql(self):
+        """
+        Returns the queue lengths after every change, one row per time
+        stamp after the first.
+
+        :return: View of shape (nQL, nrQueues), must not be modified.
+        """
+        return self.allQL.view()
+
+    def get_all_wait_t(self):
+        """
+        Returns the waiting times of all customers in order of service.
+
+        :return: View of the waiting times, must not be modified.
+        """
+        return self.allW.view()
+
+    def get_canteen(self):
+        """
+        Returns the number of customers in the canteen after every change.
+
+        :return: Views (time stamps, numbers of customers), must not be
+            modified.
+        """
+        return self.canteen_times.view(), self.canteen.view()
 
     def __str__(self):
         s = f""
@@ -185,6 +242,11 @@ class SimResults:
         
         :param maxq: maximum queue length to be plotted in histogram
         """
+        # plotting is only needed for analysis, not in the workers
+        import matplotlib.pyplot as plt
+
+        plt.style.use("ggplot")  # plotting style
+
         fig, ax = plt.subplots(self.nrQueues//3, 3)
         fig.suptitle("Histogram of queue lengths")
         
@@ -192,7 +254,105 @@ class SimResults:
             ql = self.get_ql_hist(q)
             maxx = maxq + 1
             ax[q].set_title(f"Queue {q}")
-            ax[q].bar(range(0, maxx), ql[0:maxx])
+            ql = ql[0:maxx]
+            ax[q].bar(range(len(ql)), ql)
             ax[q].set_ylabel('P(Q = k)')
             ax[q].set_xlabel('k')
         plt.show()
+
+
+class SimSummary:
+    """
+    Summary of one simulation: sums, sums of squares and counts of every
+    measure and the queue length histogram, without the events, groups and
+    customers of SimResults. Its size does not depend on the number of
+    events, so workers send summaries instead of full results. It has the
+    getters of SimResults that SimHistory uses; it keeps no canteen trace.
+    """
+
+    def __init__(self, res: SimResults):
+        """
+        :param res: The results of the simulation.
+        """
+        self.nrQueues = res.nrQueues
+        self.oldTime = res.oldTime
+        self.maxQL = res.maxQL
+
+        # time integrals of the queue lengths and their histogram
+        self.sumQL = res.sumQL
+        self.sumQL2 = res.sumQL2
+        self.histQL = res.histQL[: res.maxQL + 1].copy()
+        self.nQL = res.nQL
+
+        # waiting times per queue
+        self.sumW = res.sumW
+        self.sumW2 = res.sumW2
+        self.nW = res.nW
+
+        # customers in canteen, sojourn times of customers and groups
+        canteen = res.canteen.view()
+        self.sumCC = float(np.sum(canteen))
+        self.nCC = len(canteen)
+        sojourn_c = res.sojournC.view()
+        self.sumSC = float(np.sum(sojourn_c))
+        self.sumSC2 = float(np.sum(sojourn_c * sojourn_c))
+        self.nSC = len(sojourn_c)
+        sojourn_g = res.sojournG.view()
+        self.sumSG = float(np.sum(sojourn_g))
+        self.sumSG2 = float(np.sum(sojourn_g * sojourn_g))
+        self.nSG = len(sojourn_g)
+
+    def get_mean_ql(self):
+        return self.sumQL / self.oldTime
+
+    def get_var_ql(self):
+        return self.sumQL2 / self.oldTime - self.get_mean_ql() ** 2
+
+    def get_mean_wait_t(self):
+        return self.sumW / self.nW
+
+    def get_var_wait_t(self):
+        return self.sumW2 / self.nW - self.get_mean_wait_t() ** 2
+
+    def get_mean_cust_canteen(self):
+        return self.sumCC / self.nCC if self.nCC else np.nan
+
+    def get_mean_sojourn_cust(self):
+        return self.sumSC / self.nSC if self.nSC else np.nan
+
+    def get_var_sojourn_cust(self):
+        return self.sumSC2 / self.nSC - self.get_mean_sojourn_cust() ** 2
+
+    def get_mean_sojourn_group(self):
+        return self.sumSG / self.nSG if self.nSG else np.nan
+
+    def get_var_sojourn_group(self):
+        return self.sumSG2 / self.nSG - self.get_mean_sojourn_group() ** 2
+
+    def get_ql_hist(self, q):
+        """
+        Returns the fraction of time queue q had length k, for k up to the
+        longest queue observed.
+
+        :param q: queue id
+        :return: Array of length maxQL + 1.
+        """
+        return self.histQL[:, q] / self.oldTime
+
+    def get_ql_hists(self):
+        """
+        Returns the fraction of time every queue had length k, for k up to
+        the longest queue observed.
+
+        :return: Array of shape (maxQL + 1, nrQueues).
+        """
+        return self.histQL / self.oldTime
+
+    def get_canteen(self):
+        """
+        Returns the number of customers in the canteen after every change,
+        which a summary does not keep.
+
+        :return: Empty arrays (time stamps, numbers of customers).
+        """
+        return np.zeros(0), np.zeros(0, dtype=np.int32)
@@ -1,23 +1,29 @@
 from collections import deque
 from abc import ABC, abstractmethod
 import numpy as np
-import multiprocessing as mp
 import logging
 import time
 
 import random
-import scipy.stats as stats
-from dist.distribution import Distribution
+from dist.streams import (
+    Bernoulli,
+    Exponential,
+    Geometric,
+    RandomStreams,
+    Uniform,
+)
 
 import assignment_2.constants as c
 
+from assignment_2.arrivals import Arrivals, ArrivalStream
 from assignment_2.event import Event
 from assignment_2.simresults import SimResults
-from assignment_2.fes import FES
-from assignment_2.group import Group
-from assignment_2.customer import Customer
+from assignment_2.fes import FES_TYPES
+from assignment_2.tables import CustomerTable, GroupTable
 from assignment_2.cqueue import CQueue
 from assignment_2.server import Server
+from parallel.checkpoint import Checkpoint
+from parallel.executor import Executor
 
 
 logging.basicConfig(
@@ -39,16 +45,37 @@ conf_to_z = {
 
 
 class SimHistory:
+    # the value of a measure in one simulation, used for paired differences
+    PAIRED_MEASURES = {
+        "QueueLength": lambda sim: np.mean(sim.get_mean_ql()),
+        "WaitingTime": lambda sim: np.mean(sim.get_mean_wait_t()),
+        "CustomersCanteen": lambda sim: sim.get_mean_cust_canteen(),
+        "SojournTimeCustomer": lambda sim: sim.get_mean_sojourn_cust(),
+        "SojournTimeGroup": lambda sim: sim.get_mean_sojourn_group(),
+    }
+
     def __init__(self):
         self.logstr = {"className": self.__class__.__name__}
         self.sim_runs: list[SimResults] = []
         self.nr_simulations = 0
+        # statistics per rate parameter, computed on first use
+        self.__statistics = {}
 
     def __str__(self):
         str = f"Number of simulations: {self.nr_simulations}"
 
         return str
 
+    def __getstate__(self):
+        # the statistics are recomputed rather than saved in checkpoints
+        state = self.__dict__.copy()
+        state["_SimHistory__statistics"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__statistics = {}
+
     def add_sim_run(self, sim_result):
         """
         Adds a simulation run to the sim runs.
@@ -57,6 +84,7 @@ class SimHistory:
         """
         self.sim_runs.append(sim_result)
         self.nr_simulations += 1
+        self.__statistics = {}
 
     def get_sim_runs(self) -> list:
         """
@@ -81,14 +109,53 @@ class SimHistory:
         :param lam: Index of rate parameter value for which statistics needs
             to be calculated 
             
-        :return: Dictionary with statistics
+        :return: Dictionary with statistics, its values are cached and must
+            not be modified
+        """
+        return dict(self.__get_statistics(lam)[0])
+
+    def get_statistics_separate(self, lam, queue_nr) -> dict:
+        """
+        Gathers statistics of results for queues separately
+        
+        :param lam: Index of rate parameter value for which statistics needs
+            to be calculated 
+        :param queue_nr: Integer indicating for which queue statistics need to 
+            be calculated (same as queue_id)
+            
+        :return: Dictionary with statistics, its values are cached and must
+            not be modified
+        """
+        return dict(self.__get_statistics(lam)[1][queue_nr])
+
+    def __get_statistics(self, lam) -> tuple:
+        """
+        Returns the statistics of a rate parameter from the cache, computes
+        them if a simulation run was added since they were last computed.
+
+        :param lam: Index of rate parameter value.
+        :return: Tuple (statistics of all queues together, list with the
+            statistics of every queue).
+        """
+        if lam not in self.__statistics:
+            self.__statistics[lam] = self.__compute_statistics(lam)
+        return self.__statistics[lam]
+
+    def __compute_statistics(self, lam) -> tuple:
+        """
+        Gathers the statistics of all queues together and of every queue
+        separately in one pass over the simulation runs.
+
+        :param lam: Index of rate parameter value.
+        :return: Tuple (statistics of all queues together, list with the
+            statistics of every queue).
         """
         statistics = {
             "QueueLengths_all": deque(), # list of all means 
             "QueueLength_mean": 0.0,
             "QueueLength_std": 0.0,
             "QueueLength_normal_ci_95": 0.0,
-            "QueueLength_hist": np.zeros(SimResults.MAX_ENTRIES+1), # hist plot data
+            "QueueLength_hist": np.zeros(1), # hist plot data
             "WaitingTime_all": deque(), # list of all  means 
             "WaitingTime_mean": 0.0,
             "WaitingTime_std": 0.0,
@@ -108,26 +175,44 @@ class SimHistory:
             "SojournTimeGroup_std": 0.0,
             "SojournTimeGroup_normal_ci_95": 0.0,
         }
+        nr_queues = self.sim_runs[0][lam].nrQueues if self.sim_runs else 0
+        separate = [
+            {
+                "QueueLengths_all": deque(),
+                "QueueLength_mean": 0.0,
+                "QueueLength_std": 0.0,
+                "QueueLength_normal_ci_95": 0.0,
+                "QueueLength_hist": np.zeros(1),
+                "WaitingTime_all": deque(),
+                "WaitingTime_mean": 0.0,
+                "WaitingTime_std": 0.0,
+                "WaitingTime_normal_ci_95": 0.0,
+            }
+            for _ in range(nr_queues)
+        ]
         
         # go over all simulation runs 
-        for i, simulation in enumerate(self.sim_runs):
+        for simulation in self.sim_runs:
             simulation = simulation[lam] # get simulation with correct rate parameter
             
             # update statistics
             allQL = simulation.get_mean_ql()
             allWT = simulation.get_mean_wait_t()
+            hists = simulation.get_ql_hists()
             
             statistics["QueueLengths_all"].append(np.mean(allQL))
-            for q in range(simulation.nrQueues):
-                statistics["QueueLength_hist"] += simulation.get_ql_hist(q)
+            statistics["QueueLength_hist"] = self.__add_hist(
+                statistics["QueueLength_hist"], hists.sum(axis=1)
+            )
             
             statistics["WaitingTime_all"].append(np.mean(allWT))
             
             statistics["CustomersCanteen_all"].append(
                 simulation.get_mean_cust_canteen()
             )
-            statistics["CustomersCanteen_values"] += simulation.canteen
-            statistics["CustomersCanteen_times"] += simulation.canteen_times
+            canteen_times, canteen = simulation.get_canteen()
+            statistics["CustomersCanteen_values"].extend(canteen)
+            statistics["CustomersCanteen_times"].extend(canteen_times)
             
             
             statistics["SojournTimeCustomer_all"].append(
@@ -136,149 +221,118 @@ class SimHistory:
             statistics["SojournTimeGroup_all"].append(
                 simulation.get_mean_sojourn_group()
             )
+
+            # update statistics of the queues separately
+            for q, queue in enumerate(separate):
+                queue["QueueLengths_all"].append(allQL[0][q])
+                queue["WaitingTime_all"].append(allWT[q][0])
+                queue["QueueLength_hist"] = self.__add_hist(
+                    queue["QueueLength_hist"], hists[:, q]
+                )
         
         statistics["QueueLength_hist"] = statistics["QueueLength_hist"]/(self.nr_simulations*c.N_QUEUES)
-            
-        # calculate mean and std 
-        statistics["QueueLength_mean"] = np.round(
-            np.mean(statistics["QueueLengths_all"]), 3
-        )
-        statistics["QueueLength_std"] = np.round(
-            np.std(statistics["QueueLengths_all"]), 3
-        )
-        statistics["WaitingTime_mean"] = np.round(
-            np.mean(statistics["WaitingTime_all"]), 3
-        )
-        statistics["WaitingTime_std"] = np.round(
-            np.std(statistics["WaitingTime_all"]), 3
-        )
-        statistics["CustomersCanteen_mean"] = np.round(
-            np.mean(statistics["CustomersCanteen_all"]), 3
-        )
-        statistics["CustomersCanteen_std"] = np.round(
-            np.std(statistics["CustomersCanteen_all"]), 3
-        )
-        statistics["SojournTimeCustomer_mean"] = np.round(
-            np.mean(statistics["SojournTimeCustomer_all"]), 3
-        )
-        statistics["SojournTimeCustomer_std"] = np.round(
-            np.std(statistics["SojournTimeCustomer_all"]), 3
-        )
-        statistics["SojournTimeGroup_mean"] = np.round(
-            np.mean(statistics["SojournTimeGroup_all"]), 3
-        )
-        statistics["SojournTimeGroup_std"] = np.round(
-            np.std(statistics["SojournTimeGroup_all"]), 3
-        )
-
-        # calculate 95% confidence intervals
-        statistics["QueueLength_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["QueueLength_mean"],
-            statistics["QueueLength_std"] ** 2,
-            0.95,
-        )
+        for queue in separate:
+            queue["QueueLength_hist"] = (
+                queue["QueueLength_hist"] / self.nr_simulations
+            )
 
-        statistics["WaitingTime_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["WaitingTime_mean"],
-            statistics["WaitingTime_std"] ** 2,
-            0.95,
-        )
+        # calculate mean, std and 95% confidence intervals
+        for stats in [statistics] + separate:
+            self.__summarize(stats, "QueueLength", stats["QueueLengths_all"])
+            self.__summarize(stats, "WaitingTime", stats["WaitingTime_all"])
+        for name in (
+            "CustomersCanteen",
+            "SojournTimeCustomer",
+            "SojournTimeGroup",
+        ):
+            self.__summarize(statistics, name, statistics[f"{name}_all"])
 
-        statistics["CustomersCanteen_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["CustomersCanteen_mean"],
-            statistics["CustomersCanteen_std"] ** 2,
-            0.95,
-        )
+        return statistics, separate
 
-        statistics["SojournTimeCustomer_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["SojournTimeCustomer_mean"],
-            statistics["SojournTimeCustomer_std"] ** 2,
-            0.95,
-        )
+    def __summarize(self, statistics: dict, name: str, values) -> None:
+        """
+        Computes the mean, std and 95% confidence interval of the means of a
+        measure over the simulation runs.
 
-        statistics["SojournTimeGroup_normal_ci_95"] = self.__ci_normal(
+        :param statistics: Dictionary the results are stored in.
+        :param name: The name of the measure, e.g. WaitingTime.
+        :param values: The means of the measure in every run.
+        """
+        statistics[f"{name}_mean"] = np.round(np.mean(values), 3)
+        statistics[f"{name}_std"] = np.round(np.std(values), 3)
+        statistics[f"{name}_normal_ci_95"] = self.__ci_normal(
             self.nr_simulations,
-            statistics["SojournTimeGroup_mean"],
-            statistics["SojournTimeGroup_std"] ** 2,
+            statistics[f"{name}_mean"],
+            statistics[f"{name}_std"] ** 2,
             0.95,
         )
 
-        return statistics
-
-    def get_statistics_separate(self, lam, queue_nr) -> dict:
+    def get_paired_difference(
+        self,
+        lam_a: int,
+        lam_b: int,
+        measure: str = "WaitingTime",
+        alpha: float = 0.95,
+    ) -> dict:
         """
-        Gathers statistics of results for queues separately
-        
-        :param lam: Index of rate parameter value for which statistics needs
-            to be calculated 
-        :param queue_nr: Integer indicating for which queue statistics need to 
-            be calculated (same as queue_id)
-            
-        :return: Dictionary with statistics
+        Compares a performance measure between two rate parameters with the
+        paired differences of the replications. The confidence interval is
+        only narrower than that of independent runs if the runs used common
+        random numbers, see QueueSimulator(crn=True).
+
+        :param lam_a: Index of the first rate parameter.
+        :param lam_b: Index of the second rate parameter.
+        :param measure: The measure, one of PAIRED_MEASURES.
+        :param alpha: The confidence level of the interval.
+        :return: Dictionary with the mean and std of the differences (b - a),
+            the confidence interval and the variance ratio, the variance of
+            the differences divided by the variance they would have with
+            independent runs.
         """
+        if measure not in self.PAIRED_MEASURES:
+            raise ValueError(
+                f"Unknown measure {measure}, choose from"
+                f" {list(self.PAIRED_MEASURES)}."
+            )
+        get_value = self.PAIRED_MEASURES[measure]
+        values_a = np.array([get_value(sim[lam_a]) for sim in self.sim_runs])
+        values_b = np.array([get_value(sim[lam_b]) for sim in self.sim_runs])
+        diff = values_b - values_a
+
+        var_independent = np.var(values_a) + np.var(values_b)
         statistics = {
-            "QueueLengths_all": deque(),
-            "QueueLength_mean": 0.0,
-            "QueueLength_std": 0.0,
-            "QueueLength_normal_ci_95": 0.0,
-            "QueueLength_hist": np.zeros(SimResults.MAX_ENTRIES+1),
-            "WaitingTime_all": deque(),
-            "WaitingTime_mean": 0.0,
-            "WaitingTime_std": 0.0,
-            "WaitingTime_normal_ci_95": 0.0,
+            "Difference_mean": np.round(np.mean(diff), 3),
+            "Difference_std": np.round(np.std(diff), 3),
+            "VarianceRatio": (
+                np.round(np.var(diff) / var_independent, 3)
+                if var_independent > 0
+                else np.nan
+            ),
         }
-
-        q = queue_nr
-
-        # iterate over all simulation runs 
-        for i, simulation in enumerate(self.sim_runs):
-            simulation = simulation[lam]
-            
-            # update statistics 
-            statistics["QueueLengths_all"].append(
-                simulation.get_mean_ql()[0][q]
-            )
-            statistics["WaitingTime_all"].append(
-                simulation.get_mean_wait_t()[q][0]
+        statistics[f"Difference_normal_ci_{int(alpha * 100)}"] = (
+            self.__ci_normal(
+                self.nr_simulations,
+                statistics["Difference_mean"],
+                np.var(diff),
+                alpha,
             )
-            statistics["QueueLength_hist"]+=simulation.get_ql_hist(queue_nr)
-            
-        statistics["QueueLength_hist"] = statistics["QueueLength_hist"]/(i+1)
-
-        # calculate mean and std 
-        statistics["QueueLength_mean"] = np.round(
-            np.mean(statistics["QueueLengths_all"]), 3
-        )
-        statistics["QueueLength_std"] = np.round(
-            np.std(statistics["QueueLengths_all"]), 3
-        )
-        statistics["WaitingTime_mean"] = np.round(
-            np.mean(statistics["WaitingTime_all"]), 3
-        )
-        statistics["WaitingTime_std"] = np.round(
-            np.std(statistics["WaitingTime_all"]), 3
         )
 
-        # calculate 95% confidence intervals
-        statistics["QueueLength_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["QueueLength_mean"],
-            statistics["QueueLength_std"] ** 2,
-            0.95,
-        )
+        return statistics
 
-        statistics["WaitingTime_normal_ci_95"] = self.__ci_normal(
-            self.nr_simulations,
-            statistics["WaitingTime_mean"],
-            statistics["WaitingTime_std"] ** 2,
-            0.95,
-        )
+    @staticmethod
+    def __add_hist(total: np.ndarray, hist: np.ndarray) -> np.ndarray:
+        """
+        Adds two histograms of queue lengths that may differ in length.
 
-        return statistics
+        :param total: The sum of the histograms so far.
+        :param hist: The histogram to add.
+        :return: The sum, as long as the longest histogram.
+        """
+        if len(hist) > len(total):
+            total, hist = hist.astype(float), total
+        total[: len(hist)] += hist
+        return total
 
     def __ci_normal(
         self, n: int, u: np.float32, var: np.float32, alpha: float
@@ -307,11 +361,19 @@ class Simulator(ABC):
     A base class to represent a simulator.
     """
 
-    def __init__(self, n_jobs: int):
+    def __init__(self, n_jobs: int, executor: Executor = None):
         super().__init__()
         self.logstr = {"className": self.__class__.__name__}
         self.sim_history: SimHistory = SimHistory()
         self.n_jobs: int = n_jobs
+        self.executor = executor
+
+    def __getstate__(self):
+        # workers only need the configuration, not the results or the pool
+        state = self.__dict__.copy()
+        state["sim_history"] = SimHistory()
+        state["executor"] = None
+        return state
 
     def get_sim_history(self) -> SimHistory:
         """
@@ -325,33 +387,104 @@ class Simulator(ABC):
             )
         return self.sim_history
 
-    def run(self, n: int) -> None:
+    def get_executor(self) -> Executor:
+        """
+        Returns the executor used to parallelize the runs. If none was given,
+        the simulator creates one and keeps it for all following runs.
+
+        :return: The executor.
+        """
+        if self.executor is None:
+            self.executor = Executor(n_jobs=self.n_jobs)
+        return self.executor
+
+    def run(
+        self,
+        n: int,
+        checkpoint: str = None,
+        resume: bool = False,
+        checkpoint_interval: float = 60.0,
+    ) -> None:
         """
         Starts the simulation.
 
         :param n: The number of simulation runs to perform.
+        :param checkpoint: Path of a file the simulation history is saved to
+            periodically while the simulations run.
+        :param resume: Whether to continue from the checkpoint of an
+            interrupted run with the same n, if it exists.
+        :param checkpoint_interval: Minimum seconds between two checkpoints.
+        """
+        n_target = self.sim_history.get_number_of_simulations() + n
+
+        checkpointer = None
+        if checkpoint is not None:
+            checkpointer = Checkpoint(
+                checkpoint,
+                meta=self._get_checkpoint_meta(),
+                n_target=n_target,
+                interval=checkpoint_interval,
+            )
+            if resume:
+                history = checkpointer.load()
+                if history is not None:
+                    self.sim_history = history
+
+        # the results of the simulation runs will be written to the sim history
+        n_left = n_target - self.sim_history.get_number_of_simulations()
+        self.__do_n_runs(n_left, checkpointer)
+
+        if checkpointer is not None:
+            checkpointer.update(self.sim_history, n_target, force=True)
+
+    def _get_checkpoint_meta(self) -> dict:
+        """
+        Returns the configuration a checkpoint must match to be resumed.
+
+        :return: Dictionary with the simulator class and seed.
         """
-        # the results of the simulation runs will be written to the game history
-        self.__do_n_runs(n)
+        return {
+            "simulator": self.__class__.__name__,
+            "seed": getattr(self, "seed", None),
+        }
 
-    def __do_n_runs(self, n: int) -> None:
+    def __do_n_runs(self, n: int, checkpoint: Checkpoint = None) -> None:
         """
         Runs n simulations.
 
         :param n: The number of simulation runs to perform
+        :param checkpoint: Checkpoint that saves the sim history, if any.
         """
-        # if parallelization is enabled, use multiprocessing
-        if self.n_jobs > 1:
-            with mp.Pool(processes=self.n_jobs) as pool:
-                results = pool.map(self._do_one_run, range(n))
+        first = self.sim_history.get_number_of_simulations()
+        indices = range(first, first + n)
 
+        # if parallelization is enabled or an executor was given, use it
+        if self.executor is not None or self.n_jobs > 1:
+            for _, results in self.get_executor().imap(self, indices):
                 # add the results to the sim history
                 for result in results:
                     self.sim_history.add_sim_run(result)
+                self.__update_checkpoint(checkpoint)
         else:
-            for i in range(n):
+            for i in indices:
                 result = self._do_one_run(i)
                 self.sim_history.add_sim_run(result)
+                self.__update_checkpoint(checkpoint)
+
+    def __update_checkpoint(self, checkpoint: Checkpoint) -> None:
+        if checkpoint is not None:
+            checkpoint.update(
+                self.sim_history, self.sim_history.get_number_of_simulations()
+            )
+
+    def _do_chunk(self, indices: list) -> list:
+        """
+        Runs the simulations with the given numbers, used by the worker pool.
+
+        :param indices: The numbers of the simulation runs.
+        :return: List with the results of the simulation runs.
+        """
+        return [self._do_one_run(i) for i in indices]
 
     @abstractmethod
     def _do_one_run(self, n: int) -> SimResults:
@@ -364,15 +497,58 @@ class Simulator(ABC):
 
 
 class QueueSimulator(Simulator):
+    """
+    Simulates the canteen queues for every arrival rate.
+
+    Every distribution gets its own random stream for every replication,
+    derived from (seed, replication number, stream id), see
+    dist.streams.RandomStreams. If a seed is given, the results of a
+    replication only depend on its number, not on the process or host that
+    ran it. Without a seed every replication draws fresh entropy.
+
+    The future event set is a binary heap by default; fes="calendar" uses
+    a calendar queue, whose operations stay O(1) as the number of pending
+    events grows.
+
+    With crn=True the arrival rates are compared with common random numbers:
+    every stochastic input restarts its stream for every rate, so group k
+    has the same size, and its customers the same grab times, payment and
+    service times, for every rate. The inter-arrival times of all rates are
+    scaled copies of the same exponential draws. Differences between rates
+    then have a much smaller variance, see SimHistory.get_paired_difference.
+
+    A replication returns a SimSummary per rate, the statistics of the run
+    without its events, groups and customers. With trace_every=k every k-th
+    replication returns the full SimResults instead, e.g. for the plot of
+    the number of customers in the canteen over time: with the default
+    trace_every=0, analysis.plot_hist_CC_vs_time has no data to plot.
+    """
+
     def __init__(
         self,
         nr_servers: int = 3,
         nr_queues: int = 3,
         n_jobs: int = 1,
+        executor: Executor = None,
+        seed: int = None,
+        fes: str = "heap",
+        crn: bool = False,
+        trace_every: int = 0,
     ):
         self.logstr = {"className": self.__class__.__name__}
         self.nr_queues = nr_queues
         self.nr_servers = nr_servers
+        self.seed = seed
+        self.crn = crn
+        self.trace_every = trace_every
+        self.rng = None
+        self.streams = None
+
+        if fes not in FES_TYPES:
+            raise ValueError(
+                f"Unknown FES {fes}, choose from {list(FES_TYPES)}."
+            )
+        self.fes_type = fes
 
         logger.debug(
             f"Nr. of queues: {nr_queues}, nr. of servers: {nr_servers}",
@@ -392,22 +568,90 @@ class QueueSimulator(Simulator):
         self.sim_history: SimHistory = SimHistory()
 
         # geometric distribution for the group size N
-        self.group_size_dist = Distribution(stats.geom(c.P_GROUP_SIZE))
+        self.group_size_dist = Geometric(c.P_GROUP_SIZE)
 
         # exponential distribution for the arrival time of a group
         self.arrival_time_dist = [
-            Distribution(stats.expon(scale=1/mu)) for mu in c.MU_ARRIVAL_RATE_SEC
+            Exponential(scale=1 / mu) for mu in c.MU_ARRIVAL_RATE_SEC
         ]
 
         # exponential distribution for the time it takes a customer to grab food
-        self.grab_food_dist = Distribution(
-            stats.expon(scale=c.MU_CUSTOM_GRAB_FOOD)
-        )
+        self.grab_food_dist = Exponential(scale=c.MU_CUSTOM_GRAB_FOOD)
 
         # bernoulli distribution for cash or card payment with p = p_cash
-        self.use_cash_dist = Distribution(stats.bernoulli(c.P_CASH))
+        self.use_cash_dist = Bernoulli(c.P_CASH)
+
+        # service times in units of their mean, drawn per customer with crn
+        self.service_dist = Exponential(scale=1.0) if crn else None
 
-        super().__init__(n_jobs=n_jobs)
+        super().__init__(n_jobs=n_jobs, executor=executor)
+
+    def get_rng(self):
+        """
+        Returns the random number generator used to break ties between
+        queues, the global one before the first replication.
+
+        :return: The random number generator.
+        """
+        return random if self.rng is None else self.rng
+
+    def _stream(self, n: int, *stream_id: int) -> np.random.Generator:
+        """
+        Creates the random stream with the given id for replication n.
+
+        :param n: The number of the simulation run.
+        :param stream_id: Integers identifying the stream.
+        :return: The random number generator.
+        """
+        return self.streams.generator(n, *stream_id)
+
+    def _seed_streams(self, n: int) -> None:
+        """
+        Seeds the distributions of the simulator for replication n.
+
+        :param n: The number of the simulation run.
+        """
+        self.streams = RandomStreams(self.seed)
+        self.rng = Uniform(self._stream(n, 0))
+        self.group_size_dist.setRandomState(self._stream(n, 1))
+        self.grab_food_dist.setRandomState(self._stream(n, 2))
+        self.use_cash_dist.setRandomState(self._stream(n, 3))
+        for idx, dist in enumerate(self.arrival_time_dist):
+            dist.setRandomState(self._stream(n, 4, idx))
+
+    def _seed_scenario(self, n: int, idx: int) -> None:
+        """
+        Restarts the streams of the inputs for rate idx of replication n if
+        common random numbers are used, so every rate replays the same
+        numbers.
+
+        :param n: The number of the simulation run.
+        :param idx: The index of the arrival rate.
+        """
+        if not self.crn:
+            return
+        self.rng = Uniform(self._stream(n, 0))
+        self.group_size_dist.setRandomState(self._stream(n, 1))
+        self.grab_food_dist.setRandomState(self._stream(n, 2))
+        self.use_cash_dist.setRandomState(self._stream(n, 3))
+        self.arrival_time_dist[idx].setRandomState(self._stream(n, 4))
+        self.service_dist.setRandomState(self._stream(n, 7))
+
+    def _get_checkpoint_meta(self) -> dict:
+        """
+        Returns the configuration a checkpoint must match to be resumed.
+
+        :return: Dictionary with the simulator class, seed, the canteen and
+            the options that change the results.
+        """
+        meta = super()._get_checkpoint_meta()
+        meta["nr_queues"] = self.nr_queues
+        meta["nr_servers"] = self.nr_servers
+        meta["arrival_rates"] = list(c.MU_ARRIVAL_RATE_MIN)
+        meta["fes"] = self.fes_type
+        meta["crn"] = self.crn
+        meta["trace_every"] = self.trace_every
+        return meta
 
     def _do_one_run(self, n: int) -> None:
         """
@@ -417,6 +661,8 @@ class QueueSimulator(Simulator):
         :return: The simulation results.
         """
         res = np.empty(len(self.arrival_time_dist), dtype = SimResults)
+
+        self._seed_streams(n)
         
         # run simulation once for each rate parameter
         for idx, dist in enumerate(self.arrival_time_dist):
@@ -427,6 +673,8 @@ class QueueSimulator(Simulator):
                 ),
                 extra=self.logstr,
             )
+            self._seed_scenario(n, idx)
+
             # initialize queues
             for q_id in range(self.nr_queues):
                 self.queues[q_id] = CQueue(queue_id=q_id)
@@ -436,6 +684,12 @@ class QueueSimulator(Simulator):
                 self.servers[s] = Server(
                     id=s, mu_cash=c.MU_SERVICE_CASH, mu_card=c.MU_SERVICE_BANK
                 )
+                self.servers[s].dist_cash.setRandomState(
+                    self._stream(n, 5, idx, s)
+                )
+                self.servers[s].dist_card.setRandomState(
+                    self._stream(n, 6, idx, s)
+                )
 
             # add servers to each queue
             assert (
@@ -454,7 +708,10 @@ class QueueSimulator(Simulator):
             # run simulation
             self.simulate_queue(dist)
 
-            res[idx] = self.res
+            if self.trace_every and n % self.trace_every == 0:
+                res[idx] = self.res
+            else:
+                res[idx] = self.res.summarize()
             
         return res
 
@@ -472,7 +729,7 @@ class QueueSimulator(Simulator):
         N = 0 # number of customers in canteen 
 
         # initialize simulation
-        fes = FES()
+        fes = FES_TYPES[self.fes_type]()
         self.res = SimResults(self.queues.size)
         t = 0
         
@@ -480,9 +737,30 @@ class QueueSimulator(Simulator):
         N = 0 
         self.res.register_canteen(t, N)
 
-        # create first group, update the FES with new arrival events
-        # and intialize N as number of customers in canteen 
-        fes = self.create_new_group(t_arr=t, fes=fes)
+        # sample all group and customer arrivals of the hour at once, they
+        # come from a sorted stream that is merged with the FES
+        sampled = Arrivals(
+            arrival_time_dist=dist,
+            group_size_dist=self.group_size_dist,
+            grab_food_dist=self.grab_food_dist,
+            use_cash_dist=self.use_cash_dist,
+            t_end=c.SIM_T,
+            service_dist=self.service_dist,
+        )
+        arrivals = ArrivalStream(sampled)
+
+        # customers and groups are rows of tables, events refer to the rows
+        customers = CustomerTable(sampled)
+        groups = GroupTable(sampled)
+        self.res.set_tables(customers, groups)
+
+        # plain lists of the columns read in the loop, faster to index
+        group_size = groups.size.tolist()
+        t_grab = customers.t_grab.tolist()
+        use_cash = customers.cash.tolist()
+        service_unit = [None] * len(customers)
+        if customers.service_unit is not None:
+            service_unit = customers.service_unit.tolist()
 
         # run simulation until t > SIM_T
         while t < c.SIM_T:
@@ -490,10 +768,13 @@ class QueueSimulator(Simulator):
             q_lengths = self.get_queue_lengths()
             self.res.register_queue_length(t, q_lengths)
 
-            # get next event from FES
-            e = fes.next()  # jump to next event
+            # get next event from the arrivals or the FES
+            if arrivals.peek() <= fes.peek():
+                e = arrivals.next()
+            else:
+                e = fes.next()  # jump to next event
             t = e.time  # update time
-            cust = e.get_customer()  # get customer
+            cust = e.get_customer()  # get customer (or group) number
 
             logger.debug(f"Event: {e}", extra=self.logstr)
 
@@ -506,12 +787,8 @@ class QueueSimulator(Simulator):
                     extra=self.logstr,
                 )
                 
-                # create new group and update the FES with new arrival events
-                t_arr_new = t+dist.rvs(1)
-                fes = self.create_new_group(t_arr=t_arr_new, fes=fes)
-                
                 # register number of customers in canteen 
-                N += e.get_customer().get_nr_customers()
+                N += group_size[cust]
                 self.res.register_canteen(t, N)
             
             # handle customer arrival event
@@ -523,7 +800,7 @@ class QueueSimulator(Simulator):
 
                 # get the queue with the shortest length
                 shortest = np.where(q_lengths == np.amin(q_lengths))[0]
-                q_id = random.choice(shortest)
+                q_id = self.get_rng().choice(shortest)
                 logger.debug(
                     f"Shortest queue: {shortest}, selected queue: {q_id}",
                     extra=self.logstr,
@@ -532,8 +809,8 @@ class QueueSimulator(Simulator):
                 # add customer to queue object
                 self.queues[q_id].add_customer(customer=cust, q_id=q_id)  # type: ignore
 
-                # store q_id in customer object
-                cust.set_queue_id(q_id)
+                # store q_id in customer table
+                customers.queue[cust] = q_id
 
                 # if there was a free server we schedule a departure event
                 if self.queues[q_id].get_length() <= self.queues[q_id].get_n_servers():  # type: ignore
@@ -541,17 +818,18 @@ class QueueSimulator(Simulator):
                     # TODO: for now we only support one server per queue so id is always 0
                     server = self.queues[q_id].get_server(server_id=0)  # type: ignore
                     t_service = t + server.get_service_time(
-                        cust.get_uses_cash()
+                        use_cash[cust], service_unit[cust]
                     )
                     logger.debug(f"Scheduled new DEPARTURE {t_service}", extra=self.logstr)
 
                     # schedule departure event
                     dep_event = Event(Event.DEPARTURE, t_service, cust)
                     fes.add(dep_event)
-                    cust.set_t_left(t_service)
+                    customers.t_service[cust] = t
+                    customers.t_left[cust] = t_service
                     
                     # register waiting time 
-                    self.res.register_waiting_time(t-cust.get_t_done_grab(), cust.get_queue_id())
+                    self.res.register_waiting_time(t - t_grab[cust], q_id)
                     
                     # register sojourn time 
                     self.res.register_sojourn_t(cust)
@@ -564,8 +842,7 @@ class QueueSimulator(Simulator):
                     extra=self.logstr,
                 )
                 # get the queue the customer is in and remove the customer from that queue
-                # TODO: do we check each queue if the customer is there or do we just store the queue id in the customer obj?
-                q_id = cust.get_queue_id()
+                q_id = int(customers.queue[cust])
                 self.queues[q_id].remove_customer(customer=cust, q_id=q_id)  # type: ignore
                 
                 # register number of customers in canteen 
@@ -592,23 +869,24 @@ class QueueSimulator(Simulator):
                     # get the server that will serve the customer
                     server = self.queues[q_id].get_server(server_id=0)  # type: ignore
                     t_service = t + server.get_service_time(
-                        cust.get_uses_cash()
+                        use_cash[cust], service_unit[cust]
                     )
                     logger.debug(f"Scheduled new DEPARTURE {t_service}", extra=self.logstr)
 
                     # schedule departure event
                     dep_event = Event(Event.DEPARTURE, t_service, cust)
                     fes.add(dep_event)
-                    cust.set_t_left(t_service)
+                    customers.t_service[cust] = t
+                    customers.t_left[cust] = t_service
                     
                     # register waiting time 
-                    self.res.register_waiting_time(t-cust.get_t_done_grab(), cust.get_queue_id())
+                    self.res.register_waiting_time(t - t_grab[cust], q_id)
                     
                     # register sojourn time 
                     self.res.register_sojourn_t(cust)
                     
                     # register waiting time 
-                    self.res.register_waiting_time(t-cust.get_t_done_grab(), cust.get_queue_id())
+                    self.res.register_waiting_time(t - t_grab[cust], q_id)
 
             # log the FES / debug sleep
             if c.LOG_FES:
@@ -616,34 +894,6 @@ class QueueSimulator(Simulator):
             if c.DEBUG_THROTTLE is True:
                 time.sleep(c.TIME_SLEEP)
 
-    def create_new_group(self, t_arr: float, fes: FES) -> FES:
-        """
-        Create a new group of customers.
-
-        :param t_arr: The arrival time of the group.
-        :param fes: The current future event schedule before the group arrived.
-        :return: The updated future event schedule after the group arrived.
-        """
-        # sample distributions for group size, arrival time and grab time and cash usage
-        n_customers = self.group_size_dist.rvs(1)
-        t_grab = t_arr + self.grab_food_dist.rvs(n_customers)
-        use_cash = self.use_cash_dist.rvs(n_customers)
-
-        # create group of customers
-        group = Group(n_customers, use_cash, t_arr, t_grab)
-        
-        # register group 
-        self.res.register_group(group)
-        
-        # add group arrival to FES
-        fes.add(Event(Event.ARRIVAL_GROUP, t_arr, group))
-
-        # create an arrival event for each customer in the group, and add it to the FES
-        for idx, customer in enumerate(group.get_customers()):
-            fes.add(Event(Event.ARRIVAL, customer.get_t_done_grab(), customer))
-
-        return fes
-
     def get_queue_lengths(self) -> np.ndarray:
         """
         Get the length of each queue.
@@ -0,0 +1,173 @@
+import numpy as np
+
+from assignment_2.customer import Customer
+from assignment_2.group import Group
+
+
+class CustomerTable:
+    """
+    The customers of one simulation as NumPy columns, one row per customer
+    in the order of Arrivals, so the customers of a group are consecutive
+    rows. Events and queues refer to customers by row number.
+
+    The columns sampled before the simulation are copied from Arrivals, the
+    others are filled in by the event loop: the queue the customer joined,
+    the start of its service and the time it left the canteen. Times that
+    are not known yet are NaN, queues -1.
+    """
+
+    # columns of the table in the order of to_records()
+    DTYPE = np.dtype(
+        [
+            ("group", "<i8"),
+            ("t_arrival", "<f8"),
+            ("t_grab", "<f8"),
+            ("cash", "?"),
+            ("queue", "<i2"),
+            ("t_service", "<f8"),
+            ("t_left", "<f8"),
+        ]
+    )
+
+    def __init__(self, arrivals):
+        """
+        :param arrivals: The sampled arrivals of the simulation.
+        """
+        n = arrivals.get_nr_customers()
+        self.group = arrivals.group_of
+        self.t_arrival = arrivals.t_group[arrivals.group_of]
+        self.t_grab = arrivals.t_grab
+        self.cash = arrivals.use_cash.astype(bool)
+        self.service_unit = arrivals.service_unit
+        self.queue = np.full(n, -1, dtype=np.int16)
+        self.t_service = np.full(n, np.nan)
+        self.t_left = np.full(n, np.nan)
+
+    def __len__(self):
+        return len(self.t_grab)
+
+    def to_records(self) -> np.ndarray:
+        """
+        Returns the table as one structured array.
+
+        :return: Array with dtype DTYPE.
+        """
+        records = np.empty(len(self), dtype=self.DTYPE)
+        for name in self.DTYPE.names:
+            records[name] = getattr(self, name)
+        return records
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table as a .npy file of to_records().
+
+        :param path: The path of the file.
+        """
+        np.save(path, self.to_records())
+
+    def get_customer(self, i: int) -> Customer:
+        """
+        Returns a Customer object with the current values of a row, e.g. to
+        inspect it. Changes to the object do not change the table.
+
+        :param i: The row of the customer.
+        :return: The customer.
+        """
+        customer = Customer(
+            t_arr=float(self.t_arrival[i]),
+            t_grab_food=float(self.t_grab[i]),
+            cash=bool(self.cash[i]),
+            uniq_group_id=int(i - np.searchsorted(self.group, self.group[i])),
+            service_unit=(
+                None
+                if self.service_unit is None
+                else float(self.service_unit[i])
+            ),
+        )
+        if self.queue[i] >= 0:
+            customer.set_queue_id(int(self.queue[i]))
+        if not np.isnan(self.t_left[i]):
+            customer.set_t_left(float(self.t_left[i]))
+        return customer
+
+
+class GroupTable:
+    """
+    The groups of one simulation as NumPy columns, one row per group in
+    order of arrival. The customers of group g are the rows start[g] up to
+    start[g] + size[g] of the CustomerTable.
+
+    n_waiting counts the customers of a group whose service has not started
+    yet; the group has left when it reaches 0, at t_departure.
+    """
+
+    DTYPE = np.dtype(
+        [
+            ("t_arrival", "<f8"),
+            ("size", "<i8"),
+            ("start", "<i8"),
+            ("t_departure", "<f8"),
+        ]
+    )
+
+    def __init__(self, arrivals):
+        """
+        :param arrivals: The sampled arrivals of the simulation.
+        """
+        self.t_arrival = arrivals.t_group
+        self.size = arrivals.group_size
+        self.start = arrivals.group_start[:-1]
+        self.n_waiting = arrivals.group_size.copy()
+        self.t_departure = np.full(len(self.size), np.nan)
+
+    def __len__(self):
+        return len(self.size)
+
+    def to_records(self) -> np.ndarray:
+        """
+        Returns the table as one structured array.
+
+        :return: Array with dtype DTYPE.
+        """
+        records = np.empty(len(self), dtype=self.DTYPE)
+        for name in self.DTYPE.names:
+            records[name] = getattr(self, name)
+        return records
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table as a .npy file of to_records().
+
+        :param path: The path of the file.
+        """
+        np.save(path, self.to_records())
+
+    def get_group(self, g: int, customers: CustomerTable) -> Group:
+        """
+        Returns a Group object with the current values of a row, e.g. to
+        inspect it. Changes to the object do not change the tables.
+
+        :param g: The row of the group.
+        :param customers: The customer table of the simulation.
+        :return: The group.
+        """
+        start, stop = self.start[g], self.start[g] + self.size[g]
+        group = Group(
+            int(self.size[g]),
+            customers.cash[start:stop],
+            float(self.t_arrival[g]),
+            customers.t_grab[start:stop],
+            (
+                None
+                if customers.service_unit is None
+                else customers.service_unit[start:stop]
+            ),
+        )
+        for i, customer in zip(range(start, stop), group.get_customers()):
+            if customers.queue[i] >= 0:
+                customer.set_queue_id(int(customers.queue[i]))
+            if not np.isnan(customers.t_left[i]):
+                customer.set_t_left(float(customers.t_left[i]))
+        if not np.isnan(self.t_departure[g]):
+            group.set_t_departure(float(self.t_departure[g]))
+        return group
@@ -0,0 +1,170 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = str(Path(__file__).parent)
+
+# modules that a worker process imports to run a simulation
+CORE_MODULES = [
+    "assignment_1.simulator",
+    "assignment_2.simulator",
+    "parallel.executor",
+]
+
+# modules that only the analysis entry points need, for comparison
+ANALYSIS_MODULES = [
+    "assignment_2.analysis",
+    "matplotlib.pyplot",
+    "seaborn",
+]
+
+# plotting and analysis dependencies that should not be loaded by workers
+HEAVY_MODULES = ["matplotlib", "seaborn", "pandas"]
+
+_IMPORT_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_time": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy_modules": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """
+    Measures the time to import a module in a fresh interpreter, like a
+    freshly spawned worker would.
+
+    :param module: The dotted name of the module.
+    :param repeat: The number of fresh interpreters, the minimum is reported.
+    :return: Dictionary with the import time (s), the peak RSS (kB) and the
+        heavy modules that were loaded along.
+    """
+    code = _IMPORT_PROBE.format(root=ROOT, module=module, heavy=HEAVY_MODULES)
+
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    result = min(runs, key=lambda run: run["import_time"])
+    result["module"] = module
+    return result
+
+
+def measure_interpreter(repeat: int = 3) -> float:
+    """
+    Measures the startup time of a bare interpreter, the baseline of the
+    import times.
+
+    :param repeat: The number of runs, the minimum is reported.
+    :return: The startup time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure_bootstrap(n_games: int = 1_000_000, repeat: int = 3) -> float:
+    """
+    Measures the time of a BCa interval of the mean number of rounds of the
+    games white won, over n_games random games.
+
+    :param n_games: The number of games.
+    :param repeat: The number of runs, the minimum is reported.
+    :return: The time in seconds.
+    """
+    import numpy as np
+    import assignment_1.constants as c
+    from assignment_1.bootstrap import bootstrap
+
+    def mean_rounds_of(weights, results, rounds):
+        won = results == c.GameStates.WHITE_WON.value
+        return weights @ (rounds * won) / (weights @ won)
+
+    rng = np.random.default_rng(6)
+    results = rng.choice([1, 2, 3], size=n_games)
+    rounds = rng.integers(1, 200, size=n_games)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bootstrap(
+            results, rounds, statistic=mean_rounds_of, method="bca", seed=6
+        )
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_benchmark(repeat: int = 3) -> dict:
+    """
+    Runs the import benchmark for the core and the analysis modules and
+    times the bootstrap of a million games.
+
+    :param repeat: The number of fresh interpreters per module.
+    :return: Dictionary with the results.
+    """
+    return {
+        "interpreter_startup": measure_interpreter(repeat),
+        "core": [measure_import(m, repeat) for m in CORE_MODULES],
+        "analysis": [measure_import(m, repeat) for m in ANALYSIS_MODULES],
+        "bootstrap_bca": measure_bootstrap(repeat=repeat),
+    }
+
+
+def format_benchmark(results: dict) -> str:
+    """
+    Formats the benchmark results as a table.
+
+    :param results: The results of run_benchmark.
+    :return: The table.
+    """
+    s = (
+        "\n\nInterpreter startup:"
+        f" {results['interpreter_startup'] * 1000:.1f} ms\n\n"
+    )
+    s += f"{'module':<28}{'import (ms)':>12}{'RSS (MB)':>10}  heavy\n"
+    for group in ("core", "analysis"):
+        for r in results[group]:
+            s += (
+                f"{r['module']:<28}{r['import_time'] * 1000:>12.1f}"
+                f"{r['max_rss_kb'] / 1024:>10.1f}"
+                f"  {', '.join(r['heavy_modules']) or '-'}\n"
+            )
+    s += (
+        "\nBCa interval over a million games:"
+        f" {results['bootstrap_bca'] * 1000:.1f} ms\n"
+    )
+    return s
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    results = run_benchmark()
+    logger.info(format_benchmark(results))
+
+    for r in results["core"]:
+        if r["heavy_modules"]:
+            logger.warning(
+                f"{r['module']} loads {', '.join(r['heavy_modules'])}"
+            )
@@ -0,0 +1,197 @@
+'''
+Random number streams built on numpy.random.Generator, a faster replacement
+of the scipy based Distribution wrapper with the same rvs() interface.
+
+Like Distribution, a stream samples its numbers in batches and serves them
+one by one, but it keeps the unused tail of a batch when more numbers are
+requested than are left, so no random numbers are thrown away. Single
+numbers are served as Python floats (or ints) from a list, which is faster
+than indexing a numpy array.
+
+RandomStreams derives an independent Generator for every stochastic input
+from a SeedSequence, identified by a tuple of integers, e.g. (replication,
+input). The tuple is used as the spawn key, so the stream of an input does
+not depend on the order in which the streams are created.
+'''
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Factory of independent random generators, one per stream id.
+    """
+
+    def __init__(self, seed: int = None):
+        """
+        :param seed: The root seed, fresh entropy from the OS if None.
+        """
+        self.seed_seq = np.random.SeedSequence(seed)
+
+    def generator(self, *stream_id: int) -> np.random.Generator:
+        """
+        Returns the generator of a stream.
+
+        :param stream_id: Non-negative integers identifying the stream.
+        :return: The random number generator.
+        """
+        seed_seq = np.random.SeedSequence(
+            self.seed_seq.entropy, spawn_key=tuple(stream_id)
+        )
+        return np.random.default_rng(seed_seq)
+
+
+class Stream(ABC):
+    """
+    Buffered random numbers of one distribution. Subclasses implement
+    _draw(n) and mean().
+    """
+
+    n = 4096  # random numbers to generate per batch
+
+    def __init__(self, rng: np.random.Generator = None):
+        """
+        :param rng: The random number generator, a fresh one if None.
+        """
+        self.setRandomState(rng)
+
+    def setRandomState(self, rng: np.random.Generator) -> None:
+        """
+        Sets the generator of the stream, with the name of the method of
+        Distribution. Numbers left from the previous generator are dropped.
+
+        :param rng: The random number generator, a fresh one if None.
+        """
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.randomNumbers = np.empty(0)
+        self.numbers = []
+        self.idx = 0
+
+    @abstractmethod
+    def _draw(self, n: int) -> np.ndarray:
+        """
+        Draws a batch of random numbers from the generator.
+
+        :param n: The number of random numbers.
+        :return: Array of n random numbers.
+        """
+        pass
+
+    def resample(self) -> None:
+        self.randomNumbers = self._draw(self.n)
+        self.numbers = self.randomNumbers.tolist()
+        self.idx = 0
+
+    def rvs(self, n: int = 1):
+        """
+        Returns n (=1 by default) random numbers.
+
+        :return: One random number (Python float or int) if n=1, and an
+            array of n random numbers otherwise.
+        """
+        if n == 1:
+            if self.idx >= len(self.numbers):
+                self.resample()
+            self.idx += 1
+            return self.numbers[self.idx - 1]
+
+        rs = self.randomNumbers[self.idx:self.idx + n]
+        self.idx += len(rs)
+        if len(rs) < n:
+            # keep the tail of the old batch and continue in a new one
+            rest = n - len(rs)
+            if rest > self.n:
+                rs = np.concatenate((rs, self._draw(rest)))
+            else:
+                self.resample()
+                rs = np.concatenate((rs, self.randomNumbers[:rest]))
+                self.idx = rest
+        return rs
+
+    @abstractmethod
+    def mean(self) -> float:
+        """
+        Returns the mean of the distribution.
+
+        :return: The mean.
+        """
+        pass
+
+
+class Exponential(Stream):
+    def __init__(self, scale: float, rng: np.random.Generator = None):
+        """
+        :param scale: The mean of the distribution.
+        :param rng: The random number generator.
+        """
+        self.scale = scale
+        super().__init__(rng)
+
+    def _draw(self, n: int) -> np.ndarray:
+        return self.rng.exponential(self.scale, n)
+
+    def mean(self) -> float:
+        return self.scale
+
+
+class Geometric(Stream):
+    """
+    Number of trials up to and including the first success, like
+    scipy.stats.geom.
+    """
+
+    def __init__(self, p: float, rng: np.random.Generator = None):
+        """
+        :param p: The success probability.
+        :param rng: The random number generator.
+        """
+        self.p = p
+        super().__init__(rng)
+
+    def _draw(self, n: int) -> np.ndarray:
+        return self.rng.geometric(self.p, n)
+
+    def mean(self) -> float:
+        return 1 / self.p
+
+
+class Bernoulli(Stream):
+    def __init__(self, p: float, rng: np.random.Generator = None):
+        """
+        :param p: The probability of a 1.
+        :param rng: The random number generator.
+        """
+        self.p = p
+        super().__init__(rng)
+
+    def _draw(self, n: int) -> np.ndarray:
+        return (self.rng.random(n) < self.p).astype(np.int64)
+
+    def mean(self) -> float:
+        return self.p
+
+
+class Uniform(Stream):
+    """
+    Uniform numbers on [0, 1). Also offers randint() and choice(), so it
+    can replace a random.Random instance.
+    """
+
+    def _draw(self, n: int) -> np.ndarray:
+        return self.rng.random(n)
+
+    def mean(self) -> float:
+        return 0.5
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Returns a random integer in [a, b], both included.
+        """
+        return a + int(self.rvs() * (b - a + 1))
+
+    def choice(self, seq):
+        """
+        Returns a random element of a non-empty sequence.
+        """
+        return seq[int(self.rvs() * len(seq))]
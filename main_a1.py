@@ -1,3 +1,4 @@
+import argparse
 import multiprocessing as mp
 import time
 
@@ -7,6 +8,7 @@ import os
 os.system("")
 
 from assignment_1.simulator import ChessSimulator
+from parallel.executor import Executor
 from assignment_1.strategy import RandomStrategy
 import assignment_1.constants as c
 
@@ -15,6 +17,14 @@ import pickle
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the chess simulation.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from its checkpoint",
+    )
+    args = parser.parse_args()
+
     n_jobs = mp.cpu_count() - 1
     parallelize = True
     n_games = 1000
@@ -34,16 +44,24 @@ if __name__ == "__main__":
         player=c.Players.WHITE, allow_two_step_pawn=False
     )
 
+    executor = Executor(n_jobs=n_jobs)
     simulator = ChessSimulator(
         parallelize=True,
         n_jobs=n_jobs,
         black_strat=black_strategy,
         white_strat=white_strategy,
+        executor=executor,
     )
 
-    # Run the simulator.
+    # Run the simulator, the workers stay alive for successive runs. With
+    # --resume an interrupted run continues from its last checkpoint.
     start_time = time.time()
-    simulator.run(n=n_games)
+    simulator.run(
+        n=n_games,
+        checkpoint=f"checkpoint_nruns={n_games}.pkl",
+        resume=args.resume,
+    )
+    executor.close()
 
     # Print time
     st_str = time.strftime("%H:%M:%S", time.gmtime(time.time() - start_time))
@@ -1,3 +1,4 @@
+import argparse
 import logging
 import os
 import multiprocessing as mp
@@ -7,6 +8,7 @@ import pickle
 import assignment_2.simulator as sim
 import assignment_2.constants as c
 import assignment_2.analysis as analysis 
+from parallel.executor import Executor
 
 logging.basicConfig(
     level=c.LOG_LEVEL,
@@ -19,11 +21,16 @@ logging.basicConfig(
 os.system("")
 logging.getLogger('numexpr').setLevel(logging.WARNING)
 
-import matplotlib.pyplot as plt 
-plt.close('all')
-
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the queue simulation.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from its checkpoint",
+    )
+    args = parser.parse_args()
+
     n_jobs = mp.cpu_count() - 2
     n_sims = 10000
 
@@ -34,13 +41,27 @@ if __name__ == "__main__":
         extra={"className": ""},
     )
 
-    # Create a simulator.
+    # Create a simulator, the arrival rates share common random numbers so
+    # they can be compared with paired differences. Every 100th replication
+    # keeps its full trace for the plot of the customers in the canteen.
+    executor = Executor(n_jobs=n_jobs)
     simulator = sim.QueueSimulator(
-        n_jobs=n_jobs, nr_queues=c.N_QUEUES, nr_servers=c.N_SERVERS
+        n_jobs=n_jobs,
+        nr_queues=c.N_QUEUES,
+        nr_servers=c.N_SERVERS,
+        executor=executor,
+        crn=True,
+        trace_every=100,
     )
 
-    # Run the simulator.
-    simulator.run(n=n_sims)
+    # Run the simulator, the workers stay alive for successive runs. With
+    # --resume an interrupted run continues from its last checkpoint.
+    simulator.run(
+        n=n_sims,
+        checkpoint=f"checkpoint_nrRuns={n_sims}.pkl",
+        resume=args.resume,
+    )
+    executor.close()
 
     # Get the results.
     results = simulator.get_sim_history()
@@ -0,0 +1,63 @@
+import multiprocessing as mp
+import time
+from functools import partial
+
+# to show colors on Windows
+import os
+
+os.system("")
+
+from assignment_1.tournament import Tournament
+from assignment_1.strategy import RandomStrategy
+from parallel.executor import Executor
+
+import logging
+import pickle
+
+
+if __name__ == "__main__":
+    n_jobs = mp.cpu_count() - 1
+    parallelize = True
+    n_games = 100  # per pairing and colour
+
+    # Start logging
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"Starting tournament with {n_jobs} jobs, parallelize={parallelize}",
+        extra={"className": ""},
+    )
+
+    # Create a tournament, every factory takes the player as argument.
+    executor = Executor(n_jobs=n_jobs)
+    tournament = Tournament(
+        strategy_factories=[
+            partial(RandomStrategy, allow_two_step_pawn=False),
+            partial(RandomStrategy, allow_two_step_pawn=True),
+        ],
+        names=["random", "random_two_step_pawn"],
+        parallelize=parallelize,
+        n_jobs=n_jobs,
+        executor=executor,
+    )
+
+    # Run the tournament.
+    start_time = time.time()
+    tournament.run(n_games=n_games)
+    executor.close()
+
+    # Print time
+    st_str = time.strftime("%H:%M:%S", time.gmtime(time.time() - start_time))
+    logger.info(f"Tournament finished in {st_str}", extra={"className": ""})
+
+    # Print ratings.
+    ratings = tournament.get_ratings()
+
+    str = "\n\nRatings:\n\n"
+    for name, rating in ratings.items():
+        str += f"{name}: {rating}\n"
+    logger.info(str, extra={"className": ""})
+
+    pickle.dump(ratings, open(f"ratings_ngames={n_games}.pkl", "wb"))
+    pickle.dump(
+        tournament.get_tallies(), open(f"tallies_ngames={n_games}.pkl", "wb")
+    )
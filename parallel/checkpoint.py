@@ -0,0 +1,136 @@
+"""
+Checkpoints of long simulation runs.
+
+A run writes its history (the accumulated results of all completed games or
+replications) to disk every few seconds. Completed work always is a
+contiguous range of indices, because results are added in index order, so
+the history alone tells where to continue. Resuming loads the history and
+runs the remaining indices, which gives seeded simulators the same random
+streams they would have had without the interruption.
+
+Files are written atomically: a checkpoint is written to a temporary file in
+the same directory and then renamed over the old one, so a crash while
+writing leaves the previous checkpoint intact.
+"""
+import os
+import pickle
+import tempfile
+import time
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path: str, write) -> None:
+    """
+    Writes a file atomically: write(f) fills a temporary file in the same
+    directory, which then replaces the file.
+
+    :param path: The path of the file.
+    :param write: Callable that writes the content to a binary file object.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def atomic_dump(obj, path: str) -> None:
+    """
+    Pickles an object to a file, replacing the file atomically.
+
+    :param obj: The object to pickle.
+    :param path: The path of the file.
+    """
+    atomic_write(
+        path,
+        lambda f: pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+
+class Checkpoint:
+    """
+    Periodically saves the history of one run to a file.
+    """
+
+    def __init__(
+        self, path: str, meta: dict, n_target: int, interval: float = 60.0
+    ):
+        """
+        :param path: The path of the checkpoint file.
+        :param meta: Configuration of the simulator, e.g. its class and seed,
+            that must match when resuming.
+        :param n_target: The number of games or replications the run
+            completes, including the ones already in the history.
+        :param interval: Minimum number of seconds between two checkpoints.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        self.path = path
+        self.meta = meta
+        self.n_target = n_target
+        self.interval = interval
+        self.last_save = time.monotonic()
+
+    def load(self):
+        """
+        Loads the history of an earlier run.
+
+        :return: The history or None if there is no checkpoint.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+
+        if state["meta"] != self.meta:
+            raise ValueError(
+                f"Checkpoint {self.path} was written by {state['meta']},"
+                f" not by {self.meta}."
+            )
+        if state["n_target"] != self.n_target:
+            raise ValueError(
+                f"Checkpoint {self.path} was written by a run of"
+                f" {state['n_target']}, not {self.n_target}."
+            )
+
+        logger.info(
+            f"Resuming from {self.path} at {state['n_done']}"
+            f" of {self.n_target}",
+            extra=self.logstr,
+        )
+        return state["history"]
+
+    def update(self, history, n_done: int, force: bool = False) -> None:
+        """
+        Saves the history if the last checkpoint is older than the interval.
+
+        :param history: The history of the run.
+        :param n_done: The number of completed games or replications.
+        :param force: Whether to save regardless of the interval.
+        """
+        if not force and time.monotonic() - self.last_save < self.interval:
+            return
+
+        atomic_dump(
+            {
+                "meta": self.meta,
+                "n_target": self.n_target,
+                "n_done": n_done,
+                "history": history,
+            },
+            self.path,
+        )
+        self.last_save = time.monotonic()
+        logger.debug(
+            f"Checkpoint {n_done} of {self.n_target} to {self.path}",
+            extra=self.logstr,
+        )
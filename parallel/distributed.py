@@ -0,0 +1,453 @@
+"""
+Runs simulations on workers on any number of hosts.
+
+A coordinator splits every request into batches of item indices (game or
+replication numbers) and hands them out to workers that connect over TCP with
+multiprocessing.managers. A worker pulls a batch, runs it on the target and
+pushes the result back. Every handed out batch is leased: if no result comes
+back within the lease timeout (the worker died, the host went away) the batch
+is put back in the queue and given to the next worker. Results are returned in
+the order of the items, and since the simulators derive their random streams
+from (seed, index) the results do not depend on which worker ran which batch.
+
+The coordinator runs in its own process, started by the DistributedExecutor.
+Start workers with:
+
+    python -m parallel.distributed <host>:<port> --authkey <key>
+
+from the root of the repository, on every host that should take part. The
+coordinator and the workers exchange pickles, so anyone who knows the authkey
+can run code on them: the coordinator only listens on localhost unless told
+otherwise, and without an authkey it generates a random one and prints it.
+"""
+from collections import deque
+import argparse
+import hashlib
+import os
+import pickle
+import socket
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+from parallel.executor import _run_chunk, _worker_targets, split_chunks
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 50066
+
+# returned by Coordinator.get_batch when the workers should exit
+STOP = "stop"
+
+
+class Coordinator:
+    """
+    Keeps track of the targets, the queued and leased batches and the
+    results. Lives in the manager process, every method is called from the
+    connection thread of a client.
+    """
+
+    def __init__(self, lease_timeout: float):
+        """
+        :param lease_timeout: Seconds a worker has to return the result of a
+            batch before it is given to another worker.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        self.lease_timeout = lease_timeout
+        self.cond = threading.Condition()
+
+        self.targets = {}  # key -> pickled target
+        self.n_open = {}  # key -> number of batches not collected yet
+        self.batches = {}  # batch id -> (key, method, items)
+        self.pending = deque()  # batch ids waiting for a worker
+        self.leases = {}  # batch id -> (worker id, deadline)
+        self.results = {}  # batch id -> result
+        self.workers = set()
+        self.next_id = 0
+        self.n_requeued = 0
+        self.closed = False
+
+    def submit(self, key: str, payload: bytes, method: str, chunks: list):
+        """
+        Queues the chunks of one request as batches.
+
+        :param key: Hash of the pickled target.
+        :param payload: The pickled target.
+        :param method: Name of the method of the target that runs a chunk.
+        :param chunks: The chunks of items.
+        :return: List with the batch id of every chunk.
+        """
+        with self.cond:
+            if chunks:
+                self.targets[key] = payload
+                self.n_open[key] = self.n_open.get(key, 0) + len(chunks)
+            batch_ids = []
+            for chunk in chunks:
+                batch_id = self.next_id
+                self.next_id += 1
+                self.batches[batch_id] = (key, method, chunk)
+                self.pending.append(batch_id)
+                batch_ids.append(batch_id)
+            self.cond.notify_all()
+        return batch_ids
+
+    def get_batch(self, worker: str, wait: float):
+        """
+        Leases the next batch to a worker.
+
+        :param worker: Id of the worker.
+        :param wait: Seconds to wait for a batch if the queue is empty.
+        :return: (batch id, key, method, items), None if there was no work
+            or STOP if the coordinator is closing.
+        """
+        deadline = time.monotonic() + wait
+        with self.cond:
+            self.workers.add(worker)
+            while True:
+                if self.closed:
+                    return STOP
+                self.__requeue_expired()
+                if self.pending:
+                    batch_id = self.pending.popleft()
+                    self.leases[batch_id] = (
+                        worker,
+                        time.monotonic() + self.lease_timeout,
+                    )
+                    return (batch_id, *self.batches[batch_id])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.cond.wait(min(remaining, self.lease_timeout))
+
+    def get_target(self, key: str) -> bytes:
+        """
+        Returns a pickled target, workers fetch it once per target.
+
+        :param key: Hash of the pickled target.
+        :return: The pickled target, None if all its batches were collected.
+        """
+        with self.cond:
+            return self.targets.get(key)
+
+    def put_result(self, batch_id: int, result) -> None:
+        """
+        Stores the result of a batch. Late results of batches that were
+        already completed by another worker are dropped.
+
+        :param batch_id: The batch id.
+        :param result: The result of the batch.
+        """
+        with self.cond:
+            if batch_id not in self.batches or batch_id in self.results:
+                return
+            self.results[batch_id] = result
+            self.leases.pop(batch_id, None)
+            if batch_id in self.pending:
+                self.pending.remove(batch_id)
+            self.cond.notify_all()
+
+    def get_result(self, batch_id: int, wait: float) -> tuple:
+        """
+        Waits for and removes the result of a batch.
+
+        :param batch_id: The batch id.
+        :param wait: Seconds to wait for the result.
+        :return: (True, result) if the batch is done, (False, None) otherwise.
+        """
+        deadline = time.monotonic() + wait
+        with self.cond:
+            while batch_id not in self.results:
+                self.__requeue_expired()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return (False, None)
+                self.cond.wait(min(remaining, self.lease_timeout))
+
+            # drop the target once all its batches are collected
+            key = self.batches.pop(batch_id)[0]
+            self.n_open[key] -= 1
+            if self.n_open[key] == 0:
+                del self.n_open[key]
+                del self.targets[key]
+            return (True, self.results.pop(batch_id))
+
+    def get_info(self) -> dict:
+        """
+        Returns the state of the queue.
+
+        :return: Dictionary with the number of pending, leased and requeued
+            batches, the number of workers seen and of targets kept.
+        """
+        with self.cond:
+            return {
+                "n_pending": len(self.pending),
+                "n_leased": len(self.leases),
+                "n_requeued": self.n_requeued,
+                "n_workers": len(self.workers),
+                "n_targets": len(self.targets),
+            }
+
+    def close(self) -> None:
+        """
+        Tells all workers to exit.
+        """
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __requeue_expired(self) -> None:
+        """
+        Puts batches with an expired lease back at the front of the queue.
+        """
+        now = time.monotonic()
+        expired = [b for b, (_, t) in self.leases.items() if t < now]
+        for batch_id in sorted(expired, reverse=True):
+            worker, _ = self.leases.pop(batch_id)
+            self.pending.appendleft(batch_id)
+            self.n_requeued += 1
+            logger.warning(
+                f"Lease of batch {batch_id} on worker {worker} expired",
+                extra=self.logstr,
+            )
+        if expired:
+            self.cond.notify_all()
+
+
+# the coordinator of the manager process
+_coordinator = None
+
+
+def _init_coordinator(lease_timeout: float) -> None:
+    global _coordinator
+    _coordinator = Coordinator(lease_timeout)
+
+
+def _get_coordinator() -> Coordinator:
+    return _coordinator
+
+
+class CoordinatorManager(BaseManager):
+    pass
+
+
+CoordinatorManager.register("get_coordinator", callable=_get_coordinator)
+
+
+class DistributedExecutor:
+    """
+    Drop-in replacement of the Executor whose workers can run on other hosts.
+    Starts the coordinator on the given address, workers connect to it with
+    run_worker(). Use it as a context manager or call close() when done.
+    """
+
+    def __init__(
+        self,
+        address: tuple = ("127.0.0.1", DEFAULT_PORT),
+        authkey: bytes = None,
+        batch_size: int = 10,
+        lease_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+    ):
+        """
+        :param address: (host, port) the coordinator listens on, port 0 picks
+            a free port. Use ("", port) to accept workers of other hosts.
+        :param authkey: Shared secret of the coordinator and the workers, a
+            random key that is printed on start() if None.
+        :param batch_size: The number of items per batch.
+        :param lease_timeout: Seconds after which a batch without a result is
+            handed out again, must be longer than a batch takes.
+        :param poll_interval: Seconds between checks while waiting.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.address = address
+        self.authkey = authkey
+        self.print_authkey = authkey is None
+        if authkey is None:
+            self.authkey = os.urandom(16).hex().encode()
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.manager = None
+        self.coordinator = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("An Executor cannot be sent to another process.")
+
+    def start(self) -> None:
+        """
+        Starts the coordinator, if it is not running yet.
+        """
+        if self.manager is None:
+            self.manager = CoordinatorManager(
+                address=self.address, authkey=self.authkey
+            )
+            self.manager.start(
+                initializer=_init_coordinator, initargs=(self.lease_timeout,)
+            )
+            # with port 0 the manager reports the port it is bound to
+            self.address = self.manager.address
+            self.coordinator = self.manager.get_coordinator()
+            logger.debug(
+                f"Coordinator listening on {self.address}", extra=self.logstr
+            )
+            if self.print_authkey:
+                # the workers need the generated key, show it only once
+                key = self.authkey.decode()
+                print(f"Workers connect with --authkey {key}")
+                self.print_authkey = False
+
+    def close(self) -> None:
+        """
+        Tells the workers to exit and stops the coordinator.
+        """
+        if self.manager is not None:
+            self.coordinator.close()
+            # give the workers a moment to receive the stop message
+            time.sleep(min(self.poll_interval, 0.5))
+            self.coordinator = None
+            self.manager.shutdown()
+            self.manager = None
+
+    def get_info(self) -> dict:
+        """
+        Returns the state of the queue, see Coordinator.get_info().
+
+        :return: Dictionary with the state of the queue.
+        """
+        self.start()
+        return self.coordinator.get_info()
+
+    def imap(self, target, items, method: str = "_do_chunk"):
+        """
+        Queues target.<method>(batch) for batches of items and returns a
+        generator that yields the results batch by batch, in order. The
+        batches are queued before the first result is requested.
+
+        :param target: A picklable object, e.g. a simulator.
+        :param items: The items to process, e.g. range(n).
+        :param method: Name of the method that processes a list of items.
+        :return: Generator of (batch, result) tuples.
+        """
+        self.start()
+
+        payload = pickle.dumps(target, protocol=pickle.HIGHEST_PROTOCOL)
+        key = hashlib.sha1(payload).hexdigest()
+
+        items = list(items)
+        n_batches = -(-len(items) // self.batch_size)
+        chunks = split_chunks(items, n_batches) if items else []
+        batch_ids = self.coordinator.submit(key, payload, method, chunks)
+
+        return self.__collect(chunks, batch_ids)
+
+    def __collect(self, chunks: list, batch_ids: list):
+        for chunk, batch_id in zip(chunks, batch_ids):
+            done, result = False, None
+            while not done:
+                done, result = self.coordinator.get_result(
+                    batch_id, self.poll_interval
+                )
+            yield chunk, result
+
+
+def connect(address: tuple, authkey: bytes):
+    """
+    Connects to a coordinator.
+
+    :param address: (host, port) of the coordinator.
+    :param authkey: Shared secret of the coordinator and the workers.
+    :return: Proxy of the coordinator.
+    """
+    manager = CoordinatorManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    return manager.get_coordinator()
+
+
+def run_worker(
+    address: tuple,
+    authkey: bytes,
+    worker: str = None,
+    wait: float = 1.0,
+) -> int:
+    """
+    Pulls batches from a coordinator and runs them until the coordinator
+    closes or goes away.
+
+    :param address: (host, port) of the coordinator.
+    :param authkey: Shared secret of the coordinator and the workers.
+    :param worker: Id of the worker, defaults to host:pid.
+    :param wait: Seconds to wait for work in one request.
+    :return: The number of batches this worker ran.
+    """
+    logstr = {"className": ""}
+    if worker is None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    coordinator = connect(address, authkey)
+    n_batches = 0
+    try:
+        while True:
+            batch = coordinator.get_batch(worker, wait)
+            if batch is None:
+                continue
+            if batch == STOP:
+                break
+
+            batch_id, key, method, items = batch
+            payload = None
+            if key not in _worker_targets:
+                payload = coordinator.get_target(key)
+                if payload is None:
+                    # another worker already completed the batch
+                    continue
+            result = _run_chunk(key, payload, method, items)
+            coordinator.put_result(batch_id, result)
+            n_batches += 1
+    except (EOFError, ConnectionError):
+        logger.debug("Coordinator went away", extra=logstr)
+
+    logger.debug(f"Worker {worker} ran {n_batches} batches", extra=logstr)
+    return n_batches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a simulation worker that connects to a coordinator."
+    )
+    parser.add_argument("address", help="host:port of the coordinator")
+    parser.add_argument(
+        "--authkey", required=True, help="shared secret of the coordinator"
+    )
+    parser.add_argument(
+        "--processes", type=int, default=1, help="worker processes to start"
+    )
+    args = parser.parse_args()
+
+    host, port = args.address.rsplit(":", 1)
+    address = (host, int(port))
+    authkey = args.authkey.encode()
+
+    if args.processes == 1:
+        run_worker(address, authkey)
+    else:
+        import multiprocessing as mp
+
+        processes = [
+            mp.Process(target=run_worker, args=(address, authkey))
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
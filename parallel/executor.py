@@ -0,0 +1,142 @@
+"""
+A long-lived process pool that is shared by the simulators.
+
+Creating a multiprocessing pool for every run() means every worker has to
+start, import numpy/scipy and unpickle the simulator again. The Executor
+creates its pool once and keeps it alive across runs. Every task carries the
+pickled target, but a worker only unpickles it the first time it sees it:
+targets are cached per worker, keyed by a hash of their pickled state. As
+long as the configuration of a simulator does not change, its strategies,
+distributions etc. stay initialized in the workers between runs.
+"""
+from collections import OrderedDict
+import hashlib
+import multiprocessing as mp
+import pickle
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# per worker cache of unpickled targets, key -> target
+_worker_targets = OrderedDict()
+MAX_CACHED_TARGETS = 4
+
+
+def _run_chunk(key: str, payload: bytes, method: str, items: list):
+    """
+    Runs one chunk of items on the (cached) target inside a worker.
+
+    :param key: Hash of the pickled target.
+    :param payload: The pickled target.
+    :param method: Name of the method of the target to call with the chunk.
+    :param items: The chunk of items.
+    :return: The return value of the method.
+    """
+    target = _worker_targets.get(key)
+    if target is None:
+        target = pickle.loads(payload)
+        _worker_targets[key] = target
+        if len(_worker_targets) > MAX_CACHED_TARGETS:
+            _worker_targets.popitem(last=False)
+    else:
+        _worker_targets.move_to_end(key)
+
+    return getattr(target, method)(items)
+
+
+def split_chunks(items: list, n_chunks: int) -> list:
+    """
+    Splits items into at most n_chunks contiguous chunks of similar size.
+
+    :param items: The items to split.
+    :param n_chunks: The maximum number of chunks.
+    :return: List of chunks.
+    """
+    items = list(items)
+    n_chunks = max(1, min(n_chunks, len(items)))
+    size, rest = divmod(len(items), n_chunks)
+
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        stop = start + size + int(i < rest)
+        chunks.append(items[start:stop])
+        start = stop
+    return chunks
+
+
+class Executor:
+    """
+    Owns a pool of warm worker processes that accepts successive run
+    requests. Use it as a context manager or call close() when done.
+    """
+
+    def __init__(self, n_jobs: int, chunks_per_job: int = 4):
+        """
+        :param n_jobs: The number of worker processes.
+        :param chunks_per_job: Number of chunks per worker a request is split
+            into, more chunks balance the load better.
+        """
+        self.logstr = {"className": self.__class__.__name__}
+        if n_jobs < 1:
+            raise ValueError("n_jobs must be at least 1.")
+        self.n_jobs = n_jobs
+        self.chunks_per_job = chunks_per_job
+        self.pool = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("An Executor cannot be sent to another process.")
+
+    def start(self) -> None:
+        """
+        Starts the worker processes, if they are not running yet.
+        """
+        if self.pool is None:
+            logger.debug(
+                f"Starting pool with {self.n_jobs} workers", extra=self.logstr
+            )
+            self.pool = mp.Pool(processes=self.n_jobs)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def imap(self, target, items, method: str = "_do_chunk"):
+        """
+        Calls target.<method>(chunk) in the workers for contiguous chunks of
+        items and yields the results chunk by chunk, in order.
+
+        :param target: A picklable object, e.g. a simulator.
+        :param items: The items to process, e.g. range(n).
+        :param method: Name of the method that processes a list of items.
+        :return: Generator of (chunk, result) tuples.
+        """
+        self.start()
+
+        payload = pickle.dumps(target, protocol=pickle.HIGHEST_PROTOCOL)
+        key = hashlib.sha1(payload).hexdigest()
+
+        chunks = split_chunks(items, self.n_jobs * self.chunks_per_job)
+        tasks = [(key, payload, method, chunk) for chunk in chunks]
+
+        for chunk, result in zip(
+            chunks, self.pool.imap(_star_run_chunk, tasks)
+        ):
+            yield chunk, result
+
+
+def _star_run_chunk(args: tuple):
+    return _run_chunk(*args)
@@ -0,0 +1,134 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_1.bootstrap import (
+    Bootstrap,
+    Proportion,
+    bootstrap,
+    compress,
+)
+from parallel.executor import Executor
+
+import assignment_1.constants as c
+
+
+def mean_rounds_of(weights: np.ndarray, results, rounds) -> np.ndarray:
+    """
+    Mean number of rounds of the games white won.
+    """
+    won = results == c.GameStates.WHITE_WON.value
+    return weights @ (rounds * won) / (weights @ won)
+
+
+class TestBootstrap:
+    @pytest.fixture(autouse=True)
+    def create_results(self):
+        """
+        Creates random game results and rounds.
+        """
+        rng = np.random.default_rng(1)
+        results = rng.choice([1, 2, 3], size=2000, p=[0.4, 0.35, 0.25])
+        rounds = rng.integers(5, 60, size=2000)
+        return results, rounds
+
+    def test_compress(self, create_results):
+        """
+        Tests if compressed columns give the same statistic.
+        """
+        results, rounds = create_results
+        values, counts = compress(results, rounds)
+        assert counts.sum() == len(results)
+        assert len(values[0]) == len(counts) < len(results)
+
+        weights = counts[np.newaxis, :]
+        won = results == 1
+        expected = rounds[won].mean()
+        assert np.isclose(mean_rounds_of(weights, *values)[0], expected)
+
+    def test_matches_index_resampling(self, create_results):
+        """
+        Tests if the count resamples have the spread of index resamples.
+        """
+        results, _ = create_results
+        white_won = (results == 1).astype(float)
+
+        rng = np.random.default_rng(2)
+        idx = rng.integers(0, len(white_won), size=(4000, len(white_won)))
+        expected = white_won[idx].mean(axis=1).std()
+
+        boot = Bootstrap(n_resamples=4000, seed=2)
+        distribution = boot.resample(white_won)
+        assert len(distribution) == 4000
+        assert np.isclose(distribution.std(), expected, rtol=0.1)
+        assert np.isclose(distribution.mean(), white_won.mean(), atol=0.005)
+
+    def test_chunks_and_seed(self, create_results):
+        """
+        Tests if small chunks and a process pool give the same resamples
+        for the same seed.
+        """
+        results, rounds = create_results
+        boot = Bootstrap(n_resamples=500, max_elements=5000, seed=3)
+        reference = boot.resample(results, rounds, statistic=mean_rounds_of)
+
+        with Executor(n_jobs=2) as executor:
+            boot.executor = executor
+            parallel = boot.resample(
+                results, rounds, statistic=mean_rounds_of
+            )
+        assert (reference == parallel).all()
+
+        other = Bootstrap(n_resamples=500, max_elements=5000, seed=4)
+        assert (
+            reference
+            != other.resample(results, rounds, statistic=mean_rounds_of)
+        ).any()
+
+    def test_intervals(self, create_results):
+        """
+        Tests if percentile and BCa intervals contain the estimate and have
+        about the width of a normal interval.
+        """
+        results, _ = create_results
+        white = Proportion(c.GameStates.WHITE_WON.value)
+        for method in ("percentile", "bca"):
+            stats = bootstrap(results, statistic=white, seed=5, method=method)
+            low, high = stats[f"{method}_ci_95"]
+            assert low < stats["estimate"] < high
+            assert np.isclose(stats["estimate"], np.mean(results == 1))
+            assert high - low == pytest.approx(
+                2 * 1.96 * stats["bootstrap_std"], rel=0.1
+            )
+
+        with pytest.raises(ValueError):
+            bootstrap(results, method="normal")
+
+    def test_million_games(self):
+        """
+        Tests if a BCa interval over a million games agrees with the normal
+        approximation of the mean, see benchmark.py for the timing.
+        """
+        rng = np.random.default_rng(6)
+        results = rng.choice([1, 2, 3], size=1_000_000)
+        rounds = rng.integers(1, 200, size=1_000_000)
+
+        stats = bootstrap(
+            results,
+            rounds,
+            statistic=mean_rounds_of,
+            method="bca",
+            seed=6,
+        )
+        won = rounds[results == c.GameStates.WHITE_WON.value]
+        std = np.std(won, ddof=1) / np.sqrt(len(won))
+        assert stats["estimate"] == pytest.approx(np.mean(won), abs=1e-4)
+        assert stats["bootstrap_std"] == pytest.approx(std, rel=0.05)
+        low, high = stats["bca_ci_95"]
+        assert low < stats["estimate"] < high
+        assert high - low == pytest.approx(2 * 1.96 * std, rel=0.05)
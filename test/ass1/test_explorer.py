@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_1.explorer import PositionCounter, PositionIndex
+from assignment_1.game_state import GameState
+from assignment_1.simulator import ChessSimulator
+from assignment_1.strategy import RandomStrategy
+
+import assignment_1.constants as c
+
+
+def make_simulator(**kwargs) -> ChessSimulator:
+    """
+    Creates a seeded simulator of random games that counts positions.
+    """
+    return ChessSimulator(
+        black_strat=RandomStrategy(player=c.Players.BLACK),
+        white_strat=RandomStrategy(player=c.Players.WHITE),
+        seed=11,
+        count_positions=True,
+        **kwargs,
+    )
+
+
+@pytest.fixture(scope="module")
+def create_history():
+    """
+    Plays a few seeded games and returns their history.
+    """
+    simulator = make_simulator()
+    simulator.run(n=6)
+    return simulator.get_game_history()
+
+
+class TestExplorer:
+    def test_counts(self, create_history):
+        """
+        Tests if every game visits the initial position once and if the
+        outcomes of the initial position are the outcomes of all games.
+        """
+        history = create_history
+        counter = history.get_position_counter()
+        table = counter.get_table()
+        assert counter.n_games == 6
+        assert table["visits"].sum() == history.accumulator.rounds_sum + 6
+
+        index = PositionIndex(table)
+        stats = index.get_position_stats(GameState(), ply=0)
+        outcomes = history.get_outcome_counts()
+        assert stats["visits"] == 6
+        assert stats["plies"] == [0]
+        assert stats["white_won"] == outcomes[c.GameStates.WHITE_WON]
+        assert stats["black_won"] == outcomes[c.GameStates.BLACK_WON]
+        assert stats["draw"] == outcomes[c.GameStates.DRAW]
+
+    def test_merge(self, create_history):
+        """
+        Tests if counters of separate runs and of a worker pool merge to the
+        counter of one run.
+        """
+        expected = create_history.get_position_counter().get_table()
+
+        simulator = make_simulator()
+        simulator.run(n=2)
+        simulator.run(n=4)
+        merged = simulator.get_game_history().get_position_counter()
+        assert (merged.get_table() == expected).all()
+
+        simulator = make_simulator(parallelize=True, n_jobs=2)
+        simulator.run(n=6)
+        pooled = simulator.get_game_history().get_position_counter()
+        assert (pooled.get_table() == expected).all()
+
+        halves = PositionCounter(flush_size=1)
+        halves.merge(merged).merge(PositionCounter())
+        assert (halves.get_table() == expected).all()
+
+    def test_save_and_lookup(self, create_history, tmp_path):
+        """
+        Tests if a saved table is memory-mapped and searchable.
+        """
+        counter = create_history.get_position_counter()
+        path = tmp_path / "positions.npy"
+        counter.save(str(path))
+
+        index = PositionIndex(str(path))
+        assert isinstance(index.table, np.memmap)
+        assert len(index) == len(counter.get_table())
+
+        row = counter.get_table()[len(index) // 2]
+        rows = index.lookup(int(row["hash"]))
+        assert row in rows
+        assert len(index.lookup(0)) == 0
+
+        top = index.get_most_visited(k=3)
+        assert top["visits"][0] == counter.get_table()["visits"].max()
+
+        with pytest.raises(ValueError):
+            PositionIndex(np.zeros(3))
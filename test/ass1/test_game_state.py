@@ -91,3 +91,68 @@ class TestClientGameState:
             player=c.Players.WHITE
         )
         assert king_in_check is True
+
+    def put_pieces(self, board: ChessBoard, pieces: list) -> None:
+        """
+        Puts pieces on their initial positions on an empty board.
+        """
+        for piece in pieces:
+            board.put_new_piece_on_board(
+                piece,
+                position=piece.get_position(),
+                overwrite=True,
+                ignore_pos_check=True,
+            )
+
+    def test_game_state_has_legal_move_mate(
+        self, create_empty_board, create_game_state
+    ):
+        """
+        Tests if checkmate and stalemate leave no legal move.
+        """
+        self.put_pieces(
+            create_empty_board,
+            [
+                King(c.Players.WHITE, init_pos=np.array([4, 0])),
+                King(c.Players.BLACK, init_pos=np.array([0, 4])),
+                Rook(c.Players.BLACK, init_pos=np.array([3, 4])),
+                Rook(c.Players.BLACK, init_pos=np.array([0, 1])),
+            ],
+        )
+        create_game_state.chess_board = create_empty_board
+
+        # stalemate: not in check, but every king move is attacked
+        assert not create_game_state.king_is_in_check(c.Players.WHITE)
+        assert not create_game_state.has_legal_move(c.Players.WHITE)
+        assert len(create_game_state.get_valid_moves(c.Players.WHITE)) == 0
+        assert create_game_state.has_legal_move(c.Players.BLACK)
+
+        # checkmate
+        self.put_pieces(
+            create_empty_board,
+            [Rook(c.Players.BLACK, init_pos=np.array([4, 3]))],
+        )
+        assert create_game_state.king_is_in_check(c.Players.WHITE)
+        assert not create_game_state.has_legal_move(
+            c.Players.WHITE, use_cache=False
+        )
+
+    def test_game_state_has_legal_move_random_games(self):
+        """
+        Tests if has_legal_move agrees with get_valid_moves in every
+        position of a few random games.
+        """
+        rng = np.random.default_rng(3)
+        for _ in range(3):
+            game_state = GameState()
+            while game_state.get_round_number() < 200:
+                game_state.increment_round_number()
+                player = game_state.get_current_player()
+                moves = game_state.get_valid_moves(player)
+                assert game_state.has_legal_move(player) == (len(moves) > 0)
+                assert game_state.has_legal_move(player, use_cache=False) == (
+                    len(moves) > 0
+                )
+                if len(moves) == 0:
+                    break
+                game_state.start_new_round(moves[rng.integers(len(moves))])
@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import assignment_1.constants as c
+import assignment_1.moves as mv
+from assignment_1.game_state import GameState
+
+
+class TestMoves:
+    @pytest.fixture(autouse=True)
+    def create_game_state(self):
+        """
+        Creates a game state object.
+        """
+        return GameState()
+
+    def test_encode_decode(self):
+        """
+        Tests if moves survive an encode/decode round trip.
+        """
+        moves = np.array([[3, 0, 2, 0], [4, 1, 2, 2], [1, 4, 0, 4]])
+        codes = mv.encode_moves(moves, np.array([False, False, True]))
+        assert codes[0] == 15 * mv.N_SQUARES + 10
+        assert (mv.decode_moves(codes) == moves).all()
+        assert not mv.is_promotion(codes[0])
+        assert mv.is_promotion(codes[2])
+        assert (mv.decode_move(mv.encode_move(moves[1])) == moves[1]).all()
+
+    def test_as_move_array(self):
+        """
+        Tests if all move representations are accepted.
+        """
+        move = np.array([3, 0, 2, 0])
+        assert (mv.as_move_array(mv.encode_move(move)) == move).all()
+        assert (mv.as_move_array(move.reshape(1, 4)) == move).all()
+        with pytest.raises(ValueError):
+            mv.as_move_array(np.zeros(3))
+
+    def test_encoded_valid_moves(self, create_game_state):
+        """
+        Tests if encoded valid moves match the array valid moves.
+        """
+        moves = create_game_state.get_valid_moves(c.Players.WHITE)
+        codes = create_game_state.get_valid_moves(
+            c.Players.WHITE, encoded=True
+        )
+        assert len(codes) == len(moves) > 0
+        assert (mv.decode_moves(codes) == moves).all()
+
+    def test_start_new_round_code(self, create_game_state):
+        """
+        Tests if a move code can be played.
+        """
+        create_game_state.increment_round_number()
+        create_game_state.start_new_round(mv.encode_move([3, 0, 2, 0]))
+        board = create_game_state.get_board()
+        assert board.get_piece(np.array([2, 0])) is not None
+        assert board.get_piece(np.array([3, 0])) is None
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_1.paired import PairedComparison, paired_difference
+from assignment_1.simulator import ChessSimulator
+from assignment_1.strategy import RandomStrategy
+
+import assignment_1.constants as c
+
+
+class TestPairedComparison:
+    @pytest.fixture(autouse=True)
+    def create_comparison(self):
+        """
+        Creates a mirrored paired comparison of two identical strategies.
+        """
+        return PairedComparison(
+            strat_a_factory=RandomStrategy,
+            strat_b_factory=RandomStrategy,
+            opponent_factory=RandomStrategy,
+            seed=42,
+            mirror=True,
+        )
+
+    def test_seeded_simulator_reproducible(self):
+        """
+        Tests if two simulators with the same seed play the same games.
+        """
+        results = []
+        for _ in range(2):
+            simulator = ChessSimulator(
+                black_strat=RandomStrategy(player=c.Players.BLACK),
+                white_strat=RandomStrategy(player=c.Players.WHITE),
+                seed=7,
+            )
+            simulator.run(n=2)
+            history = simulator.get_game_history()
+            results.append(history.accumulator.get_rounds())
+        assert (results[0] == results[1]).all()
+
+    def test_paired_identical_strategies(self, create_comparison):
+        """
+        Tests if identical strategies with common random numbers give a
+        zero score difference in every pair.
+        """
+        create_comparison.run(n=2)
+        assert len(create_comparison.simulators) == 4
+
+        statistics = create_comparison.get_statistics()
+        assert statistics["n_pairs"] == 2
+        assert statistics["diff_mean"] == 0
+        assert statistics["diff_std"] == 0
+
+    def test_paired_difference(self):
+        """
+        Tests the paired-difference estimator on known data.
+        """
+        x = np.array([1.0, 0.5, 1.0, 0.0])
+        y = np.array([0.5, 0.5, 1.0, 0.0])
+        statistics = paired_difference(x, y, 0.95)
+        assert statistics["diff_mean"] == 0.125
+        low, up = statistics["diff_normal_ci_95"]
+        assert low < 0.125 < up
+        assert statistics["variance_reduction"] > 1
@@ -204,3 +204,45 @@ class TestClientPieces:
         empty_board = create_empty_board.get_board_arr()
         valid_moves_piece = pawn_black.get_piece_moves(empty_board)
         assert (valid_moves_piece == np.array([[2, 2, 3, 2]])).all()
+
+    def test_filter_moves_blocked_ray(self, create_empty_board):
+        """
+        Tests if sliding pieces cannot jump over pieces on their ray.
+        """
+        rook = Rook(c.Players.WHITE, init_pos=np.array([4, 0]))
+        blocker = Pawn(c.Players.BLACK, init_pos=np.array([2, 0]))
+        for piece in (rook, blocker):
+            create_empty_board.put_new_piece_on_board(
+                piece,
+                position=piece.get_position(),
+                ignore_pos_check=True,
+            )
+        board = create_empty_board.get_board_arr()
+        targets = {tuple(m[2:4]) for m in rook.get_piece_moves(board)}
+
+        # the black pawn can be captured, the squares behind it are blocked
+        assert (3, 0) in targets and (2, 0) in targets
+        assert (1, 0) not in targets and (0, 0) not in targets
+        assert {(4, 1), (4, 2), (4, 3), (4, 4)} <= targets
+
+        # without column switches only the vertical moves remain
+        rook.column_switch = False
+        targets = {tuple(m[2:4]) for m in rook.get_piece_moves(board)}
+        assert targets == {(3, 0), (2, 0)}
+
+    def test_filter_moves_pawn_leap(self, create_empty_board):
+        """
+        Tests if a two-step pawn move cannot leap over a piece.
+        """
+        pawn = Pawn(
+            c.Players.WHITE, init_pos=np.array([3, 2]), extra_step=True
+        )
+        blocker = Knight(c.Players.BLACK, init_pos=np.array([2, 2]))
+        for piece in (pawn, blocker):
+            create_empty_board.put_new_piece_on_board(
+                piece,
+                position=piece.get_position(),
+                ignore_pos_check=True,
+            )
+        board = create_empty_board.get_board_arr()
+        assert len(pawn.get_piece_moves(board)) == 0
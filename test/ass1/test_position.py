@@ -0,0 +1,114 @@
+import pytest
+import copy
+import random
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import assignment_1.constants as c
+import assignment_1.position as pos
+from assignment_1.game_state import GameState
+
+
+def play_random_moves(game_state: GameState, n: int, seed: int) -> None:
+    """
+    Plays n random moves for both players.
+    """
+    rng = random.Random(seed)
+    for _ in range(n):
+        game_state.increment_round_number()
+        moves = game_state.get_valid_moves(game_state.get_current_player())
+        game_state.start_new_round(moves[rng.randrange(len(moves))])
+
+
+def transformed(game_state: GameState, transform: int) -> GameState:
+    """
+    Returns a copy of the game state with the pieces moved by a symmetry.
+    """
+    new = copy.deepcopy(game_state)
+    board = new.get_board()
+    size = board.board_size
+    old = board.board.copy()
+    board.board[:, :] = None
+    for i in range(size):
+        for j in range(size):
+            piece = old[i, j]
+            if piece is None:
+                continue
+            row, col = i, j
+            if transform & pos.MIRROR:
+                col = size - 1 - j
+            if transform & pos.COLOUR:
+                row = size - 1 - i
+                piece.player = c.Players(1 - piece.player.value)
+            piece.position = np.array([row, col])
+            board.board[row, col] = piece
+    return new
+
+
+def as_set(moves: np.ndarray) -> set:
+    return {tuple(move) for move in moves}
+
+
+class TestPosition:
+    @pytest.fixture()
+    def create_game_state(self):
+        """
+        Creates a midgame position.
+        """
+        game_state = GameState()
+        play_random_moves(game_state, 6, seed=4)
+        return game_state
+
+    @pytest.mark.parametrize(
+        "transform", [pos.MIRROR, pos.COLOUR, pos.MIRROR | pos.COLOUR]
+    )
+    def test_symmetric_positions(self, create_game_state, transform):
+        """
+        Tests if symmetric positions get the same key and the same moves up
+        to the transform.
+        """
+        player = c.Players.WHITE
+        other = transformed(create_game_state, transform)
+        other_player = player
+        if transform & pos.COLOUR:
+            other_player = c.Players.BLACK
+
+        key, _ = create_game_state.get_position_key(player)
+        other_key, _ = other.get_position_key(other_player)
+        assert key == other_key
+
+        moves = create_game_state.get_valid_moves(player)
+        other_moves = other.get_valid_moves(other_player)
+        assert as_set(pos.transform_moves(moves, transform)) == as_set(
+            other_moves
+        )
+
+    def test_distinct_positions(self, create_game_state):
+        """
+        Tests if the player to move and column switches are part of the key.
+        """
+        white_key, _ = create_game_state.get_position_key(c.Players.WHITE)
+        black_key, _ = create_game_state.get_position_key(c.Players.BLACK)
+        assert white_key != black_key
+
+        other = copy.deepcopy(create_game_state)
+        piece = other.get_board().get_all_pieces(c.Players.WHITE)[0]
+        piece.increment_column_switch_count()
+        assert other.get_position_key(c.Players.WHITE)[0] != white_key
+
+    def test_canonical_transform(self, create_game_state):
+        """
+        Tests if the returned transform maps the position to the canonical.
+        """
+        key, transform = create_game_state.get_position_key(c.Players.WHITE)
+        canonical = transformed(create_game_state, transform)
+        player = c.Players.WHITE
+        if transform & pos.COLOUR:
+            player = c.Players.BLACK
+        assert canonical.get_position_key(player, (pos.IDENTITY,))[0] == key
+        assert pos.position_hash(key) == pos.position_hash(key)
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 
 # to enable parent directory imports
 import sys
@@ -6,7 +7,7 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from assignment_1.simulator import ChessSimulator
+from assignment_1.simulator import ChessSimulator, GameStatsAccumulator
 from assignment_1.board import ChessBoard
 from assignment_1.strategy import RandomStrategy
 
@@ -44,3 +45,73 @@ class TestSimulator:
         """
         create_simulator.run(n=1)
         assert create_simulator.game_history.get_number_of_games_played() == 1
+
+    def test_simulator_keep_game_runs(self):
+        """
+        Tests if final game states are only kept on request.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            keep_game_runs=True,
+        )
+        simulator.run(n=1)
+        assert len(simulator.game_history.get_game_runs()) == 1
+
+    def test_accumulator_merge(self, create_simulator):
+        """
+        Tests if merged accumulators give the same statistics as one
+        accumulator that saw all games.
+        """
+        game_runs = create_simulator._do_chunk([0, 1, 2]).get_results()
+        assert len(game_runs) == 3
+
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            keep_game_runs=True,
+        )
+        states = simulator._do_chunk([0, 1, 2])
+
+        total = GameStatsAccumulator()
+        parts = [GameStatsAccumulator() for _ in states]
+        for state, part in zip(states, parts):
+            total.add(state)
+            part.add(state)
+        merged = parts[0].merge(parts[1].merge(parts[2]))
+
+        stats_total = total.get_statistics()
+        stats_merged = merged.get_statistics()
+        for key in stats_total:
+            assert (
+                np.asarray(stats_total[key]) == np.asarray(stats_merged[key])
+            ).all()
+
+    def test_promotions_per_match(self):
+        """
+        Tests if the queen promotions of every game are kept as a column
+        without keeping the final game states.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            keep_game_runs=True,
+        )
+        states = simulator._do_chunk([0, 1, 2])
+        accumulator = GameStatsAccumulator()
+        for state in states:
+            accumulator.add(state)
+
+        promotions = accumulator.get_statistics()["promotions_per_match"]
+        assert promotions.tolist() == [
+            state.get_board().n_queen_promotions for state in states
+        ]
+
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+        )
+        simulator.run(n=3)
+        history = simulator.game_history
+        assert len(history.get_promotions()) == 3
+        assert history.get_game_runs() == []
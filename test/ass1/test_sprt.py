@@ -0,0 +1,134 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_1.simulator import ChessSimulator
+from assignment_1.sprt import SPRT
+from assignment_1.strategy import RandomStrategy
+
+import assignment_1.constants as c
+
+
+class TestSPRT:
+    @pytest.fixture(autouse=True)
+    def create_sprt(self):
+        """
+        Creates a SPRT on top of a chess simulator.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+        )
+        return SPRT(simulator, player=c.Players.WHITE, elo0=0, elo1=50)
+
+    def test_sprt_invalid_hypotheses(self, create_sprt):
+        """
+        Tests if we get a value error if elo1 <= elo0.
+        """
+        with pytest.raises(ValueError):
+            SPRT(create_sprt.simulator, elo0=10, elo1=0)
+
+    def test_sprt_decision(self, create_sprt):
+        """
+        Tests if clear-cut results accept the right hypothesis.
+        """
+        assert create_sprt.get_decision() is None
+
+        create_sprt.add_results(
+            {c.GameStates.WHITE_WON: 300, c.GameStates.DRAW: 100}
+        )
+        create_sprt.add_results({c.GameStates.BLACK_WON: 100})
+        assert create_sprt.get_llr() > create_sprt.upper_bound
+        assert create_sprt.get_decision() == "H1"
+
+        sprt_black = SPRT(
+            create_sprt.simulator, player=c.Players.BLACK, elo0=0, elo1=50
+        )
+        sprt_black.add_results(
+            {c.GameStates.WHITE_WON: 300, c.GameStates.BLACK_WON: 100}
+        )
+        assert sprt_black.get_decision() == "H0"
+
+    def test_sprt_all_same_outcome(self, create_sprt):
+        """
+        Tests if a strategy that wins or loses every game gets a decision.
+        """
+        create_sprt.add_results({c.GameStates.WHITE_WON: 50})
+        assert create_sprt.get_llr() > create_sprt.upper_bound
+        assert create_sprt.get_decision() == "H1"
+
+        sprt_lost = SPRT(
+            create_sprt.simulator, player=c.Players.WHITE, elo0=0, elo1=50
+        )
+        sprt_lost.add_results({c.GameStates.BLACK_WON: 50})
+        assert sprt_lost.get_llr() < sprt_lost.lower_bound
+        assert sprt_lost.get_decision() == "H0"
+
+        # a single game does not decide the test
+        sprt_one = SPRT(
+            create_sprt.simulator, player=c.Players.WHITE, elo0=0, elo1=50
+        )
+        sprt_one.add_results({c.GameStates.WHITE_WON: 1})
+        assert sprt_one.get_decision() is None
+
+    def test_sprt_run(self):
+        """
+        Tests if a seeded test stops at the first batch that accepts a
+        hypothesis and if the batches continue the game numbering.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            seed=2,
+        )
+        sprt = SPRT(
+            simulator,
+            player=c.Players.WHITE,
+            elo0=-100,
+            elo1=100,
+            alpha=0.1,
+            beta=0.1,
+        )
+        result = sprt.run(batch_size=4, max_games=24)
+        assert result["decision"] == "H1"
+        assert result["games_played"] == 8
+        assert (result["wins"], result["draws"], result["losses"]) == (3, 5, 0)
+
+        # the second batch played games 4 to 7, not games 0 to 3 again
+        reference = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            seed=2,
+        )
+        reference.run(8)
+        assert np.array_equal(
+            simulator.get_game_history().get_results(),
+            reference.get_game_history().get_results(),
+        )
+
+    def test_sprt_max_games(self):
+        """
+        Tests if the test stops after max_games games without a decision.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(player=c.Players.BLACK),
+            white_strat=RandomStrategy(player=c.Players.WHITE),
+            seed=2,
+        )
+        sprt = SPRT(
+            simulator,
+            player=c.Players.WHITE,
+            elo0=0,
+            elo1=100,
+            alpha=0.1,
+            beta=0.1,
+        )
+        result = sprt.run(batch_size=4, max_games=8)
+        assert result["decision"] is None
+        assert result["games_played"] == 8
+        assert simulator.get_game_history().get_number_of_games_played() == 8
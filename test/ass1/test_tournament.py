@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+from functools import partial
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_1.tournament import Tournament
+from assignment_1.strategy import RandomStrategy
+from parallel.executor import Executor
+
+
+class TestTournament:
+    @pytest.fixture(autouse=True)
+    def create_tournament(self):
+        """
+        Creates a tournament between two random strategies.
+        """
+        return Tournament(
+            strategy_factories=[
+                RandomStrategy,
+                partial(RandomStrategy, allow_two_step_pawn=True),
+            ],
+            names=["random", "random_two_step"],
+        )
+
+    def test_tournament_init(self, create_tournament):
+        """
+        Tests if both colours are scheduled for every pair.
+        """
+        assert create_tournament.pairings == [(0, 1), (1, 0)]
+        assert create_tournament.games_played == 0
+
+    def test_tournament_run(self, create_tournament):
+        """
+        Tests if every scheduled game ends up in the tallies.
+        """
+        create_tournament.run(n_games=1)
+        assert create_tournament.games_played == 2
+
+        wins_a, draws, wins_b = create_tournament.get_tallies()[
+            ("random", "random_two_step")
+        ]
+        assert wins_a + draws + wins_b == 2
+
+        ratings = create_tournament.get_ratings()
+        assert ratings["random"]["games_played"] == 2
+        assert ratings["random"]["elo"] == -ratings["random_two_step"]["elo"]
+
+    def test_tournament_executor(self):
+        """
+        Tests if an executor that is given is used without parallelize=True.
+        """
+        executor = Executor(n_jobs=1)
+        calls = []
+        imap = executor.imap
+        executor.imap = lambda *args: calls.append(args) or imap(*args)
+        tournament = Tournament(
+            strategy_factories=[RandomStrategy, RandomStrategy],
+            executor=executor,
+        )
+        tournament.run(n_games=1)
+        executor.close()
+
+        assert len(calls) == 1
+        assert tournament.games_played == 2
+
+    def test_tournament_ratings(self, create_tournament):
+        """
+        Tests the Bradley-Terry fit on known tallies: a 75% score
+        corresponds to an Elo difference of about 191.
+        """
+        create_tournament.wins = np.array([[0, 75], [25, 0]])
+        ratings = create_tournament.get_ratings(prior_draws=0)
+        diff = ratings["random"]["elo"] - ratings["random_two_step"]["elo"]
+        assert diff == pytest.approx(190.8, abs=0.2)
+
+        low, up = ratings["random"]["elo_normal_ci_95"]
+        assert low < ratings["random"]["elo"] < up
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import assignment_1.constants as c
+import assignment_1.moves as mv
+import assignment_1.pieces as p
+from assignment_1.board import ChessBoard
+from assignment_1.simulator import ChessSimulator
+from assignment_1.strategy import RandomStrategy
+from assignment_1.variant import Variant, get_variant, make_pieces
+
+
+class TestVariant:
+    def test_default_setup(self):
+        """
+        Tests if the generated 5x5 setup equals the baby chess setup.
+        """
+        pieces = make_pieces(5)
+        for player in c.Players:
+            generated = {
+                (piece["type"], tuple(piece["pos"]))
+                for piece in pieces[player].values()
+            }
+            expected = {
+                (piece["type"], tuple(piece["pos"]))
+                for piece in c.PIECES[player].values()
+            }
+            assert generated == expected
+
+    @pytest.mark.parametrize("size", [6, 8])
+    def test_board_setup(self, size):
+        """
+        Tests if larger boards get a full back rank and row of pawns.
+        """
+        board = ChessBoard(variant=get_variant(size))
+        assert board.get_board_arr().shape == (size, size)
+        for player in c.Players:
+            pieces = board.get_all_pieces(player)
+            assert len(pieces) == 2 * size
+            assert all(piece.board_size == size for piece in pieces)
+        with pytest.raises(ValueError):
+            make_pieces(7)
+
+    def test_promotion_row(self):
+        """
+        Tests if pawns promote on the last row of an 8x8 board only.
+        """
+        board = ChessBoard(init_pieces=False, variant=get_variant(8))
+        pawn = p.Pawn(c.Players.BLACK, board_size=8)
+        board.put_new_piece_on_board(pawn, np.array([6, 2]))
+        board.move_piece(np.array([6, 2]), np.array([7, 2]), c.Players.BLACK)
+        assert board.get_piece(np.array([7, 2])).get_name() == "Queen"
+
+        pawn = p.Pawn(c.Players.BLACK, board_size=8)
+        board.put_new_piece_on_board(pawn, np.array([3, 4]))
+        board.move_piece(np.array([3, 4]), np.array([4, 4]), c.Players.BLACK)
+        assert board.get_piece(np.array([4, 4])).get_name() == "Pawn"
+
+    def test_move_table(self):
+        """
+        Tests if the cached candidates equal freshly generated candidates.
+        """
+        for size in (5, 8):
+            queen = p.Queen(c.Players.WHITE, np.array([2, 3]), board_size=size)
+            table_moves = queen.get_move_candidates()
+            assert np.array_equal(
+                table_moves, queen._generate_move_candidates()
+            )
+            assert not table_moves.flags.writeable
+
+    def test_move_codes(self):
+        """
+        Tests if move codes round trip on an 8x8 board.
+        """
+        moves = np.array([[6, 0, 5, 0], [7, 7, 0, 0]])
+        codes = mv.encode_moves(moves, np.array([False, True]), board_size=8)
+        assert (mv.decode_moves(codes, board_size=8) == moves).all()
+        assert mv.is_promotion(codes[1], board_size=8)
+
+    def test_game(self):
+        """
+        Tests if a game can be played on a 6x6 board.
+        """
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(c.Players.BLACK),
+            white_strat=RandomStrategy(c.Players.WHITE),
+            seed=0,
+            variant=Variant(6),
+        )
+        simulator.run(1)
+        assert simulator.get_game_history().get_number_of_games_played() == 1
@@ -0,0 +1,66 @@
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_2.simulator import QueueSimulator
+import assignment_2.analysis as analysis
+
+
+class TestAnalysis:
+    @pytest.fixture(autouse=True)
+    def create_history(self):
+        """
+        Runs seeded replications that only return summaries.
+        """
+        simulator = QueueSimulator(seed=1)
+        simulator.run(n=2)
+        yield simulator.get_sim_history()
+        plt.close("all")
+
+    def test_style_applied_once(self, create_history, monkeypatch):
+        """
+        Tests if the plotting style is applied on the first plot only.
+        """
+        calls = []
+        monkeypatch.setattr(
+            plt.style, "use", lambda style: calls.append(style)
+        )
+        analysis._plotting.cache_clear()
+        analysis.plot_QL_hist_all(create_history, 0)
+        analysis.plot_QL_hist_all(create_history, 1)
+        assert calls == ["ggplot"]
+
+    def test_plots_of_summaries(self, create_history):
+        """
+        Tests if the plots that only need the statistics work without
+        traced replications.
+        """
+        analysis.plot_QL_hist_all(create_history, 0)
+        analysis.plot_QL_hist_per_queue(create_history, 0)
+        analysis.plot_hist_wait_t_all(create_history, 0, 10)
+        analysis.plot_hist_wait_t_per_queue(create_history, 0, 10)
+        analysis.plot_hist_cust_in_cant(create_history, 0, 10)
+
+    def test_plot_over_time_needs_trace(self, create_history):
+        """
+        Tests if the plot over time asks for traced replications.
+        """
+        with pytest.raises(ValueError, match="trace_every"):
+            analysis.plot_hist_CC_vs_time(create_history, 0, 50)
+
+    def test_plot_over_time(self):
+        """
+        Tests if the plot over time works with a traced replication.
+        """
+        simulator = QueueSimulator(seed=1, trace_every=1)
+        simulator.run(n=1)
+        analysis.plot_hist_CC_vs_time(simulator.get_sim_history(), 0, 50)
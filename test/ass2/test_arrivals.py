@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from dist.streams import Bernoulli, Exponential, Geometric
+from assignment_2.arrivals import Arrivals, ArrivalStream
+from assignment_2.event import Event
+
+import assignment_2.constants as c
+
+
+class TestArrivals:
+    @pytest.fixture(autouse=True)
+    def create_arrivals(self):
+        """
+        Creates the arrivals of one hour with seeded distributions.
+        """
+        return Arrivals(
+            Exponential(15, np.random.default_rng(1)),
+            Geometric(c.P_GROUP_SIZE, np.random.default_rng(2)),
+            Exponential(c.MU_CUSTOM_GRAB_FOOD, np.random.default_rng(3)),
+            Bernoulli(c.P_CASH, np.random.default_rng(4)),
+            t_end=c.SIM_T,
+        )
+
+    def test_arrivals(self, create_arrivals):
+        """
+        Tests if the groups cover the hour and the customers their groups.
+        """
+        arrivals = create_arrivals
+        t_group = arrivals.t_group
+        assert t_group[0] == 0
+        assert (np.diff(t_group) > 0).all()
+        assert (t_group[:-1] <= c.SIM_T).all() and t_group[-1] > c.SIM_T
+        # 4 groups per minute on average
+        assert 180 < arrivals.get_nr_groups() < 300
+
+        assert arrivals.get_nr_customers() == arrivals.group_size.sum()
+        assert (arrivals.t_grab > t_group[arrivals.group_of]).all()
+        assert set(np.unique(arrivals.use_cash)) <= {0, 1}
+
+    def test_stream(self, create_arrivals):
+        """
+        Tests if the stream serves every arrival once, in time order, and
+        every group before its customers.
+        """
+        stream = ArrivalStream(create_arrivals)
+        times, arrived = [], set()
+        n_customers = 0
+        while stream.peek() < np.inf:
+            t = stream.peek()
+            e = stream.next()
+            assert e.time == t
+            times.append(t)
+            if e.type == Event.ARRIVAL_GROUP:
+                g = e.get_customer()
+                start = create_arrivals.group_start[g]
+                stop = create_arrivals.group_start[g + 1]
+                arrived.update(range(start, stop))
+            else:
+                assert e.get_customer() in arrived
+                assert create_arrivals.t_grab[e.get_customer()] == t
+                n_customers += 1
+
+        assert times == sorted(times)
+        assert n_customers == create_arrivals.get_nr_customers()
+        with pytest.raises(IndexError):
+            stream.next()
@@ -0,0 +1,85 @@
+import pytest
+import random
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_2.event import Event
+from assignment_2.fes import FES, CalendarFES
+from assignment_2.simulator import QueueSimulator
+
+
+class TestFES:
+    def drain(self, fes, rng: random.Random, n: int, scale) -> list:
+        """
+        Runs a hold model: pops the first event and schedules a new one
+        after a random delay, n times, then empties the FES.
+        """
+        for i in range(50):
+            fes.add(Event(Event.ARRIVAL, rng.expovariate(1.0), i))
+
+        popped = []
+        for i in range(n):
+            e = fes.next()
+            popped.append((e.time, e.customer))
+            delay = rng.expovariate(1.0) * scale(i)
+            # round some delays to create events with the same time
+            if i % 7 == 0:
+                delay = round(delay)
+            fes.add(Event(Event.DEPARTURE, e.time + delay, 50 + i))
+        while not fes.isEmpty():
+            e = fes.next()
+            popped.append((e.time, e.customer))
+        return popped
+
+    def test_calendar_matches_heap(self):
+        """
+        Tests if the calendar queue pops the events in the same order as the
+        heap, while the time between events changes by orders of magnitude.
+        """
+        scales = [
+            lambda i: 1.0,
+            lambda i: 1000.0 if i < 2000 else 0.001,
+            lambda i: 10.0 ** (i // 1000 - 2),
+        ]
+        for scale in scales:
+            heap = self.drain(FES(), random.Random(1), 5000, scale)
+            calendar = CalendarFES()
+            popped = self.drain(calendar, random.Random(1), 5000, scale)
+            assert len(calendar) == 0
+
+            assert popped == heap
+
+    def test_fifo_and_empty(self):
+        """
+        Tests if events with the same time leave in the order they came.
+        """
+        for fes in (FES(), CalendarFES()):
+            for i in range(10):
+                fes.add(Event(Event.ARRIVAL, 5.0, i))
+            fes.add(Event(Event.ARRIVAL, 1.0, 10))
+            order = [fes.next().customer for _ in range(11)]
+            assert order == [10] + list(range(10))
+            with pytest.raises(IndexError):
+                fes.next()
+
+    def test_simulator_calendar(self):
+        """
+        Tests if a seeded simulation gives the same results with both FES
+        implementations.
+        """
+        results = []
+        for fes in ("heap", "calendar"):
+            simulator = QueueSimulator(
+                nr_servers=1, nr_queues=1, n_jobs=1, seed=5, fes=fes
+            )
+            simulator.run(n=1)
+            runs = simulator.get_sim_history().get_sim_runs()
+            results.append([res.get_mean_wait_t() for res in runs[0]])
+        assert results[0] == results[1]
+
+        with pytest.raises(ValueError):
+            QueueSimulator(nr_servers=1, nr_queues=1, fes="ladder")
@@ -0,0 +1,81 @@
+import pickle
+import numpy as np
+import pytest
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_2.recorder import Recorder
+from assignment_2.simresults import SimResults
+
+
+class TestRecorder:
+    def test_append_and_view(self):
+        """
+        Tests if the recorded values survive the growth of the buffer and
+        if a second view does not copy them.
+        """
+        recorder = Recorder(np.int32, size=4)
+        for i in range(100):
+            recorder.append(i)
+        values = recorder.view()
+        assert len(recorder) == 100
+        assert values.dtype == np.int32
+        assert (values == np.arange(100)).all()
+        assert np.shares_memory(values, recorder.view())
+
+        recorder.append(100)
+        assert (recorder.view() == np.arange(101)).all()
+
+    def test_rows_and_pickle(self):
+        """
+        Tests if rows are recorded and if a pickled recorder keeps its values
+        and can grow again.
+        """
+        recorder = Recorder(width=2, size=1)
+        recorder.append([1.0, 2.0])
+        recorder.append(np.array([3.0, 4.0]))
+        assert recorder.view().shape == (2, 2)
+
+        copy = pickle.loads(pickle.dumps(Recorder()))
+        copy.append(1.0)
+        assert copy.view().tolist() == [1.0]
+
+        copy = pickle.loads(pickle.dumps(recorder))
+        copy.append([5.0, 6.0])
+        assert copy.view().tolist() == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+
+        with pytest.raises(ValueError):
+            Recorder(size=0)
+
+    def test_simresults_no_limit(self):
+        """
+        Tests if SimResults records more than 10000 events and long queues.
+        """
+        res = SimResults(2)
+        for t in range(1, 20001):
+            res.register_queue_length(t, np.array([t % 3, t // 100]))
+            res.register_waiting_time(1.0, t % 2)
+
+        assert len(res.get_times()) == 20001
+        assert res.get_all_ql().shape == (20000, 2)
+        assert len(res.get_all_wait_t()) == 20000
+        assert len(res.histQL) > 200
+        assert sum(res.get_ql_hist(1)) == pytest.approx(1.0)
+
+    def test_simresults_hist(self):
+        """
+        Tests if the histograms end at the longest queue observed.
+        """
+        res = SimResults(3)
+        res.register_queue_length(2.0, np.array([0, 1, 2]))
+        res.register_queue_length(3.0, np.array([1, 1, 0]))
+
+        hists = res.get_ql_hists()
+        assert hists.shape == (3, 3)
+        assert hists.sum(axis=0) == pytest.approx([1.0, 1.0, 1.0])
+        assert res.get_ql_hist(2).tolist() == pytest.approx([1 / 3, 0, 2 / 3])
+        assert (res.get_ql_hist(0) == hists[:, 0]).all()
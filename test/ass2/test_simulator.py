@@ -1,3 +1,4 @@
+import pickle
 import pytest
 from scipy import stats
 
@@ -8,6 +9,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from assignment_2.simulator import QueueSimulator
+from assignment_2.simresults import SimResults, SimSummary
+import assignment_2.constants as c
 
 
 class TestSimulator:
@@ -31,3 +34,146 @@ class TestSimulator:
         """
         create_simulator.run(n=1)
         assert create_simulator.sim_history.get_number_of_simulations() == 1
+
+    def test_simulator_seed(self):
+        """
+        Tests if a replication only depends on the seed and its number.
+        """
+        sim_a = QueueSimulator(nr_servers=1, nr_queues=1, n_jobs=1, seed=3)
+        sim_a.run(n=2)
+        sim_b = QueueSimulator(nr_servers=1, nr_queues=1, n_jobs=1, seed=3)
+        sim_b.run(n=1)
+        sim_b.run(n=1)
+
+        for res_a, res_b in zip(
+            sim_a.get_sim_history().get_sim_runs(),
+            sim_b.get_sim_history().get_sim_runs(),
+        ):
+            assert res_a[0].get_mean_wait_t() == res_b[0].get_mean_wait_t()
+
+    def test_simulator_resume(self, tmp_path):
+        """
+        Tests if a resumed run skips the completed replications.
+        """
+        path = str(tmp_path / "run.pkl")
+        sim_a = QueueSimulator(nr_servers=1, nr_queues=1, n_jobs=1, seed=3)
+        sim_a.run(n=1, checkpoint=path)
+
+        sim_b = QueueSimulator(nr_servers=1, nr_queues=1, n_jobs=1, seed=3)
+        sim_b.run(n=1, checkpoint=path, resume=True)
+        assert sim_b.get_sim_history().get_number_of_simulations() == 1
+        assert (
+            sim_a.get_sim_history().get_sim_runs()[0][0].get_mean_wait_t()
+            == sim_b.get_sim_history().get_sim_runs()[0][0].get_mean_wait_t()
+        )
+
+        sim_c = QueueSimulator(
+            nr_servers=1, nr_queues=1, n_jobs=1, seed=3, fes="calendar"
+        )
+        with pytest.raises(ValueError):
+            sim_c.run(n=1, checkpoint=path, resume=True)
+
+    def test_simulator_crn(self):
+        """
+        Tests if every rate sees the same groups with common random numbers
+        and if the paired differences have a smaller variance.
+        """
+        simulator = QueueSimulator(seed=5, crn=True, trace_every=1)
+        simulator.run(n=8)
+        runs = simulator.get_sim_history().get_sim_runs()
+
+        for res in runs:
+            n_groups = min(len(r.groups) for r in res)
+            n_customers = res[0].groups.size[:n_groups].sum()
+            first = res[0]
+            for r, rate in zip(res[1:], c.MU_ARRIVAL_RATE_MIN[1:]):
+                # arrival times scale with the inverse of the rate
+                assert r.groups.t_arrival[:n_groups] * rate == pytest.approx(
+                    first.groups.t_arrival[:n_groups]
+                )
+                assert (
+                    r.groups.size[:n_groups] == first.groups.size[:n_groups]
+                ).all()
+
+                customers = r.customers
+                assert (
+                    customers.cash[:n_customers]
+                    == first.customers.cash[:n_customers]
+                ).all()
+                assert (
+                    customers.service_unit[:n_customers]
+                    == first.customers.service_unit[:n_customers]
+                ).all()
+                # the time it takes to grab food
+                grab = customers.t_grab - customers.t_arrival
+                grab_first = first.customers.t_grab - first.customers.t_arrival
+                assert grab[:n_customers] == pytest.approx(
+                    grab_first[:n_customers]
+                )
+
+        paired = simulator.get_sim_history().get_paired_difference(
+            0, 1, measure="CustomersCanteen"
+        )
+        low, up = paired["Difference_normal_ci_95"]
+        assert low <= paired["Difference_mean"] <= up
+        assert paired["VarianceRatio"] < 1
+
+        with pytest.raises(ValueError):
+            simulator.get_sim_history().get_paired_difference(0, 1, "Foo")
+
+    def test_statistics_cache(self):
+        """
+        Tests if the statistics are cached until a run is added, and if the
+        returned dictionaries can be modified without changing the cache.
+        """
+        simulator = QueueSimulator(nr_servers=3, nr_queues=3, seed=1)
+        simulator.run(n=1)
+        history = simulator.get_sim_history()
+
+        statistics = history.get_statistics_all(0)
+        separate = history.get_statistics_separate(0, 2)
+        assert history.get_statistics_all(0)["QueueLengths_all"] is (
+            statistics["QueueLengths_all"]
+        )
+        assert len(separate["WaitingTime_all"]) == 1
+        del statistics["WaitingTime_mean"]
+        assert "WaitingTime_mean" in history.get_statistics_all(0)
+
+        simulator.run(n=1)
+        assert len(history.get_statistics_all(0)["QueueLengths_all"]) == 2
+        assert len(
+            history.get_statistics_separate(0, 2)["WaitingTime_all"]
+        ) == 2
+
+    def test_simulator_summary(self):
+        """
+        Tests if a summary gives the statistics of the full results and if
+        only every trace_every-th replication keeps its results.
+        """
+        sim_a = QueueSimulator(seed=4, trace_every=2)
+        sim_a.run(n=3)
+        runs = sim_a.get_sim_history().get_sim_runs()
+        assert isinstance(runs[0][0], SimResults)
+        assert isinstance(runs[1][0], SimSummary)
+        assert isinstance(runs[2][0], SimResults)
+
+        for res in runs[0]:
+            summary = res.summarize()
+            for getter in (
+                "get_mean_ql",
+                "get_mean_wait_t",
+                "get_mean_cust_canteen",
+                "get_mean_sojourn_cust",
+                "get_mean_sojourn_group",
+                "get_ql_hists",
+            ):
+                assert getattr(summary, getter)() == pytest.approx(
+                    getattr(res, getter)()
+                )
+            assert len(pickle.dumps(summary)) < len(pickle.dumps(res)) / 20
+
+        statistics = sim_a.get_sim_history().get_statistics_all(0)
+        assert len(statistics["CustomersCanteen_all"]) == 3
+        assert len(statistics["CustomersCanteen_values"]) == sum(
+            len(runs[i][0].get_canteen()[1]) for i in (0, 2)
+        )
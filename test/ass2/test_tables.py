@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from assignment_2.simulator import QueueSimulator
+from assignment_2.tables import CustomerTable, GroupTable
+
+
+class TestTables:
+    @pytest.fixture(autouse=True)
+    def create_results(self):
+        """
+        Runs one seeded simulation that keeps its tables.
+        """
+        simulator = QueueSimulator(seed=6, trace_every=1)
+        simulator.run(n=1)
+        return simulator.get_sim_history().get_sim_runs()[0][1]
+
+    def test_tables(self, create_results):
+        """
+        Tests if the event loop filled in the tables consistently.
+        """
+        customers, groups = create_results.customers, create_results.groups
+        assert groups.size.sum() == len(customers)
+        assert (customers.group[groups.start] == np.arange(len(groups))).all()
+
+        served = ~np.isnan(customers.t_left)
+        assert served.any()
+        assert (customers.queue[served] >= 0).all()
+        assert (customers.t_service[served] >= customers.t_grab[served]).all()
+        assert (customers.t_left[served] > customers.t_service[served]).all()
+
+        # a group has left once the service of all its customers started
+        left = ~np.isnan(groups.t_departure)
+        assert (groups.n_waiting[left] == 0).all()
+        assert left.sum() == len(create_results.sojournG)
+
+    def test_views_and_records(self, create_results, tmp_path):
+        """
+        Tests if rows can be read as objects and saved as records.
+        """
+        customers, groups = create_results.customers, create_results.groups
+        group = groups.get_group(1, customers)
+        assert group.get_nr_customers() == groups.size[1]
+        customer = customers.get_customer(int(groups.start[1]))
+        assert customer.get_t_done_grab() == (
+            group.get_customers()[0].get_t_done_grab()
+        )
+        assert customer.get_queue_id() == customers.queue[groups.start[1]]
+
+        path = tmp_path / "customers.npy"
+        customers.save(str(path))
+        records = np.load(path)
+        assert records.dtype == CustomerTable.DTYPE
+        assert (records["t_grab"] == customers.t_grab).all()
+        assert len(groups.to_records()) == len(groups)
+        assert groups.to_records().dtype == GroupTable.DTYPE
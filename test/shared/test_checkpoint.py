@@ -0,0 +1,130 @@
+import pytest
+import os
+import pickle
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+import assignment_1.constants as c
+from assignment_1.simulator import ChessSimulator
+from assignment_1.strategy import RandomStrategy
+from assignment_1.variant import get_variant
+from parallel.checkpoint import atomic_dump
+
+
+def create_simulator(seed: int = 11) -> ChessSimulator:
+    return ChessSimulator(
+        black_strat=RandomStrategy(c.Players.BLACK),
+        white_strat=RandomStrategy(c.Players.WHITE),
+        seed=seed,
+    )
+
+
+def interrupt_at(simulator, index: int) -> None:
+    """
+    Makes the simulator crash when it reaches game index.
+    """
+    do_one_run = simulator._do_one_run
+
+    def _do_one_run(n):
+        if n == index:
+            raise KeyboardInterrupt()
+        return do_one_run(n)
+
+    simulator._do_one_run = _do_one_run
+
+
+class TestCheckpoint:
+    def test_atomic_dump(self, tmp_path):
+        """
+        Tests if a file is replaced and no temporary files remain.
+        """
+        path = tmp_path / "state.pkl"
+        atomic_dump({"a": 1}, path)
+        atomic_dump({"a": 2}, path)
+        with open(path, "rb") as f:
+            assert pickle.load(f) == {"a": 2}
+        assert os.listdir(tmp_path) == ["state.pkl"]
+
+    def test_resume(self, tmp_path):
+        """
+        Tests if a resumed run equals an uninterrupted run.
+        """
+        path = str(tmp_path / "run.pkl")
+
+        reference = create_simulator()
+        reference.run(4)
+
+        crashed = create_simulator()
+        interrupt_at(crashed, 2)
+        with pytest.raises(KeyboardInterrupt):
+            crashed.run(4, checkpoint=path, checkpoint_interval=0)
+
+        resumed = create_simulator()
+        resumed.run(4, checkpoint=path, resume=True)
+        history = resumed.get_game_history()
+        assert history.get_number_of_games_played() == 4
+        assert np.array_equal(
+            history.get_results(),
+            reference.get_game_history().get_results(),
+        )
+
+    def test_resume_mismatch(self, tmp_path):
+        """
+        Tests if a checkpoint of another configuration is rejected.
+        """
+        path = str(tmp_path / "run.pkl")
+        create_simulator(seed=1).run(1, checkpoint=path)
+
+        with pytest.raises(ValueError):
+            create_simulator(seed=2).run(1, checkpoint=path, resume=True)
+        with pytest.raises(ValueError):
+            create_simulator(seed=1).run(2, checkpoint=path, resume=True)
+
+    def test_resume_config_mismatch(self, tmp_path):
+        """
+        Tests if a checkpoint of the same seed but other strategies, variant
+        or options is rejected.
+        """
+        path = str(tmp_path / "run.pkl")
+        create_simulator(seed=1).run(1, checkpoint=path)
+
+        others = [
+            ChessSimulator(
+                black_strat=RandomStrategy(c.Players.BLACK),
+                white_strat=RandomStrategy(
+                    c.Players.WHITE, allow_two_step_pawn=True
+                ),
+                seed=1,
+            ),
+            ChessSimulator(
+                black_strat=RandomStrategy(c.Players.BLACK),
+                white_strat=RandomStrategy(c.Players.WHITE),
+                seed=1,
+                variant=get_variant(6),
+            ),
+            ChessSimulator(
+                black_strat=RandomStrategy(c.Players.BLACK),
+                white_strat=RandomStrategy(c.Players.WHITE),
+                seed=1,
+                keep_game_runs=True,
+            ),
+        ]
+        for simulator in others:
+            with pytest.raises(ValueError):
+                simulator.run(1, checkpoint=path, resume=True)
+
+        # the default variant is the same as no variant
+        simulator = ChessSimulator(
+            black_strat=RandomStrategy(c.Players.BLACK),
+            white_strat=RandomStrategy(c.Players.WHITE),
+            seed=1,
+            variant=get_variant(),
+        )
+        simulator.run(1, checkpoint=path, resume=True)
+        assert simulator.get_game_history().get_number_of_games_played() == 1
@@ -0,0 +1,142 @@
+import pytest
+import multiprocessing as mp
+import os
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+import assignment_1.constants as c
+from assignment_1.simulator import ChessSimulator
+from assignment_1.strategy import RandomStrategy
+from parallel.distributed import DistributedExecutor, connect, run_worker
+
+AUTHKEY = b"test"
+
+
+class Target:
+    """
+    Minimal target that records which process ran it.
+    """
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    def _do_chunk(self, items: list) -> list:
+        return [(i + self.offset, os.getpid()) for i in items]
+
+
+def start_workers(executor, n: int) -> list:
+    workers = [
+        mp.Process(target=run_worker, args=(executor.address, AUTHKEY))
+        for _ in range(n)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+class TestDistributedExecutor:
+    @pytest.fixture()
+    def create_executor(self):
+        """
+        Creates a coordinator on a free local port.
+        """
+        executor = DistributedExecutor(
+            address=("127.0.0.1", 0),
+            authkey=AUTHKEY,
+            batch_size=3,
+            lease_timeout=1.0,
+            poll_interval=0.1,
+        )
+        executor.start()
+        yield executor
+        executor.close()
+
+    def test_order(self, create_executor):
+        """
+        Tests if the results of local worker processes arrive in order.
+        """
+        workers = start_workers(create_executor, 2)
+        results = [
+            r
+            for _, chunk in create_executor.imap(Target(100), range(20))
+            for r in chunk
+        ]
+        assert [r[0] for r in results] == list(range(100, 120))
+        assert os.getpid() not in {r[1] for r in results}
+        assert create_executor.get_info()["n_workers"] >= 1
+        # the target is dropped once all its batches are collected
+        assert create_executor.get_info()["n_targets"] == 0
+
+        create_executor.close()
+        for worker in workers:
+            worker.join(timeout=10)
+            assert worker.exitcode == 0
+
+    def test_lost_batch(self, create_executor):
+        """
+        Tests if a batch of a worker that disappears is handed out again.
+        """
+        results = create_executor.imap(Target(0), range(9))
+
+        # a worker takes a batch and never returns a result
+        lost = connect(create_executor.address, AUTHKEY).get_batch("lost", 0)
+        assert lost is not None
+
+        workers = start_workers(create_executor, 1)
+        items = [r[0] for _, chunk in results for r in chunk]
+        assert items == list(range(9))
+        assert create_executor.get_info()["n_requeued"] == 1
+
+        create_executor.close()
+        for worker in workers:
+            worker.join(timeout=10)
+
+    def test_seed_deterministic(self, create_executor):
+        """
+        Tests if seeded distributed games equal seeded serial games.
+        """
+        def create_simulator(**kwargs):
+            return ChessSimulator(
+                black_strat=RandomStrategy(c.Players.BLACK),
+                white_strat=RandomStrategy(c.Players.WHITE),
+                seed=7,
+                **kwargs,
+            )
+
+        serial = create_simulator()
+        serial.run(4)
+
+        workers = start_workers(create_executor, 2)
+        # an executor that is given is used without parallelize=True
+        calls = []
+        imap = create_executor.imap
+        create_executor.imap = lambda *args: calls.append(args) or imap(*args)
+        distributed = create_simulator(executor=create_executor)
+        distributed.run(4)
+        assert len(calls) == 1
+
+        assert np.array_equal(
+            serial.get_game_history().get_results(),
+            distributed.get_game_history().get_results(),
+        )
+
+        create_executor.close()
+        for worker in workers:
+            worker.join(timeout=10)
+
+    def test_defaults(self):
+        """
+        Tests if the coordinator only listens on localhost by default and
+        generates a random authkey if none is given.
+        """
+        executor_a = DistributedExecutor()
+        executor_b = DistributedExecutor()
+        assert executor_a.address[0] == "127.0.0.1"
+        assert len(executor_a.authkey) == 32
+        assert executor_a.authkey != executor_b.authkey
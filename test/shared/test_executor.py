@@ -0,0 +1,78 @@
+import pytest
+import os
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from parallel.executor import Executor, split_chunks
+
+
+class Target:
+    """
+    Minimal target that records which process ran it.
+    """
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.n_calls = 0
+
+    def _do_chunk(self, items: list) -> list:
+        self.n_calls += 1
+        return [(i + self.offset, os.getpid(), id(self)) for i in items]
+
+
+class TestExecutor:
+    @pytest.fixture()
+    def create_executor(self):
+        """
+        Creates an executor with two workers.
+        """
+        with Executor(n_jobs=2) as executor:
+            yield executor
+
+    def test_split_chunks(self):
+        """
+        Tests if chunks are contiguous and cover all items.
+        """
+        chunks = split_chunks(range(10), 4)
+        assert chunks == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+        assert split_chunks(range(2), 4) == [[0], [1]]
+
+    def test_executor_order(self, create_executor):
+        """
+        Tests if results come back in order.
+        """
+        results = []
+        for _, chunk_results in create_executor.imap(Target(10), range(20)):
+            results += [r[0] for r in chunk_results]
+        assert results == list(range(10, 30))
+
+    def test_executor_reuses_workers(self, create_executor):
+        """
+        Tests if successive runs are served by the same warm workers.
+        """
+        target = Target(0)
+        pids = []
+        for _ in range(2):
+            for _, chunk_results in create_executor.imap(target, range(8)):
+                pids += [r[1] for r in chunk_results]
+        assert os.getpid() not in pids
+        assert len(set(pids)) <= 2
+
+        # a changed target is unpickled again
+        results = []
+        for _, chunk_results in create_executor.imap(Target(1), range(2)):
+            results += [r[0] for r in chunk_results]
+        assert results == [1, 2]
+
+    def test_executor_not_picklable(self, create_executor):
+        """
+        Tests if an executor refuses to be pickled.
+        """
+        import pickle
+
+        with pytest.raises(TypeError):
+            pickle.dumps(create_executor)
@@ -0,0 +1,27 @@
+import pytest
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from benchmark import CORE_MODULES, measure_import
+
+
+class TestImports:
+    @pytest.mark.parametrize("module", CORE_MODULES)
+    def test_core_without_plotting(self, module):
+        """
+        Tests if the simulation core imports without plotting libraries.
+        """
+        result = measure_import(module, repeat=1)
+        assert result["heavy_modules"] == []
+        assert result["import_time"] > 0
+
+    def test_analysis_lazy(self):
+        """
+        Tests if the analysis module only loads plotting libraries on use.
+        """
+        result = measure_import("assignment_2.analysis", repeat=1)
+        assert result["heavy_modules"] == []
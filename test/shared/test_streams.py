@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+
+# to enable parent directory imports
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from dist.streams import (
+    Bernoulli,
+    Exponential,
+    Geometric,
+    RandomStreams,
+    Stream,
+    Uniform,
+)
+
+
+class TestStreams:
+    def test_no_waste(self):
+        """
+        Tests if mixed scalar and batch requests return the numbers of the
+        generator in order, across batch boundaries.
+        """
+        stream = Exponential(2.0, np.random.default_rng(1))
+        stream.n = 10
+        drawn = []
+        for n in (1, 3, 7, 1, 1, 25, 4, 1):
+            rs = stream.rvs(n)
+            if n == 1:
+                assert isinstance(rs, float)
+                drawn.append(rs)
+            else:
+                assert len(rs) == n
+                drawn.extend(rs)
+
+        # the numbers of the generator do not depend on the batch sizes
+        expected = np.random.default_rng(1).exponential(2.0, len(drawn))
+        assert np.allclose(drawn, expected)
+
+    def test_distributions(self):
+        """
+        Tests the means and supports of the distributions.
+        """
+        rng = np.random.default_rng(2)
+        for stream, low in (
+            (Exponential(3.0, rng), 0),
+            (Geometric(0.4, rng), 1),
+            (Bernoulli(0.3, rng), 0),
+            (Uniform(rng), 0),
+        ):
+            sample = stream.rvs(50000)
+            assert sample.min() >= low
+            assert np.mean(sample) == pytest.approx(stream.mean(), rel=0.05)
+        assert isinstance(Geometric(0.4, rng).rvs(), int)
+
+        uniform = Uniform(rng)
+        values = {uniform.randint(2, 4) for _ in range(200)}
+        assert values == {2, 3, 4}
+        assert uniform.choice("ab") in "ab"
+
+    def test_random_streams(self):
+        """
+        Tests if streams depend on their id and seed, not on the order in
+        which they are created.
+        """
+        a = RandomStreams(7)
+        b = RandomStreams(7)
+        first = a.generator(1, 2).random(3)
+        b.generator(5)
+        assert (b.generator(1, 2).random(3) == first).all()
+        assert (a.generator(2, 1).random(3) != first).all()
+        assert (RandomStreams(8).generator(1, 2).random(3) != first).all()
+
+    def test_abstract_stream(self):
+        """
+        Tests if a stream without _draw or mean cannot be created.
+        """
+
+        class NoMean(Stream):
+            def _draw(self, n: int) -> np.ndarray:
+                return self.rng.random(n)
+
+        with pytest.raises(TypeError):
+            Stream()
+        with pytest.raises(TypeError):
+            NoMean()